@@ -3,22 +3,69 @@ from routes.study_activities import study_activities_bp
 from routes.study_sessions import study_sessions_bp
 from routes.words import words_bp
 from routes.groups import groups_bp
+from routes.export import export_bp
+from routes.debug import debug_bp
+from routes.reviews import reviews_bp
+from routes.dashboard import dashboard_bp
+from routes.jobs import jobs_bp
 from flask_cors import CORS
+from db.config import DATABASE
+from db.lib import db, journal, metrics, responses, snapshot
+from db.schema import migrate_db
 
-app = Flask(__name__)
-CORS(app, resources={
-    r"/api/*": {
-        "origins": "*",
-        "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
-    }
-}) # Enable CORS for all routes
-
-# Register Blueprints
-app.register_blueprint(study_activities_bp, url_prefix="/api")
-app.register_blueprint(words_bp, url_prefix="/api")
-app.register_blueprint(groups_bp, url_prefix="/api")
-app.register_blueprint(study_sessions_bp, url_prefix="/api")
+
+def create_app(config=None, migrate=False):
+    """Application factory.
+
+    Build one app per worker process, e.g. ``gunicorn "app:create_app()"`` or
+    through ``asgi.py``. ``config`` overrides Flask settings such as ``DATABASE``;
+    ``migrate=True`` applies pending schema migrations before the app is returned
+    (safe to run from several workers at once).
+    """
+    app = Flask(__name__)
+    app.config["DATABASE"] = DATABASE
+    if config:
+        app.config.update(config)
+
+    CORS(app, resources={
+        r"/api/*": {
+            "origins": "*",
+            "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization"],
+            "expose_headers": ["X-Total-Count", "X-Next-Cursor", "Link", "Server-Timing", "X-Snapshot-Age"]
+        }
+    }) # Enable CORS for all routes
+
+    if migrate:
+        migrate_db(app.config["DATABASE"])
+
+    # Reuse pooled per-thread connections across requests
+    db.init_app(app)
+    # Per-request SQL timings (Server-Timing header) and the slow-query log
+    metrics.init_app(app)
+    # Row-aware (orjson when installed) JSON and gzip/brotli for large bodies
+    responses.init_app(app)
+    # Insert answers a crashed process left in the response journal
+    journal.init_app(app)
+    # Optional read-only snapshot for the stats and export endpoints
+    snapshot.init_app(app)
+
+    # Register Blueprints
+    app.register_blueprint(study_activities_bp, url_prefix="/api")
+    app.register_blueprint(words_bp, url_prefix="/api")
+    app.register_blueprint(groups_bp, url_prefix="/api")
+    app.register_blueprint(study_sessions_bp, url_prefix="/api")
+    app.register_blueprint(export_bp, url_prefix="/api")
+    app.register_blueprint(reviews_bp, url_prefix="/api")
+    app.register_blueprint(dashboard_bp, url_prefix="/api")
+    app.register_blueprint(jobs_bp, url_prefix="/api")
+    app.register_blueprint(debug_bp, url_prefix="/api")
+
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
+    migrate_db(app.config["DATABASE"])
     app.run(debug=True)
@@ -0,0 +1,25 @@
+"""Production entry point that serves the Flask app under an ASGI server.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+Each worker process builds its own app through ``create_app()``. The blueprints
+stay synchronous: requests run on a bounded thread pool, and every thread keeps
+one pooled SQLite connection (see ``db/lib/db.py``), so ``ASGI_THREADS`` also
+bounds the number of open connections per worker. Set ``LANG_PORTAL_DATABASE``
+to serve a database other than ``db/words.db``.
+"""
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+from db.config import DATABASE
+
+# Threads per worker process that run the synchronous Flask views
+ASGI_THREADS = int(os.environ.get("ASGI_THREADS", "16"))
+
+flask_app = create_app(
+    {"DATABASE": os.environ.get("LANG_PORTAL_DATABASE", DATABASE)},
+    migrate=True,
+)
+app = WSGIMiddleware(flask_app, workers=ASGI_THREADS)
@@ -0,0 +1,303 @@
+"""Latency and throughput benchmark for the lang-portal API.
+
+Builds a synthetic database, replays a weighted mix of requests against every
+blueprint and writes p50/p95/p99 latency, throughput and queries per request to
+a JSON file. Run from lang-portal/backend-flask:
+
+    python -m benchmarks.run                                  # Flask test client
+    python -m benchmarks.run --mode server --concurrency 8    # real HTTP server in-process
+    python -m benchmarks.run --mode server --url http://127.0.0.1:5000 --db db/bench.db --reuse-db
+    python -m benchmarks.run --baseline benchmarks/results/previous.json
+
+With ``--url`` the requests go to a server you started yourself (e.g. uvicorn)
+on the same ``--db``; queries per request are not available in that case.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from flask import request
+
+from app import create_app
+from db.lib.db import get_db
+from db.seeds.synthetic import build_synthetic_db
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def request_mix(args):
+    """(name, weight, builder) for every route; builders return (method, path, json body)."""
+
+    def word():
+        return random.randint(1, args.words)
+
+    def group():
+        return random.randint(1, args.groups)
+
+    def session():
+        return random.randint(1, args.sessions)
+
+    def search_term():
+        # A prefix of a word's romanization, as a live search sends it keystroke by keystroke
+        term = f"kalima{word()}"
+        return term[:random.randint(len("kalima") + 1, len(term))]
+
+    def responses(n):
+        return [
+            {"question_id": word(), "user_response": "answer", "is_correct": random.random() < 0.7}
+            for _ in range(n)
+        ]
+
+    return [
+        ("GET /words (page)", 10, lambda: ("GET", f"/api/words?limit=100&after={random.randint(0, args.words)}", None)),
+        ("GET /words (projected page)", 5, lambda: ("GET", f"/api/words?limit=100&fields=arabic,english&after={random.randint(0, args.words)}", None)),
+        ("GET /words (full list)", 1, lambda: ("GET", "/api/words", None)),
+        ("GET /words/<id>", 10, lambda: ("GET", f"/api/words/{word()}", None)),
+        ("GET /words/search", 5, lambda: ("GET", f"/api/words/search?q={search_term()}&limit=20", None)),
+        ("GET /words/hardest", 3, lambda: ("GET", f"/api/words/hardest?group_id={group()}&limit=20", None)),
+        ("GET /groups", 5, lambda: ("GET", "/api/groups", None)),
+        ("GET /groups/<id>", 3, lambda: ("GET", f"/api/groups/{group()}", None)),
+        ("GET /groups/<id>/words", 5, lambda: ("GET", f"/api/groups/{group()}/words?limit=50", None)),
+        ("GET /study-activities", 5, lambda: ("GET", "/api/study-activities", None)),
+        ("GET /study-activities/<id>", 3, lambda: ("GET", f"/api/study-activities/{random.randint(1, 4)}", None)),
+        ("GET /study-sessions (page)", 5, lambda: ("GET", f"/api/study-sessions?limit=50&after={session()}", None)),
+        ("GET /study-sessions?group_id", 3, lambda: ("GET", f"/api/study-sessions?group_id={group()}&include=counts", None)),
+        ("GET /study-sessions/<id>", 8, lambda: ("GET", f"/api/study-sessions/{session()}", None)),
+        ("GET /study-sessions/<id>/responses", 5, lambda: ("GET", f"/api/study-sessions/{session()}/responses", None)),
+        ("GET /study-sessions/latest", 5, lambda: ("GET", "/api/study-sessions/latest", None)),
+        ("GET /review-queue", 3, lambda: ("GET", "/api/review-queue?limit=20", None)),
+        ("GET /study-sessions/stats", 5, lambda: ("GET", "/api/study-sessions/stats", None)),
+        ("GET /dashboard", 5, lambda: ("GET", "/api/dashboard", None)),
+        ("GET /export/<name>", 1, lambda: ("GET", f"/api/export/{random.choice(['words', 'study-sessions', 'session-responses'])}", None)),
+        ("GET /jobs", 2, lambda: ("GET", "/api/jobs?limit=20", None)),
+        ("POST /study-sessions", 3, lambda: ("POST", "/api/study-sessions", {"group_id": group(), "study_activity_id": random.randint(1, 4)})),
+        ("POST /study-sessions/<id>/responses:batch", 3, lambda: ("POST", f"/api/study-sessions/{session()}/responses:batch", {"responses": responses(20)})),
+        ("POST /study-sessions/<id>/responses:append", 10, lambda: ("POST", f"/api/study-sessions/{session()}/responses:append", {"responses": responses(1)})),
+        ("PATCH /study-sessions/<id>", 2, lambda: ("PATCH", f"/api/study-sessions/{session()}", {"responses": responses(5)})),
+        ("POST /study-sessions/<id>/resume", 1, lambda: ("POST", f"/api/study-sessions/{session()}/resume", None)),
+    ]
+
+
+class QueryCounter:
+    """Counts SQL statements per benchmark operation through a trace callback."""
+
+    def __init__(self, app):
+        self.counts = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def _trace(self, statement):
+        if not statement.startswith("--"):  # Skip statements run inside triggers
+            self._local.count += 1
+
+    def _start(self):
+        self._local.count = 0
+        get_db().set_trace_callback(self._trace)
+
+    def _finish(self, response):
+        get_db().set_trace_callback(None)
+        op = request.headers.get("X-Bench-Op")
+        if op:
+            with self._lock:
+                self.counts.setdefault(op, []).append(self._local.count)
+        return response
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed, query_counts):
+    """samples: list of (op, seconds, status)."""
+    by_op = {}
+    for op, seconds, status in samples:
+        by_op.setdefault(op, []).append((seconds, status))
+
+    def stats(entries, queries):
+        latencies = sorted(seconds * 1000 for seconds, _ in entries)
+        return {
+            "requests": len(entries),
+            "errors": sum(1 for _, status in entries if status >= 500),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(sum(latencies) / len(latencies), 3),
+            "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        }
+
+    all_queries = [q for counts in query_counts.values() for q in counts]
+    overall = stats([(s, st) for _, s, st in samples], all_queries)
+    overall["throughput_rps"] = round(len(samples) / elapsed, 1)
+    return {
+        "overall": overall,
+        "operations": {op: stats(entries, query_counts.get(op, [])) for op, entries in sorted(by_op.items())},
+    }
+
+
+def run_client(app, plan):
+    client = app.test_client()
+    samples = []
+    for op, (method, path, body) in plan:
+        started = time.perf_counter()
+        response = client.open(path, method=method, json=body, headers={"X-Bench-Op": op})
+        # Read streamed bodies (exports) to the end, as the HTTP mode does, so they are timed and finish
+        response.get_data()
+        response.close()
+        samples.append((op, time.perf_counter() - started, response.status_code))
+    return samples
+
+
+def run_http(base_url, plan, concurrency):
+    def send(item):
+        op, (method, path, body) = item
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(base_url + path, data=data, method=method)
+        req.add_header("X-Bench-Op", op)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+        return op, time.perf_counter() - started, status
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(send, plan))
+
+
+def compare(results, baseline_path, tolerance, mode):
+    """Return operations whose p95 regressed by more than ``tolerance`` against a baseline."""
+    with open(baseline_path, "r") as f:
+        report = json.load(f)
+    if report["parameters"].get("mode") != mode:
+        print("Warning: the baseline was recorded in a different --mode, latencies are not comparable")
+    baseline = report["results"]["operations"]
+    regressions = []
+    for op, current in results["operations"].items():
+        before = baseline.get(op)
+        if before and before["p95_ms"] and current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{op}: p95 {before['p95_ms']}ms -> {current['p95_ms']}ms")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the lang-portal API.")
+    parser.add_argument("--words", type=int, default=50000)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--responses", type=int, default=20, help="responses per session")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=["client", "server"], default="client")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel HTTP clients in server mode")
+    parser.add_argument("--url", help="benchmark an already running server instead of starting one")
+    parser.add_argument("--db", help="database path (default: a temporary file)")
+    parser.add_argument("--reuse-db", action="store_true", help="do not rebuild --db if it exists")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", help="previous results file to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown vs baseline")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "bench.db")
+    if not (args.reuse_db and os.path.exists(db_path)):
+        started = time.perf_counter()
+        build_synthetic_db(db_path, args.words, args.groups, args.sessions, args.responses, args.seed)
+        print(f"Built synthetic database at {db_path} in {time.perf_counter() - started:.1f}s")
+
+    random.seed(args.seed)
+    mix = request_mix(args)
+    ops = [(name, builder) for name, _, builder in mix]
+    weights = [weight for _, weight, _ in mix]
+    # Every route appears at least once, the rest follows the weights
+    picks = ops + random.choices(ops, weights=weights, k=max(0, args.requests - len(ops)))
+    random.shuffle(picks)
+    plan = [(name, builder()) for name, builder in picks]
+    warmup = [(name, builder()) for name, builder in random.choices(ops, weights=weights, k=args.warmup)]
+
+    app = create_app({"DATABASE": db_path}, migrate=True)
+    counter = QueryCounter(app)
+    server = None
+
+    if args.mode == "client":
+        run_client(app, warmup)
+        counter.counts.clear()
+        started = time.perf_counter()
+        samples = run_client(app, plan)
+    else:
+        base_url = args.url
+        if base_url is None:
+            from werkzeug.serving import make_server
+
+            server = make_server("127.0.0.1", 0, app, threaded=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f"http://127.0.0.1:{server.server_port}"
+        run_http(base_url, warmup, args.concurrency)
+        counter.counts.clear()
+        started = time.perf_counter()
+        samples = run_http(base_url, plan, args.concurrency)
+    elapsed = time.perf_counter() - started
+
+    if server is not None:
+        server.shutdown()
+
+    results = summarize(samples, elapsed, counter.counts)
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "results": results,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'operation':45} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'q/req':>6}")
+    for op, s in results["operations"].items():
+        print(f"{op:45} {s['requests']:>6} {s['p50_ms']:>9} {s['p95_ms']:>9} {s['p99_ms']:>9} {s['queries_per_request'] or '-':>6}")
+    overall = results["overall"]
+    print(f"\n{overall['requests']} requests, {overall['throughput_rps']} req/s, "
+          f"p50 {overall['p50_ms']}ms, p95 {overall['p95_ms']}ms, p99 {overall['p99_ms']}ms, "
+          f"{overall['errors']} errors")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance, args.mode)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
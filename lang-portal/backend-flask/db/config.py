@@ -3,3 +3,47 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # This is the 'db' folder
 DATABASE = os.path.join(BASE_DIR, "words.db")  # Store database directly inside 'db/'
 SEED_DIR = "seeds"
+
+# Pragmas applied once to every pooled connection when it is opened
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # Readers no longer block the writer (and vice versa)
+    "synchronous": "NORMAL",  # Safe with WAL, avoids an fsync per commit
+    "mmap_size": 268435456,  # Memory-map up to 256 MB of the database file
+    "cache_size": -20000,  # Negative value is in KiB, so roughly 20 MB of page cache
+    "busy_timeout": 5000,  # Wait up to 5s for a lock instead of failing immediately
+}
+
+# Pragmas for the seeding connection only. Losing power mid-seed can corrupt the
+# database, which is acceptable because seeding can simply be rerun from scratch.
+BULK_LOAD_PRAGMAS = {
+    "synchronous": "OFF",
+    "cache_size": -200000,  # Roughly 200 MB of page cache
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+# Statements slower than this are written, with their query plan, to the slow-query log
+SLOW_QUERY_MS = 100
+SLOW_QUERY_LOG = os.path.join(os.path.dirname(BASE_DIR), "logs", "slow_queries.log")
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESS_MIN_SIZE = 1024
+
+# Background jobs change at most this many rows per transaction and sleep between
+# batches, so requests keep getting the write lock while a job runs
+JOB_BATCH_SIZE = 1000
+JOB_PAUSE_SECONDS = 0.01
+
+# Answers sent to responses:append are committed in groups: every this many
+# milliseconds, or as soon as this many are waiting
+JOURNAL_FLUSH_MS = 200
+JOURNAL_FLUSH_ROWS = 500
+# Journal writes reach the OS on every append, which survives a crashed process.
+# Set this to also fsync them and survive power loss, at the cost of a disk sync per request
+JOURNAL_FSYNC = False
+
+# Stats and export endpoints can read from a read-only copy of the database
+# instead (see db/lib/snapshot.py), so long aggregate reads never hold up session
+# writes. The copy is refreshed in the background once it is older than this
+ANALYTICS_SNAPSHOT = False
+SNAPSHOT_MAX_AGE_SECONDS = 300
@@ -0,0 +1,124 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import Response, current_app, make_response, request
+
+from .db import get_db
+from .responses import apply_encoding, compress, negotiate_encoding
+
+# Most responses kept in memory at once; the least recently used entry is evicted first
+CACHE_MAX_ENTRIES = 256
+
+# Search results get their own, smaller LRU: every keystroke of a live search is
+# a new query string, and they would otherwise evict the catalog responses
+SEARCH_CACHE_MAX_ENTRIES = 64
+
+# Response headers stored alongside the cached body
+CACHED_HEADERS = ("X-Total-Count", "X-Next-Cursor", "Link")
+
+
+class ResponseCache:
+    """A small thread-safe LRU of rendered responses."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0}
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["version"] != version:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_not_modified(self):
+        with self._lock:
+            self._stats["not_modified"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+
+response_cache = ResponseCache()
+search_cache = ResponseCache(SEARCH_CACHE_MAX_ENTRIES)
+
+
+def data_version(db):
+    """Current version of the catalog tables, bumped by triggers on every write."""
+    row = db.execute("SELECT version FROM data_version WHERE name = 'catalog'").fetchone()
+    return row[0] if row else 0
+
+
+def cached_response(view=None, *, cache=None):
+    """Serve a read-only view from memory until the catalog data changes.
+
+    Entries are keyed by database file, path and query string and tagged with
+    the data version they were rendered at; the cache is shared by every app in
+    the process, and two databases can be at the same version. Responses carry
+    a strong ETag derived from the body, so a client that sends it back in
+    If-None-Match gets an empty 304. Gzip and brotli variants of the body are
+    compressed once and kept with the entry.
+
+    Entries go to ``response_cache`` unless another ``cache`` is given, as in
+    ``@cached_response(cache=search_cache)``.
+    """
+    if view is None:
+        return functools.partial(cached_response, cache=cache)
+    if cache is None:
+        cache = response_cache
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        version = data_version(get_db())
+        key = (current_app.config["DATABASE"], request.path, tuple(sorted(request.args.items(multi=True))))
+
+        entry = cache.get(key, version)
+        if entry is None:
+            rendered = make_response(view(*args, **kwargs))
+            if rendered.status_code != 200:
+                return rendered
+            body = rendered.get_data()
+            entry = {
+                "version": version,
+                "body": body,
+                "etag": hashlib.sha256(body).hexdigest(),
+                "mimetype": rendered.mimetype,
+                "headers": {h: rendered.headers[h] for h in CACHED_HEADERS if h in rendered.headers},
+                "encoded": {},
+            }
+            cache.set(key, entry)
+
+        response = Response(entry["body"], mimetype=entry["mimetype"], headers=entry["headers"])
+        response.set_etag(entry["etag"])
+        encoding = negotiate_encoding(response)
+        if encoding:
+            if encoding not in entry["encoded"]:
+                entry["encoded"][encoding] = compress(entry["body"], encoding)
+            apply_encoding(response, encoding, entry["encoded"][encoding])
+        # Let clients keep the body but revalidate it on every use
+        response.headers["Cache-Control"] = "no-cache"
+        response = response.make_conditional(request)
+        if response.status_code == 304:
+            cache.record_not_modified()
+        return response
+
+    return wrapper
@@ -0,0 +1,39 @@
+import threading
+import time
+
+from flask import current_app
+
+from .cache import data_version
+
+# Row counts are served from memory for at most this many seconds before being recounted
+COUNT_CACHE_TTL = 60
+
+_counts = {}
+_lock = threading.Lock()
+
+
+def cached_count(db, key, query, params=(), ttl=COUNT_CACHE_TTL):
+    """Return a row count for a catalog table, reusing the last result while the catalog is unchanged.
+
+    Counts are kept per database file and recounted as soon as the catalog's
+    data version moves, or after ``ttl`` seconds at the latest.
+    """
+    now = time.monotonic()
+    version = data_version(db)
+    cache_key = (current_app.config["DATABASE"], key)
+    with _lock:
+        cached = _counts.get(cache_key)
+    if cached and cached[2] == version and now - cached[1] < ttl:
+        return cached[0]
+
+    count = db.execute(query, params).fetchone()[0]
+    with _lock:
+        _counts[cache_key] = (count, now, version)
+    return count
+
+
+def invalidate_counts(prefix=""):
+    """Drop cached counts whose key starts with ``prefix`` (all of them by default)."""
+    with _lock:
+        for cache_key in [k for k in _counts if k[1].startswith(prefix)]:
+            del _counts[cache_key]
@@ -1,9 +1,143 @@
 import sqlite3
+import threading
+import weakref
+
+from flask import current_app, g, has_app_context
+
+from ..config import DATABASE, SQLITE_PRAGMAS
+from .metrics import InstrumentedConnection
+
+
+class _ThreadOwner:
+    """Lives in a thread's local storage; when the thread exits it is dropped and its connection closed."""
+
+    __slots__ = ("__weakref__",)
+
+
+class ConnectionPool:
+    """Keeps one SQLite connection per worker thread and reuses it across requests.
+
+    Servers that start a thread per request (the Werkzeug dev server, the
+    benchmark's threaded server) would otherwise leave one open connection
+    behind per request. Each connection is tied to its thread's local storage
+    and closed once that thread has exited, so the pool never holds more
+    connections than there are live threads using it.
+    """
+
+    def __init__(self, database, pragmas=None):
+        self.database = database
+        self.pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._stats = {"opened": 0, "reused": 0, "released": 0, "rolled_back": 0, "closed": 0}
+
+    def open(self):
+        """Open a connection with the pool's settings that is not shared with anyone; the caller closes it."""
+        # Instrumented so every statement shows up in Server-Timing and the slow-query log
+        conn = sqlite3.connect(self.database, check_same_thread=False, factory=InstrumentedConnection)
+        conn.row_factory = sqlite3.Row  # Enables dictionary-like access to rows
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _connect(self):
+        conn = self.open()
+        with self._lock:
+            self._connections.append(conn)
+            self._stats["opened"] += 1
+        owner = self._local.owner = _ThreadOwner()
+        weakref.finalize(owner, self._discard, conn)
+        return conn
+
+    def _discard(self, conn):
+        # Runs when the thread that owned the connection is gone
+        with self._lock:
+            try:
+                self._connections.remove(conn)
+            except ValueError:
+                return  # Already closed by close_all
+            self._stats["closed"] += 1
+        conn.close()
+
+    def acquire(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        else:
+            with self._lock:
+                self._stats["reused"] += 1
+        return conn
+
+    def release(self, conn):
+        """Hand a connection back, discarding any transaction left open by the caller."""
+        rolled_back = conn.in_transaction
+        if rolled_back:
+            conn.rollback()
+        with self._lock:
+            self._stats["released"] += 1
+            if rolled_back:
+                self._stats["rolled_back"] += 1
+
+    def close_all(self):
+        """Close every connection opened by this pool (e.g. on shutdown or in tests)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, database=self.database, connections=len(self._connections))
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database=None):
+    """Return the shared pool for a database file, creating it on first use."""
+    if database is None:
+        database = current_app.config.get("DATABASE", DATABASE) if has_app_context() else DATABASE
+    with _pools_lock:
+        pool = _pools.get(database)
+        if pool is None:
+            pool = _pools[database] = ConnectionPool(database)
+        return pool
 
-from ..config import DATABASE
 
 def get_db():
-    print(f"Connecting to database at: {DATABASE}") 
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row  # Enables dictionary-like access to rows
-    return conn
+    """Return the connection for the current app context.
+
+    Inside a request the connection comes from the per-thread pool and is kept
+    on ``g`` until the app context tears down, so callers must not close it.
+    Outside of Flask (scripts, seeds) a fresh connection is returned instead.
+    """
+    if not has_app_context():
+        conn = sqlite3.connect(DATABASE)
+        conn.row_factory = sqlite3.Row
+        return conn
+    if "db" not in g:
+        g.db = get_pool().acquire()
+    return g.db
+
+
+def close_db(exception=None):
+    """Return the app context's connection to the pool."""
+    conn = g.pop("db", None)
+    if conn is not None:
+        get_pool().release(conn)
+
+
+def pool_stats():
+    """Statistics for every pool opened in this process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
+
+
+def init_app(app):
+    app.config.setdefault("DATABASE", DATABASE)
+    app.teardown_appcontext(close_db)
@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+
+from flask import current_app, has_app_context
+
+from ..config import DATABASE
+from .db import get_pool
+from .maintenance import TASKS
+
+# How often an idle runner checks for jobs queued by other processes
+JOB_POLL_SECONDS = 5
+
+# A running job whose heartbeat is older than this was left behind by a process
+# that died, and is queued again (tasks are safe to run twice)
+JOB_STALE_SECONDS = 600
+
+JOB_COLUMNS = (
+    "id, type, params, status, progress, total, message, result, error, "
+    "created_at, started_at, finished_at, updated_at"
+)
+
+
+class Job:
+    """What a task sees of its job: its parameters and a way to report progress."""
+
+    def __init__(self, conn, database, id, params):
+        self.conn = conn
+        self.database = database
+        self.id = id
+        self.params = params
+
+    def report(self, progress, total=None, message=None, conn=None):
+        """Record progress. Inside a batch transaction it is committed with the batch.
+
+        A task writing through a connection of its own passes it as ``conn``, so
+        the progress (and the heartbeat in updated_at) is committed with that
+        connection's transaction instead of waiting for its write lock.
+        """
+        (conn or self.conn).execute(
+            """
+            UPDATE jobs SET
+                progress = ?,
+                total = COALESCE(?, total),
+                message = COALESCE(?, message),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (progress, total, message, self.id),
+        )
+
+
+def job_to_dict(row):
+    job = dict(row)
+    for column in ("params", "result"):
+        if job[column] is not None:
+            job[column] = json.loads(job[column])
+    return job
+
+
+def get_job(db, job_id):
+    return db.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+
+def enqueue(db, job_type, params=None, database=None):
+    """Queue a job on ``db`` and wake this process's runner; returns the job id.
+
+    Raises ValueError for an unknown job type.
+    """
+    if job_type not in TASKS:
+        raise ValueError(f"Unknown job type '{job_type}'. Choose from {', '.join(TASKS)}")
+    job_id = db.execute(
+        "INSERT INTO jobs (type, params) VALUES (?, ?)", (job_type, json.dumps(params or {}))
+    ).lastrowid
+    db.commit()
+    get_runner(database).notify()
+    return job_id
+
+
+class JobRunner:
+    """Runs queued jobs one at a time on a daemon thread with its own connection.
+
+    Several processes may each run one; a job is claimed in a write transaction,
+    so it only ever runs once.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def notify(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"jobs:{self.database}", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _claim(self, conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'queued', message = 'Requeued after the runner stopped'
+                WHERE status = 'running' AND updated_at < datetime('now', ?)
+                """,
+                (f"-{JOB_STALE_SECONDS} seconds",),
+            )
+            row = conn.execute(
+                "SELECT id, type, params FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    """
+                    UPDATE jobs SET status = 'running', started_at = CURRENT_TIMESTAMP,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                    """,
+                    (row["id"],),
+                )
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _finish(self, conn, job_id, status, result=None, error=None):
+        conn.execute(
+            """
+            UPDATE jobs SET status = ?, result = ?, error = ?,
+                finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (status, json.dumps(result) if result is not None else None, error, job_id),
+        )
+
+    def run_next(self, conn):
+        """Claim and run the oldest queued job; returns False when there was none."""
+        row = self._claim(conn)
+        if row is None:
+            return False
+
+        job = Job(conn, self.database, row["id"], json.loads(row["params"] or "{}"))
+        started = time.perf_counter()
+        try:
+            result = TASKS[row["type"]](conn, job)
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"Job {job.id} ({row['type']}) failed: {e!r}")
+            self._finish(conn, job.id, "failed", error=str(e))
+        else:
+            print(f"Job {job.id} ({row['type']}) finished in {time.perf_counter() - started:.2f}s")
+            self._finish(conn, job.id, "succeeded", result=result)
+        return True
+
+    def _run(self):
+        conn = get_pool(self.database).acquire()
+        # Tasks manage their own short transactions
+        conn.isolation_level = None
+        while True:
+            self._wake.clear()
+            try:
+                while self.run_next(conn):
+                    pass
+            except Exception as e:
+                print(f"Job runner error: {e!r}")
+            self._wake.wait(JOB_POLL_SECONDS)
+
+
+_runners = {}
+_runners_lock = threading.Lock()
+
+
+def get_runner(database=None):
+    """Return the runner for a database file, creating it on first use."""
+    if database is None:
+        database = current_app.config.get("DATABASE", DATABASE) if has_app_context() else DATABASE
+    with _runners_lock:
+        runner = _runners.get(database)
+        if runner is None:
+            runner = _runners[database] = JobRunner(database)
+        return runner
@@ -0,0 +1,395 @@
+"""Write-ahead journal for quiz answers.
+
+``POST /study-sessions/<id>/responses:append`` hands answers to the journal of
+the database they belong to. The answers are written to a journal file first and
+then kept in memory. A flusher thread inserts everything that is waiting in one
+transaction every ``JOURNAL_FLUSH_MS`` milliseconds. It flushes sooner once
+``JOURNAL_FLUSH_ROWS`` answers are waiting. One commit covers many answers from
+many sessions, so a busy quiz does not cost one write transaction per answer.
+
+Each process writes its own numbered segment files in ``<database>.responses/``.
+It holds an exclusive lock on ``<owner>.lock`` for as long as it runs.
+A segment is deleted once its answers are committed. When a process dies before
+that, the next process to open the journal can take the lock and insert the
+leftover segments (see ``recover``). Every answer carries a
+``client_response_id``, so replaying a segment that was partly committed
+inserts nothing twice.
+
+Each worker process flushes only its own journal. Requests that read a
+session's answers back (resume and complete) therefore also wait, through
+``flush_journal(session_id=...)``, until no other process's segment still
+holds answers for that session. Next to every segment, ``<owner>-<n>.sessions``
+lists the sessions it holds answers for, so that wait reads a few ids per
+segment rather than every journaled answer.
+
+Answers are committed on a connection of the journal's own, never on the
+pooled connection of the request that triggered the flush.
+"""
+import atexit
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+from flask import current_app, has_app_context
+
+from ..config import DATABASE, JOURNAL_FLUSH_MS, JOURNAL_FLUSH_ROWS, JOURNAL_FSYNC
+from .db import get_pool
+from .sessions import insert_responses, refresh_active_time
+
+
+def journal_dir(database):
+    return f"{database}.responses"
+
+
+def apply_entries(conn, entries):
+    """Insert journaled answers in one write transaction; returns how many were applied.
+
+    Answers for sessions deleted since they were journaled are dropped. The
+    connection must not be in a transaction, since this one is committed.
+    """
+    by_session = {}
+    for entry in entries:
+        by_session.setdefault(entry["session_id"], []).append(entry)
+
+    if conn.in_transaction:
+        raise RuntimeError("Journaled answers are committed on their own; the connection is already in a transaction")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cursor = conn.cursor()
+        session_ids = list(by_session)
+        existing = {
+            row[0]
+            for row in cursor.execute(
+                f"SELECT id FROM study_sessions WHERE id IN ({', '.join('?' * len(session_ids))})", session_ids
+            )
+        }
+        applied = 0
+        for session_id, responses in by_session.items():
+            if session_id not in existing:
+                print(f"Dropping {len(responses)} journaled responses for deleted session {session_id}")
+                continue
+            insert_responses(cursor, session_id, responses)
+            refresh_active_time(cursor, session_id)
+            applied += len(responses)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
+
+
+def read_segment(path):
+    """Entries in a segment file. A torn last line from a crash mid-write is skipped."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                print(f"Skipping unreadable journal line in {path}")
+    return entries
+
+
+def _index_path(segment_path):
+    """The file listing the sessions a segment holds answers for."""
+    return segment_path[: -len(".jsonl")] + ".sessions"
+
+
+def _remove_segment(path):
+    """Delete a committed segment, then its session list."""
+    os.remove(path)
+    try:
+        os.remove(_index_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def _segments(directory, owner):
+    """Segment files of one owner in the order they were written."""
+    paths = glob.glob(os.path.join(directory, f"{owner}-*.jsonl"))
+    return sorted(paths, key=lambda p: int(p.rsplit("-", 1)[1].split(".")[0]))
+
+
+def recover(database):
+    """Insert the segments left behind by processes that stopped before flushing them.
+
+    A segment whose owner still holds its lock belongs to a live process and is
+    left alone. Returns the number of answers applied.
+    """
+    directory = journal_dir(database)
+    if not os.path.isdir(directory):
+        return 0
+
+    applied = 0
+    conn = None
+    try:
+        for lock_path in glob.glob(os.path.join(directory, "*.lock")):
+            owner = os.path.basename(lock_path)[: -len(".lock")]
+            with open(lock_path, "a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # Still running
+                for path in _segments(directory, owner):
+                    entries = read_segment(path)
+                    if entries:
+                        conn = conn or get_pool(database).open()
+                        applied += apply_entries(conn, entries)
+                    _remove_segment(path)
+                # Session lists whose segment was removed just before the process died
+                for path in glob.glob(os.path.join(directory, f"{owner}-*.sessions")):
+                    os.remove(path)
+                os.remove(lock_path)
+    finally:
+        if conn is not None:
+            conn.close()
+    if applied:
+        print(f"Replayed {applied} journaled responses into {database}")
+    return applied
+
+
+class ResponseJournal:
+    """Buffers answers for one database and group-commits them from a flusher thread."""
+
+    def __init__(self, database, flush_ms=JOURNAL_FLUSH_MS, flush_rows=JOURNAL_FLUSH_ROWS):
+        self.database = database
+        self.flush_seconds = flush_ms / 1000
+        self.flush_rows = flush_rows
+        self.directory = journal_dir(database)
+        self.owner = uuid.uuid4().hex
+
+        self._lock = threading.Lock()  # Guards the buffer and the open segment
+        self._flush_lock = threading.Lock()  # One flush at a time
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._pending = []
+        self._sealed = []  # Closed segments whose entries are still in _pending
+        self._segment = None
+        self._segment_index = None  # The open segment's session list
+        self._segment_sessions = set()
+        self._segment_number = 0
+        self._lock_file = None
+        self._conn = None  # Only used by flush, under _flush_lock
+        self._thread = None
+        self._stats = {"appended": 0, "flushed": 0, "flushes": 0}
+
+    def _open_segment(self):
+        if self._lock_file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            lock_path = os.path.join(self.directory, f"{self.owner}.lock")
+            while True:
+                lock_file = open(lock_path, "a")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                # recover() may have removed the file before we locked it
+                if os.path.exists(lock_path) and os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_path)):
+                    break
+                lock_file.close()
+            self._lock_file = lock_file
+        self._segment_number += 1
+        path = os.path.join(self.directory, f"{self.owner}-{self._segment_number}.jsonl")
+        self._segment = open(path, "a", encoding="utf-8")
+        self._segment_index = open(_index_path(path), "a", encoding="utf-8")
+        self._segment_sessions = set()
+        return self._segment
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f"journal:{self.database}", daemon=True)
+            self._thread.start()
+
+    def append(self, session_id, responses):
+        """Journal already-validated responses; returns their client_response_ids.
+
+        Responses without a ``client_response_id`` or ``timestamp`` get one here,
+        so they keep the time they were answered and can be replayed safely.
+        """
+        now = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        entries = [
+            {
+                "session_id": session_id,
+                "question_id": response["question_id"],
+                "user_response": response["user_response"],
+                "is_correct": bool(response["is_correct"]),
+                "timestamp": response.get("timestamp") or now,
+                "client_response_id": response.get("client_response_id") or uuid.uuid4().hex,
+            }
+            for response in responses
+        ]
+        data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+
+        with self._lock:
+            segment = self._segment or self._open_segment()
+            new_sessions = {entry["session_id"] for entry in entries} - self._segment_sessions
+            if new_sessions:
+                # Listed before the answers are written, so a waiting request never misses them.
+                # Not fsynced: recover reads the segment itself, the list only serves waits.
+                self._segment_index.write("".join(f"{session_id}\n" for session_id in sorted(new_sessions)))
+                self._segment_index.flush()
+                self._segment_sessions |= new_sessions
+            segment.write(data)
+            segment.flush()
+            if JOURNAL_FSYNC:
+                os.fsync(segment.fileno())
+            self._pending.extend(entries)
+            self._stats["appended"] += len(entries)
+            full = len(self._pending) >= self.flush_rows
+            self._start()
+        if full:
+            self._wake.set()
+        return [entry["client_response_id"] for entry in entries]
+
+    def flush(self):
+        """Commit everything journaled so far; returns the number of answers applied."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                entries, self._pending = self._pending, []
+                if self._segment is not None:
+                    self._sealed.append(self._segment.name)
+                    self._segment.close()
+                    self._segment_index.close()
+                    self._segment = self._segment_index = None
+                sealed, self._sealed = self._sealed, []
+
+            try:
+                if self._conn is None:
+                    self._conn = get_pool(self.database).open()
+                applied = apply_entries(self._conn, entries)
+            except Exception:
+                # Keep the answers and their segments for the next attempt
+                with self._lock:
+                    self._pending[:0] = entries
+                    self._sealed[:0] = sealed
+                raise
+
+            for path in sealed:
+                _remove_segment(path)
+            with self._lock:
+                self._stats["flushed"] += len(entries)
+                self._stats["flushes"] += 1
+            return applied
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Journal flush for {self.database} failed, will retry: {e!r}")
+
+    def close(self):
+        """Flush what is waiting and stop. Unflushed segments stay on disk for ``recover``."""
+        self._stopped.set()
+        self._wake.set()
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Journal flush for {self.database} failed on shutdown: {e!r}")
+        with self._flush_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        with self._lock:
+            if self._lock_file is not None and not self._pending:
+                os.remove(self._lock_file.name)
+                self._lock_file.close()
+                self._lock_file = None
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending))
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(database=None):
+    """Return the journal for a database file, replaying leftover segments on first use."""
+    if database is None:
+        database = current_app.config.get("DATABASE", DATABASE) if has_app_context() else DATABASE
+    with _journals_lock:
+        journal = _journals.get(database)
+        if journal is None:
+            recover(database)
+            journal = _journals[database] = ResponseJournal(database)
+            atexit.register(journal.close)
+        return journal
+
+
+def journal_stats():
+    with _journals_lock:
+        journals = list(_journals.values())
+    return [dict(journal.stats(), database=journal.database) for journal in journals]
+
+
+# Longest time a request waits for other processes to commit a session's answers
+JOURNAL_WAIT_SECONDS = max(1.0, 5 * JOURNAL_FLUSH_MS / 1000)
+
+
+def _waiting_segments(directory, session_id):
+    """Segment files that still hold answers for the session, found through their session lists."""
+    waiting = []
+    for index_path in glob.glob(os.path.join(directory, "*.sessions")):
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                listed = str(session_id) in (line.strip() for line in f)
+        except FileNotFoundError:
+            continue  # Committed and removed while we looked
+        path = index_path[: -len(".sessions")] + ".jsonl"
+        if listed and os.path.exists(path):
+            waiting.append(path)
+    return waiting
+
+
+def wait_for_session(database, session_id, timeout=JOURNAL_WAIT_SECONDS):
+    """Wait until no journal segment of any process holds answers for ``session_id``.
+
+    Segments are removed once their answers are committed, so this returns as
+    soon as the processes that took the answers have flushed. Segments of
+    processes that died are replayed once, before waiting. Returns False if
+    answers were still waiting after ``timeout`` seconds.
+    """
+    directory = journal_dir(database)
+    if not os.path.isdir(directory):
+        return True
+    deadline = time.monotonic() + timeout
+    recover(database)
+    while True:
+        waiting = _waiting_segments(directory, session_id)
+        if not waiting:
+            return True
+        if time.monotonic() >= deadline:
+            print(f"Answers for session {session_id} still waiting in {len(waiting)} journal segments")
+            return False
+        time.sleep(0.01)
+
+
+def flush_journal(database=None, session_id=None):
+    """Commit answers waiting in this process's journal for the database, if it has one.
+
+    With ``session_id``, also wait for other processes to commit answers they
+    journaled for that session (see ``wait_for_session``).
+    """
+    if database is None:
+        database = current_app.config.get("DATABASE", DATABASE) if has_app_context() else DATABASE
+    with _journals_lock:
+        journal = _journals.get(database)
+    applied = journal.flush() if journal is not None else 0
+    if session_id is not None:
+        wait_for_session(database, session_id)
+    return applied
+
+
+def init_app(app):
+    """Replay answers a crashed process left in the journal before serving requests."""
+    try:
+        recover(app.config["DATABASE"])
+    except Exception as e:
+        print(f"Could not replay the response journal: {e!r}")
@@ -0,0 +1,240 @@
+"""Maintenance tasks run as background jobs (see db.lib.jobs).
+
+Each task is called as ``task(conn, job)`` on the runner's own autocommit
+connection and returns a JSON-serializable result. Rows are changed in batches
+of ``JOB_BATCH_SIZE``, each in its own short write transaction, with progress
+written to the job row in the same transaction.
+"""
+from datetime import date, timedelta
+
+from ..config import JOB_BATCH_SIZE, JOB_PAUSE_SECONDS
+from ..schema import backfill_in_batches
+from .reviews import UPSERT_REVIEW
+
+
+def _in(ids):
+    return ", ".join("?" * len(ids))
+
+
+def _delete_in_batches(conn, job, table, where="1=1", done=0):
+    """Delete the rows of ``table`` matching ``where`` a batch at a time; returns rows deleted."""
+
+    def apply(conn, rowids):
+        conn.execute(f"DELETE FROM {table} WHERE rowid IN ({_in(rowids)})", rowids)
+        apply.deleted += len(rowids)
+        job.report(done + apply.deleted)
+
+    apply.deleted = 0
+    backfill_in_batches(conn, table, apply, where=where, batch_size=JOB_BATCH_SIZE, pause=JOB_PAUSE_SECONDS)
+    return apply.deleted
+
+
+def _replay_reviews(conn, job, where, done=0):
+    """Rebuild the review schedule of the words matching ``where`` from their remaining responses.
+
+    Each batch of words is cleared and replayed in one transaction, so answers
+    recorded meanwhile are either replayed or applied by the trigger afterwards.
+    Returns the number of words rebuilt.
+    """
+
+    def apply(conn, word_ids):
+        conn.execute(f"DELETE FROM word_reviews WHERE word_id IN ({_in(word_ids)})", word_ids)
+        responses = conn.execute(
+            f"""
+            SELECT question_id, is_correct, created_at FROM session_responses
+            WHERE question_id IN ({_in(word_ids)})
+            ORDER BY created_at, id
+            """,
+            word_ids,
+        ).fetchall()
+        conn.executemany(
+            UPSERT_REVIEW, ({"question_id": q, "is_correct": c, "created_at": t} for q, c, t in responses)
+        )
+        apply.rebuilt += len(word_ids)
+        job.report(done + apply.rebuilt)
+
+    apply.rebuilt = 0
+    backfill_in_batches(conn, "words", apply, where=where, batch_size=JOB_BATCH_SIZE, pause=JOB_PAUSE_SECONDS)
+    return apply.rebuilt
+
+
+def reset_sessions(conn, job):
+    """Delete every study session that existed when the job started, with its responses.
+
+    Sessions started while the reset runs are kept. Review schedules are
+    derived from responses, so those of the words answered in the deleted
+    sessions are rebuilt from the responses that are left.
+    """
+    last_session = conn.execute("SELECT COALESCE(MAX(id), 0) FROM study_sessions").fetchone()[0]
+    scope = f"session_id <= {int(last_session)}"
+    conn.execute("DROP TABLE IF EXISTS temp.reset_words")
+    conn.execute(
+        f"CREATE TEMP TABLE reset_words AS SELECT DISTINCT question_id AS word_id FROM session_responses WHERE {scope}"
+    )
+    counts = {
+        "responses": conn.execute(f"SELECT COUNT(*) FROM session_responses WHERE {scope}").fetchone()[0],
+        "sessions": conn.execute("SELECT COUNT(*) FROM study_sessions WHERE id <= ?", (last_session,)).fetchone()[0],
+        "reviews": conn.execute("SELECT COUNT(*) FROM temp.reset_words").fetchone()[0],
+    }
+    job.report(0, total=sum(counts.values()), message="Deleting responses")
+
+    try:
+        responses = _delete_in_batches(conn, job, "session_responses", scope)
+        job.report(responses, message="Deleting sessions")
+        sessions = _delete_in_batches(conn, job, "study_sessions", f"id <= {int(last_session)}", done=responses)
+        job.report(responses + sessions, message="Rebuilding review schedules")
+        reviews = _replay_reviews(
+            conn, job, "id IN (SELECT word_id FROM temp.reset_words)", done=responses + sessions
+        )
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.reset_words")
+
+    return {"responses_deleted": responses, "sessions_deleted": sessions, "reviews_rebuilt": reviews}
+
+
+def reseed(conn, job):
+    """Load groups, study activities and word lists, as ``python3 tasks.py seed`` does."""
+    from ..seeds.groups import seed_groups
+    from ..seeds.study_activities import seed_study_activities
+    from ..seeds.words import seed_words
+
+    force = bool(job.params.get("force"))
+
+    def file_seeded(seed_conn, done, total, filename):
+        # Committed with the file, so the heartbeat stays fresh however long seeding takes
+        job.report(2, message=f"Seeding words: {filename} ({done}/{total} files)", conn=seed_conn)
+
+    steps = [
+        ("Seeding groups", lambda: seed_groups(job.database)),
+        ("Seeding study activities", lambda: seed_study_activities(job.database)),
+        ("Seeding words", lambda: seed_words(job.database, force=force, progress=file_seeded)),
+    ]
+    for done, (message, step) in enumerate(steps):
+        job.report(done, total=len(steps), message=message)
+        step()
+    job.report(len(steps), message="Done")
+
+    words = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+    return {"words": words}
+
+
+def reindex(conn, job):
+    """Rebuild the words_fts search index from the words table, then optimize it."""
+    job.report(0, total=conn.execute("SELECT COUNT(*) FROM words").fetchone()[0], message="Indexing words")
+
+    def apply(conn, ids):
+        conn.execute(f"DELETE FROM words_fts WHERE rowid IN ({_in(ids)})", ids)
+        conn.execute(
+            f"""
+            INSERT INTO words_fts (rowid, arabic, romanized, english, example)
+            SELECT id, arabic, romanized, english, example FROM words_search_source WHERE id IN ({_in(ids)})
+            """,
+            ids,
+        )
+        apply.indexed += len(ids)
+        job.report(apply.indexed)
+
+    apply.indexed = 0
+    backfill_in_batches(conn, "words", apply, batch_size=JOB_BATCH_SIZE, pause=JOB_PAUSE_SECONDS)
+
+    job.report(apply.indexed, message="Optimizing")
+    conn.execute("DELETE FROM words_fts WHERE rowid NOT IN (SELECT id FROM words)")
+    conn.execute("INSERT INTO words_fts (words_fts) VALUES ('optimize')")
+    conn.execute("PRAGMA optimize")
+    return {"words_indexed": apply.indexed}
+
+
+# Same aggregate as the backfill in migration 005, for the sessions started in one window
+ROLLUP_WINDOW_SQL = """
+    INSERT OR REPLACE INTO daily_activity_rollups
+        (study_date, activity_type, session_count, completed_sessions, minutes_studied, score_sum)
+    SELECT date(ss.start_time),
+           COALESCE(sa.type, 'unknown'),
+           COUNT(*),
+           SUM(CASE WHEN ss.end_time IS NOT NULL THEN 1 ELSE 0 END),
+           SUM(CASE WHEN ss.end_time IS NOT NULL
+               THEN CAST((julianday(ss.end_time) - julianday(ss.start_time)) * 24 * 60 AS INTEGER)
+               ELSE 0 END),
+           SUM(CASE WHEN sc.total_questions > 0
+               THEN sc.correct_answers * 100.0 / sc.total_questions
+               ELSE 0 END)
+    FROM study_sessions ss
+    LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+    LEFT JOIN session_scores sc ON sc.session_id = ss.id
+    WHERE ss.start_time >= ? AND ss.start_time < ?
+    GROUP BY date(ss.start_time), COALESCE(sa.type, 'unknown')
+"""
+
+
+def _months(first, last):
+    """(start, end) date strings for every calendar month from ``first`` to ``last``."""
+    month = date.fromisoformat(first).replace(day=1)
+    last = date.fromisoformat(last)
+    while month <= last:
+        following = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        yield month.isoformat(), following.isoformat()
+        month = following
+
+
+def rebuild_rollups(conn, job):
+    """Recompute session_scores from the responses and daily_activity_rollups from the sessions.
+
+    Scores are rebuilt a batch of sessions at a time, then the daily rollups one
+    month at a time, so each transaction only touches a bounded slice.
+    """
+    sessions = conn.execute("SELECT COUNT(*) FROM study_sessions").fetchone()[0]
+    first, last = conn.execute("SELECT date(MIN(start_time)), date(MAX(start_time)) FROM study_sessions").fetchone()
+    months = list(_months(first, last)) if first else []
+    job.report(0, total=sessions + len(months), message="Rebuilding session scores")
+
+    def apply(conn, ids):
+        conn.execute(f"DELETE FROM session_scores WHERE session_id IN ({_in(ids)})", ids)
+        conn.execute(
+            f"""
+            INSERT INTO session_scores
+                (session_id, total_questions, correct_answers, first_response_at, last_response_at)
+            SELECT session_id,
+                   COUNT(*),
+                   SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END),
+                   MIN(created_at),
+                   MAX(created_at)
+            FROM session_responses
+            WHERE session_id IN ({_in(ids)})
+            GROUP BY session_id
+            """,
+            ids,
+        )
+        apply.done += len(ids)
+        job.report(apply.done)
+
+    apply.done = 0
+    backfill_in_batches(conn, "study_sessions", apply, batch_size=JOB_BATCH_SIZE, pause=JOB_PAUSE_SECONDS)
+    conn.execute("DELETE FROM session_scores WHERE session_id NOT IN (SELECT id FROM study_sessions)")
+
+    job.report(apply.done, message="Rebuilding daily rollups")
+    for done, (start, end) in enumerate(months, start=1):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM daily_activity_rollups WHERE study_date >= ? AND study_date < ?", (start, end))
+            conn.execute(ROLLUP_WINDOW_SQL, (start, end))
+            job.report(apply.done + done)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    if months:
+        conn.execute(
+            "DELETE FROM daily_activity_rollups WHERE study_date < ? OR study_date >= ?", (months[0][0], months[-1][1])
+        )
+    else:
+        conn.execute("DELETE FROM daily_activity_rollups")
+
+    return {"sessions": sessions, "months": len(months)}
+
+
+TASKS = {
+    "reset-sessions": reset_sessions,
+    "reseed": reseed,
+    "reindex": reindex,
+    "rebuild-rollups": rebuild_rollups,
+}
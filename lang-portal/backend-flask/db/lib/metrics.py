@@ -0,0 +1,215 @@
+import functools
+import itertools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, g, has_app_context, has_request_context, request
+
+from ..config import SLOW_QUERY_LOG, SLOW_QUERY_MS
+
+# Statements kept per request for the Server-Timing header; larger requests only keep the count
+MAX_STATEMENTS_PER_REQUEST = 200
+
+# Distinct statements tracked process-wide in the metrics endpoint
+MAX_TRACKED_STATEMENTS = 500
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+class SQLMetrics:
+    """Process-wide counters for SQL statements and the requests that issued them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._statements = {}
+            self._endpoints = {}
+            self._slow_queries = 0
+
+    def record_statement(self, sql, elapsed_ms, slow):
+        with self._lock:
+            if slow:
+                self._slow_queries += 1
+            entry = self._statements.get(sql)
+            if entry is None:
+                if len(self._statements) >= MAX_TRACKED_STATEMENTS:
+                    return
+                entry = self._statements[sql] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def record_request(self, endpoint, queries, sql_ms, total_ms):
+        with self._lock:
+            entry = self._endpoints.setdefault(
+                endpoint, {"requests": 0, "queries": 0, "sql_ms": 0.0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            entry["requests"] += 1
+            entry["queries"] += queries
+            entry["sql_ms"] += sql_ms
+            entry["total_ms"] += total_ms
+            entry["max_ms"] = max(entry["max_ms"], total_ms)
+
+    def snapshot(self, top=20):
+        with self._lock:
+            statements = sorted(self._statements.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            endpoints = {
+                name: dict(
+                    entry,
+                    avg_queries=round(entry["queries"] / entry["requests"], 2),
+                    avg_ms=round(entry["total_ms"] / entry["requests"], 3),
+                )
+                for name, entry in self._endpoints.items()
+            }
+            return {
+                "slow_queries": self._slow_queries,
+                "endpoints": endpoints,
+                "statements": [
+                    dict(entry, sql=sql, avg_ms=round(entry["total_ms"] / entry["count"], 3))
+                    for sql, entry in statements[:top]
+                ],
+            }
+
+
+sql_metrics = SQLMetrics()
+_slow_log_lock = threading.Lock()
+
+
+def _config(name, default):
+    return current_app.config.get(name, default) if has_app_context() else default
+
+
+def _explain(conn, sql, params):
+    try:
+        rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    except sqlite3.Error:
+        return []
+    return [row[3] for row in rows]
+
+
+def _log_slow_query(conn, sql, params, elapsed_ms):
+    path = _config("SLOW_QUERY_LOG", SLOW_QUERY_LOG)
+    entry = {
+        "at": datetime.now(timezone.utc).isoformat(),
+        "endpoint": request.endpoint if has_request_context() else None,
+        "ms": round(elapsed_ms, 3),
+        "sql": sql,
+        "plan": _explain(conn, sql, params),
+    }
+    with _slow_log_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def _record(conn, sql, params, elapsed):
+    elapsed_ms = elapsed * 1000
+    sql = normalize_sql(sql)
+    stats = g.get("sql_stats") if has_app_context() else None
+    slow = elapsed_ms >= (stats["slow_ms"] if stats is not None else _config("SLOW_QUERY_MS", SLOW_QUERY_MS))
+    sql_metrics.record_statement(sql, elapsed_ms, slow)
+
+    if stats is not None:
+        stats["queries"] += 1
+        stats["sql_ms"] += elapsed_ms
+        if len(stats["statements"]) < MAX_STATEMENTS_PER_REQUEST:
+            stats["statements"].append((sql, elapsed_ms))
+
+    if slow:
+        _log_slow_query(conn, sql, params, elapsed_ms)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times every statement it runs.
+
+    The time measured is what ``execute`` takes, i.e. preparing the statement
+    and stepping to the first row; rows fetched afterwards are not included.
+    """
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record(self.connection, sql, parameters, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        # Parameters may be a generator, so keep the first row for EXPLAIN
+        seq_of_parameters = iter(seq_of_parameters)
+        first = next(seq_of_parameters, None)
+        if first is not None:
+            seq_of_parameters = itertools.chain([first], seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record(self.connection, sql, first or (), time.perf_counter() - started)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose shortcut methods go through :class:`InstrumentedCursor`."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _start_request():
+    g.sql_stats = {
+        "queries": 0,
+        "sql_ms": 0.0,
+        "statements": [],
+        "slow_ms": current_app.config["SLOW_QUERY_MS"],
+        "started": time.perf_counter(),
+    }
+
+
+def _server_timing(stats, total_ms, detail):
+    entries = [
+        f'db;dur={stats["sql_ms"]:.3f};desc="{stats["queries"]} queries"',
+        f"app;dur={total_ms - stats['sql_ms']:.3f}",
+    ]
+    slowest = sorted(stats["statements"], key=lambda item: item[1], reverse=True)[:detail]
+    for i, (sql, elapsed_ms) in enumerate(slowest, start=1):
+        # Header values must be latin-1, and quotes would end the desc field
+        desc = sql[:80].encode("ascii", "replace").decode().replace("\\", "").replace('"', "'")
+        entries.append(f'sql-{i};dur={elapsed_ms:.3f};desc="{desc}"')
+    return ", ".join(entries)
+
+
+def _finish_request(response):
+    stats = g.pop("sql_stats", None)
+    if stats is None:
+        return response
+    total_ms = (time.perf_counter() - stats["started"]) * 1000
+    sql_metrics.record_request(request.endpoint or "<unmatched>", stats["queries"], stats["sql_ms"], total_ms)
+
+    # Statement text is only exposed per statement when debugging
+    detail = current_app.config.get("SERVER_TIMING_STATEMENTS", 5 if current_app.debug else 0)
+    response.headers["Server-Timing"] = _server_timing(stats, total_ms, detail)
+    return response
+
+
+def init_app(app):
+    app.config.setdefault("SLOW_QUERY_MS", SLOW_QUERY_MS)
+    app.config.setdefault("SLOW_QUERY_LOG", SLOW_QUERY_LOG)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,80 @@
+from urllib.parse import urlencode
+
+from flask import request
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def parse_page_args(columns, alias=None):
+    """Read ``limit``, ``after`` and ``fields`` from the query string.
+
+    Returns ``(limit, after, select_list)``. ``limit`` is None when the client
+    did not ask for a page, which keeps the old "return everything" behaviour.
+    ``alias`` qualifies the selected columns when the page is read from a join.
+    Raises ValueError with a client-facing message on bad input.
+    """
+    prefix = f"{alias}." if alias else ""
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+    fields = request.args.get("fields")
+
+    if limit is not None:
+        if not (limit.isascii() and limit.isdecimal()) or int(limit) < 1:
+            raise ValueError("limit must be a positive integer")
+        limit = min(int(limit), MAX_PAGE_SIZE)
+    elif after is not None:
+        limit = DEFAULT_PAGE_SIZE
+
+    if after is not None:
+        if not (after.isascii() and after.isdecimal()):
+            raise ValueError("after must be a word id")
+        after = int(after)
+    else:
+        after = 0
+
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        # The id is always returned because it is the pagination cursor
+        select_list = ", ".join(prefix + f for f in ["id"] + [f for f in requested if f != "id"])
+    else:
+        select_list = prefix + "*"
+
+    return limit, after, select_list
+
+
+def fetch_page(db, select_list, table, where, params, after, limit, key="id"):
+    """Run a keyset-paginated query ordered by ``key``.
+
+    ``key`` must hold the same value as the ``id`` column of the rows returned.
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    params = list(params)
+    if after:
+        where = f"{where} AND {key} > ?"
+        params.append(after)
+    query = f"SELECT {select_list} FROM {table} WHERE {where} ORDER BY {key}"
+
+    if limit is None:
+        return db.execute(query, params).fetchall(), None
+
+    # Fetch one extra row so we know whether another page exists
+    rows = db.execute(query + " LIMIT ?", params + [limit + 1]).fetchall()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]["id"]
+    return rows, None
+
+
+def page_headers(total, next_cursor, limit):
+    """Headers describing the page: total row count (unless None) and a link to the next page."""
+    headers = {} if total is None else {"X-Total-Count": str(total)}
+    if next_cursor is not None:
+        args = request.args.to_dict()
+        args.update(after=str(next_cursor), limit=str(limit))
+        headers["X-Next-Cursor"] = str(next_cursor)
+        headers["Link"] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+    return headers
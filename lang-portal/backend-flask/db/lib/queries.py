@@ -0,0 +1,182 @@
+"""Read queries shared by the REST endpoints and the composite /api/dashboard endpoint.
+
+Each function takes a connection and returns plain dicts/lists ready for jsonify,
+so several of them can run inside one read transaction.
+"""
+
+
+def latest_session(db):
+    """The most recently started study session with its group and activity names, or None."""
+    cursor = db.cursor()
+
+    latest_session = cursor.execute(
+        """
+        SELECT ss.id, g.name AS group_name, sa.name AS activity_name,
+               sa.type AS activity_type, ss.start_time, ss.end_time 
+        FROM study_sessions ss
+        JOIN groups g ON ss.group_id = g.id
+        JOIN study_activities sa ON ss.study_activity_id = sa.id
+        ORDER BY ss.start_time DESC 
+        LIMIT 1
+        """
+    ).fetchone()
+
+    return dict(latest_session) if latest_session else None
+
+
+def session_stats(db, date_from=None, date_to=None):
+    """Aggregated statistics about study sessions.
+
+    Everything is read from daily_activity_rollups, which triggers keep current as
+    sessions start, complete and get scored, so the cost depends on the number of
+    days in the range rather than the number of sessions. ``date_from`` and
+    ``date_to`` are applied at day granularity (both ends inclusive).
+    """
+    cursor = db.cursor()
+
+    params = []
+    date_condition = "1=1"
+
+    if date_from:
+        date_condition += " AND study_date >= date(?)"
+        params.append(date_from)
+
+    if date_to:
+        date_condition += " AND study_date <= date(?)"
+        params.append(date_to)
+
+    # Total sessions and completion stats
+    completion_stats = cursor.execute(
+        f"""
+        SELECT
+            COALESCE(SUM(session_count), 0) as total_sessions,
+            SUM(completed_sessions) as completed_sessions,
+            SUM(minutes_studied) as total_minutes
+        FROM daily_activity_rollups
+        WHERE {date_condition}
+        """,
+        params,
+    ).fetchone()
+
+    # Sessions by activity type
+    activity_types = cursor.execute(
+        f"""
+        SELECT
+            activity_type,
+            SUM(session_count) as session_count
+        FROM daily_activity_rollups
+        WHERE {date_condition}
+        GROUP BY activity_type
+        HAVING SUM(session_count) > 0
+        ORDER BY session_count DESC
+        """,
+        params,
+    ).fetchall()
+
+    # Get average scores for quiz/game activities (sessions without answers count as 0)
+    scores = cursor.execute(
+        f"""
+        SELECT
+            activity_type,
+            SUM(score_sum) / SUM(session_count) as average_score
+        FROM daily_activity_rollups
+        WHERE {date_condition} AND activity_type IN ('quiz', 'game')
+        GROUP BY activity_type
+        HAVING SUM(session_count) > 0
+        """,
+        params,
+    ).fetchall()
+
+    # Track daily activity
+    daily_activity = cursor.execute(
+        f"""
+        SELECT
+            study_date,
+            SUM(session_count) as session_count,
+            SUM(minutes_studied) as minutes_studied
+        FROM daily_activity_rollups
+        WHERE {date_condition}
+        GROUP BY study_date
+        HAVING SUM(session_count) > 0
+        ORDER BY study_date DESC
+        LIMIT 30
+        """,
+        params,
+    ).fetchall()
+
+    stats = {
+        "total_sessions": completion_stats["total_sessions"],
+        "completed_sessions": completion_stats["completed_sessions"],
+        "total_minutes": completion_stats["total_minutes"],
+        "activity_types": [dict(t) for t in activity_types],
+        "average_scores": [dict(s) for s in scores],
+        "daily_activity": [dict(d) for d in daily_activity],
+    }
+
+    return stats
+
+
+# Filters accepted by the session listing: name → (condition on study_sessions ss, query args it reads)
+SESSION_FILTERS = {
+    "group_id": ("ss.group_id = ?", ("group_id",)),
+    "study_activity_id": ("ss.study_activity_id = ?", ("study_activity_id",)),
+    "activity_type": ("ss.study_activity_id IN (SELECT id FROM study_activities WHERE type = ?)", ("activity_type",)),
+    "date_from": ("ss.start_time >= ?", ("date_from",)),
+    "date_to": ("ss.start_time <= ?", ("date_to",)),
+}
+
+
+def session_filters(args):
+    """The SESSION_FILTERS supplied in ``args``, as {name: (condition, params)}."""
+    filters = {}
+    for name, (condition, keys) in SESSION_FILTERS.items():
+        values = [args.get(key) for key in keys]
+        if all(values):
+            filters[name] = (condition, values)
+    return filters
+
+
+def session_counts(db, filters):
+    """Session totals for a listing: all ``filters`` together, then each one alone.
+
+    Every count is answered from one of the study_sessions indexes without
+    touching the table. With no filters the total comes from
+    daily_activity_rollups instead of walking an index of every session.
+    """
+    def count(parts):
+        conditions = [condition for condition, _ in parts]
+        params = [param for _, values in parts for param in values]
+        return db.execute(
+            f"SELECT COUNT(*) FROM study_sessions ss WHERE {' AND '.join(conditions)}", params
+        ).fetchone()[0]
+
+    if not filters:
+        total = db.execute("SELECT COALESCE(SUM(session_count), 0) FROM daily_activity_rollups").fetchone()[0]
+        return {"total": total}
+
+    # date_from and date_to are counted together as one "date" range
+    groups = {}
+    for name, part in filters.items():
+        groups.setdefault("date" if name.startswith("date_") else name, []).append(part)
+
+    counts = {"total": count(list(filters.values()))}
+    for name, parts in groups.items():
+        counts[name] = count(parts)
+    return counts
+
+
+def all_groups(db):
+    return [dict(group) for group in db.execute("SELECT * FROM groups").fetchall()]
+
+
+def all_study_activities(db):
+    return [dict(activity) for activity in db.execute("SELECT * FROM study_activities").fetchall()]
+
+
+def word_count(db):
+    """Total number of words, counted on ``db`` itself.
+
+    Not taken from the count cache, so inside the dashboard's read transaction
+    it describes the same moment as the other sections.
+    """
+    return db.execute("SELECT COUNT(*) FROM words").fetchone()[0]
@@ -0,0 +1,113 @@
+import gzip
+import sqlite3
+
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+from ..config import COMPRESS_MIN_SIZE
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip is offered without it
+    brotli = None
+
+GZIP_LEVEL = 6
+# Quality 4 compresses about as well as gzip -9 at the speed of gzip -6
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/x-ndjson", "text/plain", "text/html", "text/csv"}
+
+
+def _default(o):
+    if isinstance(o, sqlite3.Row):
+        return dict(o)
+    return DefaultJSONProvider.default(o)
+
+
+class JSONProvider(DefaultJSONProvider):
+    """``jsonify`` that accepts ``sqlite3.Row`` objects and uses orjson when it is installed.
+
+    Views can return the rows of a query as they are instead of copying each
+    one into a dict first. The output matches Flask's default provider: sorted
+    keys, HTTP dates for datetimes and pretty-printing in debug mode, except
+    that non-ASCII text is written as UTF-8 rather than \\u escapes.
+    """
+
+    ensure_ascii = False
+
+    def _orjson_options(self, pretty=False):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode()
+        kwargs.setdefault("default", _default)
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        option = self._orjson_options(pretty) | orjson.OPT_APPEND_NEWLINE
+        return self._app.response_class(orjson.dumps(obj, default=_default, option=option), mimetype=self.mimetype)
+
+
+def negotiate_encoding(response):
+    """The Content-Encoding to send ``response`` with, or None to send it as is."""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or response.calculate_content_length() < current_app.config["COMPRESS_MIN_SIZE"]
+    ):
+        return None
+    # Whether the body is compressed depends on Accept-Encoding from here on
+    response.vary.add("Accept-Encoding")
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def apply_encoding(response, encoding, data=None):
+    """Replace the body of ``response`` with its ``encoding`` variant.
+
+    ``data`` is the already compressed body, if the caller has it. A strong
+    ETag gets the encoding appended, since the bytes on the wire differ.
+    """
+    response.set_data(data if data is not None else compress(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def _compress_response(response):
+    encoding = negotiate_encoding(response)
+    return apply_encoding(response, encoding) if encoding else response
+
+
+def init_app(app):
+    app.json = JSONProvider(app)
+    app.config.setdefault("COMPRESS_MIN_SIZE", COMPRESS_MIN_SIZE)
+    app.after_request(_compress_response)
@@ -0,0 +1,53 @@
+"""The SM-2 review scheduling shared by migration 009's trigger and the maintenance jobs.
+
+``UPSERT_REVIEW`` applies one answer to a word's row in word_reviews. It takes
+named parameters (``:question_id``, ``:is_correct``, ``:created_at``) so the
+same statement replays stored responses and, with the names swapped for NEW.*
+columns, runs in the trigger on session_responses.
+"""
+
+# Longest interval between two reviews
+MAX_INTERVAL_DAYS = 365
+
+# A correct answer only moves the schedule on once the word is due; answering it
+# again earlier (e.g. twice in one session) just counts as a review
+NOT_DUE = "date(:created_at) < due_date"
+
+# Interval after a correct answer on a due word, from the row's state before it
+NEXT_INTERVAL = f"""
+    CASE WHEN repetitions = 0 THEN 1
+         WHEN repetitions = 1 THEN 6
+         ELSE MIN({MAX_INTERVAL_DAYS}, MAX(1, CAST(ROUND(interval_days * ease) AS INTEGER)))
+    END
+"""
+
+UPSERT_REVIEW = f"""
+    INSERT INTO word_reviews
+        (word_id, ease, interval_days, repetitions, lapses, review_count, last_reviewed_at, due_date)
+    VALUES (
+        :question_id,
+        CASE WHEN :is_correct THEN 2.6 ELSE 1.96 END,
+        1,
+        CASE WHEN :is_correct THEN 1 ELSE 0 END,
+        CASE WHEN :is_correct THEN 0 ELSE 1 END,
+        1,
+        :created_at,
+        date(:created_at, '+1 day')
+    )
+    ON CONFLICT(word_id) DO UPDATE SET
+        ease = CASE WHEN NOT :is_correct THEN MAX(1.3, ease - 0.54)
+                    WHEN {NOT_DUE} THEN ease
+                    ELSE ease + 0.1 END,
+        interval_days = CASE WHEN NOT :is_correct THEN 1
+                             WHEN {NOT_DUE} THEN interval_days
+                             ELSE {NEXT_INTERVAL} END,
+        repetitions = CASE WHEN NOT :is_correct THEN 0
+                           WHEN {NOT_DUE} THEN repetitions
+                           ELSE repetitions + 1 END,
+        lapses = lapses + CASE WHEN :is_correct THEN 0 ELSE 1 END,
+        review_count = review_count + 1,
+        last_reviewed_at = :created_at,
+        due_date = CASE WHEN NOT :is_correct THEN date(:created_at, '+1 day')
+                        WHEN {NOT_DUE} THEN due_date
+                        ELSE date(:created_at, '+' || ({NEXT_INTERVAL}) || ' days') END
+"""
@@ -0,0 +1,35 @@
+import re
+
+# Keep in sync with the words_search_source view in migrations/006_words_fts.sql
+_TASHKEEL = dict.fromkeys([*range(0x064B, 0x0653), 0x0670, 0x0640])
+_LETTER_VARIANTS = {
+    0x0623: 0x0627,  # Alef with hamza above → alef
+    0x0625: 0x0627,  # Alef with hamza below → alef
+    0x0622: 0x0627,  # Alef with madda → alef
+    0x0671: 0x0627,  # Alef wasla → alef
+    0x0649: 0x064A,  # Alef maqsura → ya
+    0x0629: 0x0647,  # Ta marbuta → ha
+}
+_ARABIC_NORMALIZATION = {**_TASHKEEL, **_LETTER_VARIANTS}
+
+# Longest query accepted, in terms
+MAX_SEARCH_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def normalize_arabic(text):
+    """Strip diacritics and fold letter variants the same way the FTS index does."""
+    return text.translate(_ARABIC_NORMALIZATION)
+
+
+def build_match_query(text):
+    """Turn what a user typed into an FTS5 MATCH expression, or None if nothing is searchable.
+
+    Every term is quoted, so FTS5 operators in the input are treated as plain
+    text, and matched as a prefix, since the query is typed live.
+    """
+    terms = _TERM_RE.findall(normalize_arabic(text))[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
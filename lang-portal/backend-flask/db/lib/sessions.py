@@ -0,0 +1,122 @@
+from datetime import datetime, timezone
+
+# Active time is the sum of the gaps between consecutive responses, where the first
+# gap is measured from the session start. LAG() walks the responses once in
+# created_at order (served by the session_id index), so the cost is a single
+# statement no matter how many responses the session has.
+ACTIVE_TIME_QUERY = """
+    SELECT COALESCE(SUM(gap), 0)
+    FROM (
+        SELECT CAST(
+            (julianday(sr.created_at)
+             - julianday(COALESCE(LAG(sr.created_at) OVER (ORDER BY sr.created_at), ss.start_time))
+            ) * 86400 AS INTEGER
+        ) AS gap
+        FROM session_responses sr
+        JOIN study_sessions ss ON ss.id = sr.session_id
+        WHERE sr.session_id = ?
+    )
+"""
+
+
+def refresh_active_time(cursor, session_id):
+    """Recompute and store ``active_time_seconds`` for a session; returns the new value.
+
+    Call this whenever responses are added to a session so readers can use the
+    stored column instead of recomputing it.
+    """
+    active_time = cursor.execute(ACTIVE_TIME_QUERY, (session_id,)).fetchone()[0]
+    cursor.execute(
+        "UPDATE study_sessions SET active_time_seconds = ? WHERE id = ?",
+        (active_time, session_id),
+    )
+    return active_time
+
+
+# Only a repeated client_response_id is skipped; any other constraint error is raised
+INSERT_RESPONSE_SQL = """
+    INSERT INTO session_responses
+    (session_id, question_id, user_response, is_correct, created_at, client_response_id)
+    VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)
+    ON CONFLICT(session_id, client_response_id) WHERE client_response_id IS NOT NULL DO NOTHING
+"""
+
+
+def normalize_timestamp(value):
+    """Return an ISO 8601 timestamp as ``YYYY-MM-DD HH:MM:SS`` in UTC, like CURRENT_TIMESTAMP.
+
+    Raises ValueError for anything that is not a timestamp. Times without an
+    offset are taken to be UTC already.
+    """
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def validate_response(response):
+    """Return an error message for a malformed response payload, or None if it is valid."""
+    if not isinstance(response, dict):
+        return "response must be an object"
+    question_id = response.get("question_id")
+    if not isinstance(question_id, int) or isinstance(question_id, bool):
+        return "question_id must be an integer"
+    if not isinstance(response.get("user_response"), str):
+        return "user_response must be a string"
+    if response.get("is_correct") not in (True, False, 0, 1):
+        return "is_correct must be a boolean"
+    timestamp = response.get("timestamp")
+    if timestamp is not None:
+        if not isinstance(timestamp, str):
+            return "timestamp must be a string"
+        try:
+            normalize_timestamp(timestamp)
+        except ValueError:
+            return "timestamp must be an ISO 8601 date and time"
+    client_id = response.get("client_response_id")
+    if client_id is not None and not isinstance(client_id, str):
+        return "client_response_id must be a string"
+    return None
+
+
+def insert_responses(cursor, session_id, responses):
+    """Insert already-validated responses for one session with a single executemany.
+
+    Responses whose ``client_response_id`` is already stored for the session are
+    skipped, which makes retries idempotent. Timestamps are stored normalized.
+    """
+    cursor.executemany(
+        INSERT_RESPONSE_SQL,
+        [
+            (
+                session_id,
+                response["question_id"],
+                response["user_response"],
+                1 if response["is_correct"] else 0,
+                normalize_timestamp(response["timestamp"]) if response.get("timestamp") else None,
+                response.get("client_response_id"),
+            )
+            for response in responses
+        ],
+    )
+
+
+def existing_client_ids(cursor, session_id, client_ids, chunk_size=500):
+    """Return which of ``client_ids`` are already recorded for the session."""
+    client_ids = list(client_ids)
+    found = set()
+    # Stay well below SQLite's bound-parameter limit
+    for i in range(0, len(client_ids), chunk_size):
+        chunk = client_ids[i:i + chunk_size]
+        placeholders = ", ".join("?" * len(chunk))
+        rows = cursor.execute(
+            f"""
+            SELECT client_response_id FROM session_responses
+            WHERE session_id = ? AND client_response_id IN ({placeholders})
+            """,
+            [session_id] + chunk,
+        ).fetchall()
+        found.update(row[0] for row in rows)
+    return found
@@ -0,0 +1,151 @@
+"""Read-only snapshot of the database for analytics reads.
+
+With ``ANALYTICS_SNAPSHOT`` on, the stats and export endpoints read from
+``<database>.snapshot`` instead of the live file. The snapshot is written with
+``VACUUM INTO``, which only needs a read transaction on the live database, so
+session writes carry on while it is taken. The new copy replaces the old one
+with an atomic rename. Readers open it as immutable, so they take no locks at
+all. A request still reading the old copy keeps its open file until it is done.
+
+A snapshot older than ``SNAPSHOT_MAX_AGE_SECONDS`` is refreshed on a background
+thread the next time it is read. Until the refresh finishes, the old copy is
+served. Before the first copy exists, reads fall back to the live database.
+Several workers share the same file, and a lock file keeps them from building
+it at the same time.
+"""
+import fcntl
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import quote
+
+from flask import current_app, g
+
+from ..config import ANALYTICS_SNAPSHOT, SNAPSHOT_MAX_AGE_SECONDS
+from .db import get_db
+from .metrics import InstrumentedConnection
+
+
+class Snapshot:
+    def __init__(self, database):
+        self.database = database
+        self.path = f"{database}.snapshot"
+        self._lock = threading.Lock()
+        self._thread = None
+        self._local = threading.local()
+
+    def taken_at(self):
+        """When the current snapshot was taken (epoch seconds), or None if there is none."""
+        try:
+            return os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return None
+
+    def refresh(self):
+        """Copy the live database to the snapshot; returns False if another process is already at it."""
+        with open(f"{self.path}.lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+
+            tmp_path = f"{self.path}.tmp-{os.getpid()}"
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            started = time.time()
+            conn = sqlite3.connect(self.database, isolation_level=None)
+            try:
+                conn.execute("PRAGMA busy_timeout = 5000")
+                conn.execute("VACUUM INTO ?", (tmp_path,))
+            finally:
+                conn.close()
+            # The copy shows the database as it was when the read began
+            os.utime(tmp_path, (started, started))
+            os.replace(tmp_path, self.path)
+            print(f"Snapshot of {self.database} refreshed in {time.time() - started:.2f}s")
+            return True
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Snapshot refresh for {self.database} failed: {e!r}")
+
+    def refresh_in_background(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._refresh_quietly, name=f"snapshot:{self.database}", daemon=True)
+                self._thread.start()
+
+    def connect(self, max_age):
+        """This thread's read-only connection to the snapshot; starts a refresh when it is stale.
+
+        The connection is reused until a newer snapshot replaces the file, like
+        the pooled connections to the live database. Returns
+        ``(connection, taken_at)``, or ``(None, None)`` while the first
+        snapshot is still being built.
+        """
+        taken_at = self.taken_at()
+        if taken_at is None or time.time() - taken_at > max_age:
+            self.refresh_in_background()
+        if taken_at is None:
+            return None, None
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.taken_at == taken_at:
+            return conn, taken_at
+        if conn is not None:
+            conn.close()
+
+        conn = sqlite3.connect(
+            f"file:{quote(self.path)}?mode=ro&immutable=1",
+            uri=True,
+            check_same_thread=False,
+            factory=InstrumentedConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        self._local.conn, self._local.taken_at = conn, taken_at
+        return conn, taken_at
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot(database):
+    with _snapshots_lock:
+        snapshot = _snapshots.get(database)
+        if snapshot is None:
+            snapshot = _snapshots[database] = Snapshot(database)
+        return snapshot
+
+
+def get_analytics_db():
+    """Connection for long read-only queries.
+
+    This is the snapshot when ``ANALYTICS_SNAPSHOT`` is on and one exists;
+    otherwise it is the request's normal connection from ``get_db``.
+    """
+    if not current_app.config["ANALYTICS_SNAPSHOT"]:
+        return get_db()
+    snapshot = get_snapshot(current_app.config["DATABASE"])
+    conn, taken_at = snapshot.connect(current_app.config["SNAPSHOT_MAX_AGE_SECONDS"])
+    if conn is None:
+        return get_db()
+    g.snapshot_taken_at = taken_at
+    return conn
+
+
+def _add_snapshot_age(response):
+    # Tells clients how old the data they are looking at is
+    taken_at = g.get("snapshot_taken_at")
+    if taken_at is not None:
+        response.headers["X-Snapshot-Age"] = str(int(time.time() - taken_at))
+    return response
+
+
+def init_app(app):
+    app.config.setdefault("ANALYTICS_SNAPSHOT", ANALYTICS_SNAPSHOT)
+    app.config.setdefault("SNAPSHOT_MAX_AGE_SECONDS", SNAPSHOT_MAX_AGE_SECONDS)
+    app.after_request(_add_snapshot_age)
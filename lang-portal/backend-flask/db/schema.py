@@ -1,18 +1,227 @@
+import importlib.util
 import sqlite3
 import os
-from .config import DATABASE
+import tempfile
+import time
+from .config import BASE_DIR, DATABASE
 
+MIGRATIONS_DIR = os.path.join(BASE_DIR, "sql", "migrations")
 
-def init_db():
+# Snapshot of the fully migrated schema, regenerated with `python3 tasks.py dump-schema`
+SCHEMA_SNAPSHOT = os.path.join(BASE_DIR, "schema.sql")
+
+SCHEMA_VERSION_TABLE = """CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    duration_ms INTEGER  -- NULL for migrations recorded from user_version
+)"""
+
+# Rows updated per write transaction by backfill_in_batches
+BACKFILL_BATCH_SIZE = 1000
+
+
+def init_db(database=DATABASE):
     """Creates database tables from SQL schema."""
     # Ensure 'db' directory exists
-    db_dir = os.path.dirname(DATABASE)
+    db_dir = os.path.dirname(os.path.abspath(database))
     if not os.path.exists(db_dir):
         os.makedirs(db_dir)
 
-    conn = sqlite3.connect(DATABASE)
-    with open("db/sql/setup.sql", "r") as f:
+    conn = sqlite3.connect(database)
+    with open(os.path.join(BASE_DIR, "sql", "setup.sql"), "r") as f:
         conn.executescript(f.read())
     conn.commit()
     conn.close()
-    print(f"Database initialized successfully at {DATABASE}.")
+    print(f"Database initialized successfully at {database}.")
+    migrate_db(database)
+
+
+def _statements(script):
+    """Splits a SQL script into complete statements, keeping trigger bodies intact."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Return (version, filename) for every ``NNN_description.sql`` or ``.py`` migration, in order."""
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith((".sql", ".py")) or not filename[:1].isdigit():
+            continue
+        version = int(filename.split("_", 1)[0])
+        if version in migrations:
+            raise RuntimeError(f"Migrations {migrations[version]} and {filename} share version {version}")
+        migrations[version] = filename
+    return sorted(migrations.items())
+
+
+def _load_python_migration(path):
+    spec = importlib.util.spec_from_file_location(f"migration_{os.path.basename(path)[:-3]}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _applied_versions(conn):
+    return {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+
+
+def _ensure_version_table(conn, migrations):
+    """Create ``schema_version`` and, on databases migrated before it existed, mark
+    every migration up to ``PRAGMA user_version`` as applied."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(SCHEMA_VERSION_TABLE)
+        if conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == 0:
+            user_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                [(version, filename) for version, filename in migrations if version <= user_version],
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _record(conn, version, filename, started):
+    conn.execute(
+        "INSERT OR IGNORE INTO schema_version (version, name, duration_ms) VALUES (?, ?, ?)",
+        (version, filename, int((time.perf_counter() - started) * 1000)),
+    )
+    # Kept in step for tools that only look at user_version
+    conn.execute(f"PRAGMA user_version = {max(_applied_versions(conn))}")
+
+
+def migrate_db(database=DATABASE, directory=MIGRATIONS_DIR):
+    """Applies pending migrations from db/sql/migrations in version order.
+
+    Migrations are named ``NNN_description.sql`` or ``NNN_description.py`` and
+    every applied version is recorded in the ``schema_version`` table, so each
+    one runs exactly once.
+
+    A ``.sql`` script, or a ``.py`` module's ``upgrade(conn)``, runs inside one
+    write transaction that re-checks ``schema_version`` first, so several worker
+    processes can start (and migrate) at the same time. A ``.py`` module that
+    sets ``TRANSACTIONAL = False`` manages its own transactions instead, e.g. to
+    backfill a large table with :func:`backfill_in_batches` without holding the
+    write lock throughout. Such a migration must be safe to run again, since an
+    interrupted or concurrent run starts it from the beginning.
+    """
+    migrations = discover_migrations(directory)
+
+    conn = sqlite3.connect(database, isolation_level=None, timeout=30)
+    try:
+        _ensure_version_table(conn, migrations)
+        for version, filename in migrations:
+            if version in _applied_versions(conn):
+                continue
+            path = os.path.join(directory, filename)
+            module = _load_python_migration(path) if filename.endswith(".py") else None
+            started = time.perf_counter()
+
+            if module is not None and not getattr(module, "TRANSACTIONAL", True):
+                module.upgrade(conn)
+                conn.execute("BEGIN IMMEDIATE")
+                _record(conn, version, filename, started)
+                conn.execute("COMMIT")
+                print(f"Applied migration {filename}")
+                continue
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have applied it while we waited for the lock
+                if version in _applied_versions(conn):
+                    conn.execute("ROLLBACK")
+                    continue
+                if module is not None:
+                    module.upgrade(conn)
+                else:
+                    with open(path, "r") as f:
+                        for statement in _statements(f.read()):
+                            conn.execute(statement)
+                _record(conn, version, filename, started)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            print(f"Applied migration {filename}")
+    finally:
+        conn.close()
+
+
+def backfill_in_batches(conn, table, apply, where="1=1", batch_size=BACKFILL_BATCH_SIZE, pause=0.0):
+    """Call ``apply(conn, rowids)`` for the rows of ``table`` matching ``where``, a batch at a time.
+
+    Each batch runs in its own short write transaction, so the app keeps
+    writing between batches instead of waiting for the whole backfill. Rows are
+    walked in rowid order and ``pause`` seconds are slept between batches to
+    leave room for other writers. Returns the number of rows passed to ``apply``.
+    ``conn`` must be in autocommit mode (``isolation_level=None``), as it is in
+    migrations.
+    """
+    last_rowid = 0
+    total = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rowids = [
+                row[0]
+                for row in conn.execute(
+                    f"SELECT rowid FROM {table} WHERE rowid > ? AND ({where}) ORDER BY rowid LIMIT ?",
+                    (last_rowid, batch_size),
+                )
+            ]
+            if rowids:
+                apply(conn, rowids)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if not rowids:
+            return total
+        last_rowid = rowids[-1]
+        total += len(rowids)
+        if pause:
+            time.sleep(pause)
+
+
+def dump_schema(database):
+    """Return the schema of a database as a SQL script: tables, then indexes, views and triggers.
+
+    SQLite's own tables and the shadow tables behind FTS5 virtual tables are left out.
+    """
+    conn = sqlite3.connect(database)
+    try:
+        objects = conn.execute(
+            """
+            SELECT type, name, sql FROM sqlite_master
+            WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+            ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 WHEN 'view' THEN 2 ELSE 3 END, name
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+    virtual = [name for type_, name, sql in objects if sql.upper().startswith("CREATE VIRTUAL TABLE")]
+    statements = [
+        sql for type_, name, sql in objects
+        if not (type_ == "table" and any(name.startswith(f"{v}_") for v in virtual))
+    ]
+    header = "-- Generated by `python3 tasks.py dump-schema` from setup.sql plus every migration. Do not edit.\n"
+    return header + "".join(f"\n{sql};\n" for sql in statements)
+
+
+def write_schema_snapshot(path=SCHEMA_SNAPSHOT):
+    """Build a throwaway database from scratch and write its schema to ``path``."""
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, "schema.db")
+        init_db(database)
+        with open(path, "w") as f:
+            f.write(dump_schema(database))
+    print(f"Schema written to {path}")
@@ -1,29 +1,118 @@
--- Create study_activities table
-CREATE TABLE IF NOT EXISTS study_activities (
+-- Generated by `python3 tasks.py dump-schema` from setup.sql plus every migration. Do not edit.
+
+CREATE TABLE daily_activity_rollups (
+    study_date TEXT NOT NULL,
+    activity_type TEXT NOT NULL,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    completed_sessions INTEGER NOT NULL DEFAULT 0,
+    minutes_studied INTEGER NOT NULL DEFAULT 0,
+    score_sum REAL NOT NULL DEFAULT 0,  -- Sum of per-session score percentages
+    PRIMARY KEY (study_date, activity_type)
+) WITHOUT ROWID;
+
+CREATE TABLE data_version (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE groups (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT UNIQUE NOT NULL
+, word_count INTEGER NOT NULL DEFAULT 0);
+
+CREATE TABLE jobs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    params JSON,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    progress INTEGER NOT NULL DEFAULT 0,  -- Rows or steps done so far
+    total INTEGER,  -- Rows or steps expected, when known
+    message TEXT,  -- Current step
+    result JSON,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME,
+    finished_at DATETIME,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP  -- Heartbeat while running
+);
+
+CREATE TABLE schema_version (
+    version INTEGER PRIMARY KEY,
     name TEXT NOT NULL,
-    type TEXT NOT NULL CHECK (type IN ('quiz', 'practice', 'game')),
-    difficulty INTEGER CHECK (difficulty BETWEEN 1 AND 5),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    duration_ms INTEGER  -- NULL for migrations recorded from user_version
 );
 
--- Insert initial study activities
-INSERT INTO study_activities (id, name, type, difficulty) VALUES
-    (1, 'Typing Tutor', 'practice', 2),
-    (2, 'Flashcards', 'practice', 1),
-    (3, 'Memory Game', 'game', 2),
-    (4, 'Arabic Vocabulary Quiz', 'quiz', 3),
-    (5, 'Word Matching', 'game', 1);
+CREATE TABLE seed_files (
+    filename TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    rows_read INTEGER NOT NULL,
+    rows_inserted INTEGER NOT NULL,
+    seeded_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
 
--- Create groups table if it doesn't exist
-CREATE TABLE IF NOT EXISTS groups (
+CREATE TABLE session_responses (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL,
-    description TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    session_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    user_response TEXT NOT NULL,
+    is_correct BOOLEAN NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, client_response_id TEXT,
+    FOREIGN KEY (session_id) REFERENCES study_sessions(id) ON DELETE CASCADE
+);
+
+CREATE TABLE session_scores (
+    session_id INTEGER PRIMARY KEY,
+    total_questions INTEGER NOT NULL DEFAULT 0,
+    correct_answers INTEGER NOT NULL DEFAULT 0,
+    first_response_at TIMESTAMP,
+    last_response_at TIMESTAMP,
+    FOREIGN KEY (session_id) REFERENCES study_sessions(id) ON DELETE CASCADE
+);
+
+CREATE TABLE study_activities (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL UNIQUE,  -- e.g., "Flashcards", "Quiz", "Typing Tutor", "Game"
+  description TEXT,  -- Optional: A brief description of the activity
+  type TEXT NOT NULL CHECK (type IN ('flashcards', 'quiz', 'practice', 'game')),  -- The type of activity
+  difficulty TEXT NOT NULL CHECK (difficulty IN ('easy', 'medium', 'hard')),  -- The difficulty level of the activity
+  url TEXT NOT NULL,  -- The full url of the study activity
+  preview_url TEXT    -- The url to the preview image for the activity
+);
+
+CREATE TABLE study_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    group_id INTEGER NOT NULL,
+    study_activity_id INTEGER NOT NULL,
+    start_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+    end_time DATETIME,
+    notes TEXT,  -- Added from migration script
+    active_time_seconds INTEGER DEFAULT 0,  -- Maintained as responses are recorded
+    FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE,
+    FOREIGN KEY (study_activity_id) REFERENCES study_activities(id) ON DELETE CASCADE
+);
+
+CREATE TABLE word_reviews (
+    word_id INTEGER PRIMARY KEY,
+    ease REAL NOT NULL DEFAULT 2.5,
+    interval_days INTEGER NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0,  -- Correct answers in a row
+    lapses INTEGER NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    last_reviewed_at DATETIME,
+    due_date TEXT NOT NULL,  -- YYYY-MM-DD
+    FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE
+);
+
+CREATE TABLE word_stats (
+    word_id INTEGER PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    accuracy REAL NOT NULL,  -- Rolling, between 0 and 1
+    last_seen DATETIME,
+    FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE
 );
 
--- Create words table if it doesn't exist
 CREATE TABLE words (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   arabic TEXT NOT NULL,
@@ -31,28 +120,528 @@ CREATE TABLE words (
   english TEXT NOT NULL,
   example JSON, -- Explanation of the word in English 
   group_id INTEGER NOT NULL,
-  pronunciation_audio TEXT,  -- Optional: link to an audio file  
+  pronunciation_audio TEXT,  -- Optional: link to an audio file
   FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE
 );
 
--- Create study_sessions table if it doesn't exist
-CREATE TABLE IF NOT EXISTS study_sessions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    group_id INTEGER NOT NULL,
-    study_activity_id INTEGER NOT NULL,
-    start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    end_time TIMESTAMP,
-    FOREIGN KEY (group_id) REFERENCES groups (id),
-    FOREIGN KEY (study_activity_id) REFERENCES study_activities (id)
+CREATE VIRTUAL TABLE words_fts USING fts5(
+    arabic, romanized, english, example,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
 );
 
--- Create session_responses table if it doesn't exist
-CREATE TABLE IF NOT EXISTS session_responses (
+CREATE TABLE words_groups (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    session_id INTEGER NOT NULL,
-    question_id TEXT NOT NULL,
-    user_response TEXT NOT NULL,
-    is_correct INTEGER CHECK (is_correct IN (0, 1)),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (session_id) REFERENCES study_sessions (id)
+    word_id INTEGER NOT NULL,
+    group_id INTEGER NOT NULL,
+    FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE,
+    FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE
 );
+
+CREATE INDEX idx_jobs_status ON jobs(status, id);
+
+CREATE UNIQUE INDEX idx_session_responses_client_id
+    ON session_responses(session_id, client_response_id)
+    WHERE client_response_id IS NOT NULL;
+
+CREATE INDEX idx_session_responses_question_created
+    ON session_responses(question_id, created_at, id);
+
+CREATE INDEX idx_session_responses_session_created
+    ON session_responses(session_id, created_at);
+
+CREATE INDEX idx_session_responses_session_id ON session_responses(session_id);
+
+CREATE INDEX idx_study_sessions_activity_start
+    ON study_sessions(study_activity_id, start_time);
+
+CREATE INDEX idx_study_sessions_group_start
+    ON study_sessions(group_id, start_time);
+
+CREATE INDEX idx_study_sessions_start_time
+    ON study_sessions(start_time, id);
+
+CREATE INDEX idx_word_reviews_due ON word_reviews(due_date, word_id);
+
+CREATE INDEX idx_word_stats_accuracy ON word_stats(accuracy, word_id);
+
+CREATE INDEX idx_words_arabic_group
+    ON words(arabic, group_id);
+
+CREATE UNIQUE INDEX idx_words_groups_group_word ON words_groups(group_id, word_id);
+
+CREATE INDEX idx_words_groups_word ON words_groups(word_id);
+
+CREATE VIEW words_search_source AS
+SELECT id,
+       REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(arabic
+           , char(0x064B), '')
+           , char(0x064C), '')
+           , char(0x064D), '')
+           , char(0x064E), '')
+           , char(0x064F), '')
+           , char(0x0650), '')
+           , char(0x0651), '')
+           , char(0x0652), '')
+           , char(0x0670), '')
+           , char(0x0640), '')
+           , char(0x0623), char(0x0627))
+           , char(0x0625), char(0x0627))
+           , char(0x0622), char(0x0627))
+           , char(0x0671), char(0x0627))
+           , char(0x0649), char(0x064A))
+           , char(0x0629), char(0x0647)) AS arabic,
+       romanized,
+       english,
+       REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(CASE WHEN json_valid(example)
+             THEN (SELECT group_concat(value, ' ') FROM json_each(example))
+             ELSE example END
+           , char(0x064B), '')
+           , char(0x064C), '')
+           , char(0x064D), '')
+           , char(0x064E), '')
+           , char(0x064F), '')
+           , char(0x0650), '')
+           , char(0x0651), '')
+           , char(0x0652), '')
+           , char(0x0670), '')
+           , char(0x0640), '')
+           , char(0x0623), char(0x0627))
+           , char(0x0625), char(0x0627))
+           , char(0x0622), char(0x0627))
+           , char(0x0671), char(0x0627))
+           , char(0x0649), char(0x064A))
+           , char(0x0629), char(0x0647)) AS example
+FROM words;
+
+CREATE TRIGGER trg_data_version_groups_delete
+AFTER DELETE ON groups
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_data_version_groups_insert
+AFTER INSERT ON groups
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_data_version_groups_update
+AFTER UPDATE ON groups
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_data_version_study_activities_delete
+AFTER DELETE ON study_activities
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_data_version_study_activities_insert
+AFTER INSERT ON study_activities
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_data_version_study_activities_update
+AFTER UPDATE ON study_activities
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_data_version_words_delete
+AFTER DELETE ON words
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_data_version_words_insert
+AFTER INSERT ON words
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_data_version_words_update
+AFTER UPDATE ON words
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER trg_groups_word_count_delete
+    AFTER DELETE ON words_groups
+    BEGIN
+        UPDATE groups SET word_count = word_count - 1 WHERE id = OLD.group_id;
+    END;
+
+CREATE TRIGGER trg_groups_word_count_insert
+    AFTER INSERT ON words_groups
+    BEGIN
+        UPDATE groups SET word_count = word_count + 1 WHERE id = NEW.group_id;
+    END;
+
+CREATE TRIGGER trg_groups_word_count_update
+    AFTER UPDATE OF group_id ON words_groups
+    WHEN OLD.group_id <> NEW.group_id
+    BEGIN
+        UPDATE groups SET word_count = word_count - 1 WHERE id = OLD.group_id;
+        UPDATE groups SET word_count = word_count + 1 WHERE id = NEW.group_id;
+    END;
+
+CREATE TRIGGER trg_rollups_score_delete
+AFTER DELETE ON session_scores
+BEGIN
+    UPDATE daily_activity_rollups SET
+        score_sum = score_sum
+            - CASE WHEN OLD.total_questions > 0 THEN OLD.correct_answers * 100.0 / OLD.total_questions ELSE 0 END
+    WHERE (study_date, activity_type) = (
+        SELECT date(ss.start_time), COALESCE(sa.type, 'unknown')
+        FROM study_sessions ss
+        LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+        WHERE ss.id = OLD.session_id
+    );
+END;
+
+CREATE TRIGGER trg_rollups_score_insert
+AFTER INSERT ON session_scores
+BEGIN
+    UPDATE daily_activity_rollups SET
+        score_sum = score_sum
+            + CASE WHEN NEW.total_questions > 0 THEN NEW.correct_answers * 100.0 / NEW.total_questions ELSE 0 END
+    WHERE (study_date, activity_type) = (
+        SELECT date(ss.start_time), COALESCE(sa.type, 'unknown')
+        FROM study_sessions ss
+        LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+        WHERE ss.id = NEW.session_id
+    );
+END;
+
+CREATE TRIGGER trg_rollups_score_update
+AFTER UPDATE OF total_questions, correct_answers ON session_scores
+BEGIN
+    UPDATE daily_activity_rollups SET
+        score_sum = score_sum
+            + CASE WHEN NEW.total_questions > 0 THEN NEW.correct_answers * 100.0 / NEW.total_questions ELSE 0 END
+            - CASE WHEN OLD.total_questions > 0 THEN OLD.correct_answers * 100.0 / OLD.total_questions ELSE 0 END
+    WHERE (study_date, activity_type) = (
+        SELECT date(ss.start_time), COALESCE(sa.type, 'unknown')
+        FROM study_sessions ss
+        LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+        WHERE ss.id = NEW.session_id
+    );
+END;
+
+CREATE TRIGGER trg_rollups_session_insert
+AFTER INSERT ON study_sessions
+BEGIN
+    INSERT INTO daily_activity_rollups
+        (study_date, activity_type, session_count, completed_sessions, minutes_studied)
+    VALUES (
+        date(NEW.start_time),
+        COALESCE((SELECT type FROM study_activities WHERE id = NEW.study_activity_id), 'unknown'),
+        1,
+        CASE WHEN NEW.end_time IS NOT NULL THEN 1 ELSE 0 END,
+        CASE WHEN NEW.end_time IS NOT NULL
+            THEN CAST((julianday(NEW.end_time) - julianday(NEW.start_time)) * 24 * 60 AS INTEGER)
+            ELSE 0 END
+    )
+    ON CONFLICT(study_date, activity_type) DO UPDATE SET
+        session_count = session_count + 1,
+        completed_sessions = completed_sessions + excluded.completed_sessions,
+        minutes_studied = minutes_studied + excluded.minutes_studied;
+END;
+
+CREATE TRIGGER trg_rollups_session_update
+AFTER UPDATE OF start_time, end_time, study_activity_id ON study_sessions
+BEGIN
+    UPDATE daily_activity_rollups SET
+        session_count = session_count - 1,
+        completed_sessions = completed_sessions - (CASE WHEN OLD.end_time IS NOT NULL THEN 1 ELSE 0 END),
+        minutes_studied = minutes_studied - (CASE WHEN OLD.end_time IS NOT NULL
+            THEN CAST((julianday(OLD.end_time) - julianday(OLD.start_time)) * 24 * 60 AS INTEGER)
+            ELSE 0 END),
+        score_sum = score_sum - COALESCE((
+            SELECT CASE WHEN total_questions > 0 THEN correct_answers * 100.0 / total_questions ELSE 0 END
+            FROM session_scores WHERE session_id = OLD.id), 0)
+    WHERE study_date = date(OLD.start_time)
+      AND activity_type = COALESCE((SELECT type FROM study_activities WHERE id = OLD.study_activity_id), 'unknown');
+
+    INSERT INTO daily_activity_rollups
+        (study_date, activity_type, session_count, completed_sessions, minutes_studied, score_sum)
+    VALUES (
+        date(NEW.start_time),
+        COALESCE((SELECT type FROM study_activities WHERE id = NEW.study_activity_id), 'unknown'),
+        1,
+        CASE WHEN NEW.end_time IS NOT NULL THEN 1 ELSE 0 END,
+        CASE WHEN NEW.end_time IS NOT NULL
+            THEN CAST((julianday(NEW.end_time) - julianday(NEW.start_time)) * 24 * 60 AS INTEGER)
+            ELSE 0 END,
+        COALESCE((
+            SELECT CASE WHEN total_questions > 0 THEN correct_answers * 100.0 / total_questions ELSE 0 END
+            FROM session_scores WHERE session_id = NEW.id), 0)
+    )
+    ON CONFLICT(study_date, activity_type) DO UPDATE SET
+        session_count = session_count + 1,
+        completed_sessions = completed_sessions + excluded.completed_sessions,
+        minutes_studied = minutes_studied + excluded.minutes_studied,
+        score_sum = score_sum + excluded.score_sum;
+END;
+
+CREATE TRIGGER trg_session_scores_response_delete
+AFTER DELETE ON session_responses
+BEGIN
+    UPDATE session_scores SET
+        total_questions = total_questions - 1,
+        correct_answers = correct_answers - (CASE WHEN OLD.is_correct = 1 THEN 1 ELSE 0 END),
+        first_response_at = (SELECT MIN(created_at) FROM session_responses WHERE session_id = OLD.session_id),
+        last_response_at = (SELECT MAX(created_at) FROM session_responses WHERE session_id = OLD.session_id)
+    WHERE session_id = OLD.session_id;
+
+    DELETE FROM session_scores WHERE session_id = OLD.session_id AND total_questions <= 0;
+END;
+
+CREATE TRIGGER trg_session_scores_response_insert
+AFTER INSERT ON session_responses
+BEGIN
+    INSERT INTO session_scores
+        (session_id, total_questions, correct_answers, first_response_at, last_response_at)
+    VALUES
+        (NEW.session_id, 1, CASE WHEN NEW.is_correct = 1 THEN 1 ELSE 0 END, NEW.created_at, NEW.created_at)
+    ON CONFLICT(session_id) DO UPDATE SET
+        total_questions = total_questions + 1,
+        correct_answers = correct_answers + excluded.correct_answers,
+        first_response_at = MIN(COALESCE(first_response_at, excluded.first_response_at), excluded.first_response_at),
+        last_response_at = MAX(COALESCE(last_response_at, excluded.last_response_at), excluded.last_response_at);
+END;
+
+CREATE TRIGGER trg_session_scores_response_update
+AFTER UPDATE OF session_id, is_correct, created_at ON session_responses
+BEGIN
+    -- Take the old version of the row out of its session's summary...
+    UPDATE session_scores SET
+        total_questions = total_questions - 1,
+        correct_answers = correct_answers - (CASE WHEN OLD.is_correct = 1 THEN 1 ELSE 0 END)
+    WHERE session_id = OLD.session_id;
+
+    -- ...and add the new version back in
+    INSERT INTO session_scores (session_id, total_questions, correct_answers)
+    VALUES (NEW.session_id, 1, CASE WHEN NEW.is_correct = 1 THEN 1 ELSE 0 END)
+    ON CONFLICT(session_id) DO UPDATE SET
+        total_questions = total_questions + 1,
+        correct_answers = correct_answers + excluded.correct_answers;
+
+    UPDATE session_scores SET
+        first_response_at = (SELECT MIN(created_at) FROM session_responses WHERE session_id = session_scores.session_id),
+        last_response_at = (SELECT MAX(created_at) FROM session_responses WHERE session_id = session_scores.session_id)
+    WHERE session_id IN (OLD.session_id, NEW.session_id);
+
+    DELETE FROM session_scores WHERE session_id = OLD.session_id AND total_questions <= 0;
+END;
+
+CREATE TRIGGER trg_study_sessions_delete
+AFTER DELETE ON study_sessions
+BEGIN
+    UPDATE daily_activity_rollups SET
+        session_count = session_count - 1,
+        completed_sessions = completed_sessions - (CASE WHEN OLD.end_time IS NOT NULL THEN 1 ELSE 0 END),
+        minutes_studied = minutes_studied - (CASE WHEN OLD.end_time IS NOT NULL
+            THEN CAST((julianday(OLD.end_time) - julianday(OLD.start_time)) * 24 * 60 AS INTEGER)
+            ELSE 0 END),
+        score_sum = score_sum - COALESCE((
+            SELECT CASE WHEN total_questions > 0 THEN correct_answers * 100.0 / total_questions ELSE 0 END
+            FROM session_scores WHERE session_id = OLD.id), 0)
+    WHERE study_date = date(OLD.start_time)
+      AND activity_type = COALESCE((SELECT type FROM study_activities WHERE id = OLD.study_activity_id), 'unknown');
+
+    DELETE FROM session_scores WHERE session_id = OLD.id;
+END;
+
+CREATE TRIGGER trg_word_reviews_response_insert
+AFTER INSERT ON session_responses
+WHEN EXISTS (SELECT 1 FROM words WHERE id = NEW.question_id)
+BEGIN
+    
+    INSERT INTO word_reviews
+        (word_id, ease, interval_days, repetitions, lapses, review_count, last_reviewed_at, due_date)
+    VALUES (
+        NEW.question_id,
+        CASE WHEN NEW.is_correct THEN 2.6 ELSE 1.96 END,
+        1,
+        CASE WHEN NEW.is_correct THEN 1 ELSE 0 END,
+        CASE WHEN NEW.is_correct THEN 0 ELSE 1 END,
+        1,
+        NEW.created_at,
+        date(NEW.created_at, '+1 day')
+    )
+    ON CONFLICT(word_id) DO UPDATE SET
+        ease = CASE WHEN NOT NEW.is_correct THEN MAX(1.3, ease - 0.54)
+                    WHEN date(NEW.created_at) < due_date THEN ease
+                    ELSE ease + 0.1 END,
+        interval_days = CASE WHEN NOT NEW.is_correct THEN 1
+                             WHEN date(NEW.created_at) < due_date THEN interval_days
+                             ELSE 
+    CASE WHEN repetitions = 0 THEN 1
+         WHEN repetitions = 1 THEN 6
+         ELSE MIN(365, MAX(1, CAST(ROUND(interval_days * ease) AS INTEGER)))
+    END
+ END,
+        repetitions = CASE WHEN NOT NEW.is_correct THEN 0
+                           WHEN date(NEW.created_at) < due_date THEN repetitions
+                           ELSE repetitions + 1 END,
+        lapses = lapses + CASE WHEN NEW.is_correct THEN 0 ELSE 1 END,
+        review_count = review_count + 1,
+        last_reviewed_at = NEW.created_at,
+        due_date = CASE WHEN NOT NEW.is_correct THEN date(NEW.created_at, '+1 day')
+                        WHEN date(NEW.created_at) < due_date THEN due_date
+                        ELSE date(NEW.created_at, '+' || (
+    CASE WHEN repetitions = 0 THEN 1
+         WHEN repetitions = 1 THEN 6
+         ELSE MIN(365, MAX(1, CAST(ROUND(interval_days * ease) AS INTEGER)))
+    END
+) || ' days') END
+;
+END;
+
+CREATE TRIGGER trg_word_stats_response_delete
+AFTER DELETE ON session_responses
+BEGIN
+    UPDATE word_stats SET
+        attempts = attempts - 1,
+        correct = correct - (CASE WHEN OLD.is_correct = 1 THEN 1 ELSE 0 END)
+    WHERE word_id = OLD.question_id;
+
+    DELETE FROM word_stats WHERE word_id = OLD.question_id AND attempts <= 0;
+END;
+
+CREATE TRIGGER trg_word_stats_response_insert
+AFTER INSERT ON session_responses
+WHEN EXISTS (SELECT 1 FROM words WHERE id = NEW.question_id)
+BEGIN
+    
+    INSERT INTO word_stats (word_id, attempts, correct, accuracy, last_seen)
+    VALUES (
+        NEW.question_id,
+        1,
+        CASE WHEN NEW.is_correct THEN 1 ELSE 0 END,
+        CASE WHEN NEW.is_correct THEN 1.0 ELSE 0.0 END,
+        NEW.created_at
+    )
+    ON CONFLICT(word_id) DO UPDATE SET
+        attempts = attempts + 1,
+        correct = correct + excluded.correct,
+        accuracy = accuracy + 0.3 * (excluded.accuracy - accuracy),
+        last_seen = MAX(COALESCE(last_seen, excluded.last_seen), excluded.last_seen)
+;
+END;
+
+CREATE TRIGGER trg_word_stats_response_update
+AFTER UPDATE OF question_id, is_correct ON session_responses
+BEGIN
+    -- Take the old version of the answer out of its word's counts...
+    UPDATE word_stats SET
+        attempts = attempts - 1,
+        correct = correct - (CASE WHEN OLD.is_correct = 1 THEN 1 ELSE 0 END)
+    WHERE word_id = OLD.question_id;
+
+    -- ...and add the new version back in, if it is for a stored word
+    INSERT INTO word_stats (word_id, attempts, correct, accuracy, last_seen)
+    SELECT NEW.question_id, 1, CASE WHEN NEW.is_correct = 1 THEN 1 ELSE 0 END, 0.0, NEW.created_at
+    WHERE EXISTS (SELECT 1 FROM words WHERE id = NEW.question_id)
+    ON CONFLICT(word_id) DO UPDATE SET
+        attempts = attempts + 1,
+        correct = correct + excluded.correct;
+
+    DELETE FROM word_stats WHERE word_id = OLD.question_id AND attempts <= 0;
+
+    
+    UPDATE word_stats SET
+        accuracy = (
+        WITH RECURSIVE answers AS (
+            SELECT CASE WHEN is_correct = 1 THEN 1.0 ELSE 0.0 END AS score,
+                   ROW_NUMBER() OVER (ORDER BY created_at, id) AS n
+            FROM session_responses WHERE question_id = OLD.question_id
+        ),
+        rolling (n, accuracy) AS (
+            SELECT n, score FROM answers WHERE n = 1
+            UNION ALL
+            SELECT a.n, r.accuracy + 0.3 * (a.score - r.accuracy)
+            FROM rolling r JOIN answers a ON a.n = r.n + 1
+        )
+        SELECT accuracy FROM rolling ORDER BY n DESC LIMIT 1
+    ),
+        last_seen = (SELECT MAX(created_at) FROM session_responses WHERE question_id = OLD.question_id)
+    WHERE word_id = OLD.question_id
+    ;
+    
+    UPDATE word_stats SET
+        accuracy = (
+        WITH RECURSIVE answers AS (
+            SELECT CASE WHEN is_correct = 1 THEN 1.0 ELSE 0.0 END AS score,
+                   ROW_NUMBER() OVER (ORDER BY created_at, id) AS n
+            FROM session_responses WHERE question_id = NEW.question_id
+        ),
+        rolling (n, accuracy) AS (
+            SELECT n, score FROM answers WHERE n = 1
+            UNION ALL
+            SELECT a.n, r.accuracy + 0.3 * (a.score - r.accuracy)
+            FROM rolling r JOIN answers a ON a.n = r.n + 1
+        )
+        SELECT accuracy FROM rolling ORDER BY n DESC LIMIT 1
+    ),
+        last_seen = (SELECT MAX(created_at) FROM session_responses WHERE question_id = NEW.question_id)
+    WHERE word_id = NEW.question_id
+    ;
+END;
+
+CREATE TRIGGER trg_word_stats_word_delete
+AFTER DELETE ON words
+BEGIN
+    DELETE FROM word_stats WHERE word_id = OLD.id;
+END;
+
+CREATE TRIGGER trg_words_fts_delete
+AFTER DELETE ON words
+BEGIN
+    DELETE FROM words_fts WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER trg_words_fts_insert
+AFTER INSERT ON words
+BEGIN
+    INSERT INTO words_fts (rowid, arabic, romanized, english, example)
+    SELECT id, arabic, romanized, english, example FROM words_search_source WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER trg_words_fts_update
+AFTER UPDATE OF id, arabic, romanized, english, example ON words
+BEGIN
+    DELETE FROM words_fts WHERE rowid = OLD.id;
+    INSERT INTO words_fts (rowid, arabic, romanized, english, example)
+    SELECT id, arabic, romanized, english, example FROM words_search_source WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER trg_words_groups_group_delete
+    AFTER DELETE ON groups
+    BEGIN
+        DELETE FROM words_groups WHERE group_id = OLD.id;
+    END;
+
+CREATE TRIGGER trg_words_groups_word_delete
+    AFTER DELETE ON words
+    BEGIN
+        DELETE FROM words_groups WHERE word_id = OLD.id;
+    END;
+
+CREATE TRIGGER trg_words_groups_word_insert
+    AFTER INSERT ON words
+    BEGIN
+        INSERT OR IGNORE INTO words_groups (word_id, group_id) VALUES (NEW.id, NEW.group_id);
+    END;
+
+CREATE TRIGGER trg_words_groups_word_update
+    AFTER UPDATE OF group_id ON words
+    WHEN OLD.group_id <> NEW.group_id
+    BEGIN
+        DELETE FROM words_groups WHERE group_id = OLD.group_id AND word_id = OLD.id;
+        INSERT OR IGNORE INTO words_groups (word_id, group_id) VALUES (NEW.id, NEW.group_id);
+    END;
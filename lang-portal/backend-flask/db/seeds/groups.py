@@ -1,14 +1,15 @@
 import sqlite3
 import json
+import os
 from ..config import DATABASE
 
 
-def seed_groups():
+def seed_groups(database=DATABASE):
     """Inserts initial data into the groups table, ensuring unique names."""
-    conn = sqlite3.connect(DATABASE)
+    conn = sqlite3.connect(database)
     cursor = conn.cursor()
 
-    with open("db/seeds/groups.json", "r", encoding="utf-8") as f:
+    with open(os.path.join(os.path.dirname(__file__), "groups.json"), "r", encoding="utf-8") as f:
         groups = json.load(f)
 
     for group in groups:
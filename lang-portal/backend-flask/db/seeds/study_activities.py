@@ -1,19 +1,20 @@
 import sqlite3
 import json
+import os
 from ..config import DATABASE
 
 
-def seed_study_activities():
-    """Inserts initial data into the study_activities table."""
-    conn = sqlite3.connect(DATABASE)
+def seed_study_activities(database=DATABASE):
+    """Inserts initial data into the study_activities table, skipping names already present."""
+    conn = sqlite3.connect(database)
     cursor = conn.cursor()
 
-    with open("db/seeds/study_activities.json", "r") as f:
+    with open(os.path.join(os.path.dirname(__file__), "study_activities.json"), "r") as f:
         study_activities = json.load(f)
 
-    for activity in study_activities:
-        cursor.execute(
-            "INSERT INTO study_activities (name, description, type, difficulty, url, preview_url) VALUES (?, ?, ?, ?, ?, ?)",
+    cursor.executemany(
+        "INSERT OR IGNORE INTO study_activities (name, description, type, difficulty, url, preview_url) VALUES (?, ?, ?, ?, ?, ?)",
+        (
             (
                 activity["name"],
                 activity["description"],
@@ -21,8 +22,10 @@ def seed_study_activities():
                 activity["difficulty"],
                 activity["url"],
                 activity["preview_url"],
-            ),
-        )
+            )
+            for activity in study_activities
+        ),
+    )
     conn.commit()
     conn.close()
     print("Study activities seeded successfully.")
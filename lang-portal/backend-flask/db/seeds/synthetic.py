@@ -0,0 +1,91 @@
+import json
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from ..config import BASE_DIR
+from ..schema import migrate_db
+
+ACTIVITIES = [
+    ("Typing Tutor", "practice", "easy", "http://localhost:3000/study/typing-tutor"),
+    ("Flashcards", "flashcards", "easy", "http://localhost:3000/study/flash-cards"),
+    ("Arabic Vocabulary Quiz", "quiz", "medium", "http://localhost:3000/quiz"),
+    ("Memory Game", "game", "hard", "http://localhost:3000/memory"),
+]
+
+
+def build_synthetic_db(path, words=3000, groups=20, sessions=1000, responses_per_session=10, seed=42):
+    """Creates a database at ``path`` from setup.sql plus migrations and fills it with fake data.
+
+    The same arguments and seed always produce the same rows, so benchmark runs
+    and tests are comparable between releases.
+    """
+    rng = random.Random(seed)
+    if os.path.exists(path):
+        os.remove(path)
+
+    conn = sqlite3.connect(path)
+    with open(os.path.join(BASE_DIR, "sql", "setup.sql"), "r") as f:
+        conn.executescript(f.read())
+    conn.close()
+    migrate_db(path)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executemany(
+        "INSERT INTO groups (name) VALUES (?)",
+        [(f"Group {i}",) for i in range(1, groups + 1)],
+    )
+    conn.executemany(
+        "INSERT INTO study_activities (name, type, difficulty, url) VALUES (?, ?, ?, ?)",
+        ACTIVITIES,
+    )
+    conn.executemany(
+        "INSERT INTO words (arabic, romanized, english, example, group_id) VALUES (?, ?, ?, ?, ?)",
+        (
+            (
+                f"كلمة{i}",
+                f"kalima{i}",
+                f"word {i}",
+                json.dumps({"arabic": f"جملة {i}", "english": f"An example sentence for word {i}"}),
+                rng.randint(1, groups),
+            )
+            for i in range(1, words + 1)
+        ),
+    )
+
+    start = datetime(2024, 1, 1)
+    session_rows = []
+    response_rows = []
+    for session_id in range(1, sessions + 1):
+        started = start + timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        ended = started + timedelta(minutes=rng.randint(1, 45)) if rng.random() < 0.8 else None
+        session_rows.append((
+            rng.randint(1, groups),
+            rng.randint(1, len(ACTIVITIES)),
+            started.strftime("%Y-%m-%d %H:%M:%S"),
+            ended.strftime("%Y-%m-%d %H:%M:%S") if ended else None,
+        ))
+        answered = started
+        for _ in range(responses_per_session):
+            answered += timedelta(seconds=rng.randint(2, 30))
+            response_rows.append((
+                session_id,
+                rng.randint(1, words),
+                "answer",
+                1 if rng.random() < 0.7 else 0,
+                answered.strftime("%Y-%m-%d %H:%M:%S"),
+            ))
+
+    conn.executemany(
+        "INSERT INTO study_sessions (group_id, study_activity_id, start_time, end_time) VALUES (?, ?, ?, ?)",
+        session_rows,
+    )
+    conn.executemany(
+        "INSERT INTO session_responses (session_id, question_id, user_response, is_correct, created_at) VALUES (?, ?, ?, ?, ?)",
+        response_rows,
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
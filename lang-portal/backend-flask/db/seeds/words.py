@@ -1,65 +1,235 @@
 # db/seeds/words.py
 import sqlite3
+import codecs
 import json
+import hashlib
 import os
+import re
+import time
 from pathlib import Path
-from ..config import DATABASE, SEED_DIR
+from ..config import BULK_LOAD_PRAGMAS, DATABASE, SEED_DIR
+from ..schema import migrate_db
 from .helpers import get_or_create_group
 
+# Group names for the files shipped with the repo; other data_*.json files get a
+# name derived from the file name (data_food_words.json → "Food Words")
+GROUP_NAMES = {
+    "data_basic_greetings.json": "Basic Greetings",
+    "data_common_phrases.json": "Common Phrases",
+    "data_verbs_beginner.json": "Beginner Verbs",
+}
+
+# A word is only inserted if no word with the same Arabic text, romanization and
+# meaning is stored yet. Homographs (same Arabic, different word) are inserted.
+# A trigger adds the new word to its group.
+INSERT_WORD_SQL = """
+    INSERT INTO words (arabic, romanized, english, example, group_id, pronunciation_audio)
+    SELECT ?, ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (SELECT 1 FROM words WHERE arabic = ?1 AND romanized = ?2 AND english = ?3)
+"""
+
+# A word that was already stored joins the file's group through words_groups instead
+ADD_TO_GROUP_SQL = """
+    INSERT OR IGNORE INTO words_groups (word_id, group_id)
+    SELECT id, ?4 FROM words WHERE arabic = ?1 AND romanized = ?2 AND english = ?3 ORDER BY id LIMIT 1
+"""
+
+_SEPARATORS_RE = re.compile(r"[\s,]*")
+
+# Bytes read from a word file at a time
+READ_CHUNK_SIZE = 1 << 16
+
+
+def seed_directory():
+    return os.path.join(Path(__file__).parent.parent, SEED_DIR)
+
+
+def discover_word_files(directory):
+    return sorted(p for p in Path(directory).glob("data_*.json") if p.is_file())
+
+
+def group_name_for(path):
+    return GROUP_NAMES.get(path.name, path.stem[len("data_"):].replace("_", " ").title())
+
+
+def file_digest(path):
+    """sha256 of a file, read a chunk at a time."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_text_chunks(f, digest=None, size=READ_CHUNK_SIZE):
+    """Yield a binary file's UTF-8 text a chunk at a time, adding the raw bytes to ``digest``."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in iter(lambda: f.read(size), b""):
+        if digest is not None:
+            digest.update(chunk)
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_json_array(chunks):
+    """Yield the elements of a top-level JSON array one at a time from an iterable of text chunks.
+
+    Only the element being decoded and the chunk it ends in are held in
+    memory, so a large file is inserted without being read whole.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer, pos, done = "", 0, False
+
+    def fill():
+        # Drop what has been consumed and append the next chunk; False at the end of the input
+        nonlocal buffer, pos, done
+        chunk = next(chunks, None)
+        if chunk is None:
+            done = True
+            return False
+        buffer, pos = buffer[pos:] + chunk, 0
+        return True
+
+    def skip_separators():
+        nonlocal pos
+        while True:
+            pos = _SEPARATORS_RE.match(buffer, pos).end()
+            if pos < len(buffer) or not fill():
+                return
+
+    skip_separators()
+    if buffer[pos:pos + 1] != "[":
+        raise ValueError("expected a JSON array of words")
+    pos += 1
+    while True:
+        skip_separators()
+        if buffer[pos:pos + 1] == "]":
+            return
+        if done:
+            raise ValueError("unterminated JSON array")
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if fill():
+                continue
+            raise
+        if end == len(buffer) and not done and fill():
+            continue  # A number may go on in the next chunk, so decode it again
+        pos = end
+        yield item
+
+
+def _word_rows(words, group_id):
+    for word in words:
+        example = word.get("example")
+        yield (
+            word["arabic"],
+            word["romanized"],
+            word["english"],
+            json.dumps(example) if isinstance(example, (dict, list)) else example,
+            word.get("group_id", group_id),  # Use provided group_id or default to the file's group
+            word.get("pronunciation_audio", None),  # Optional field
+        )
+
+
+def seed_word_file(conn, path, force=False, before_commit=None):
+    """Load one data_*.json file in a single transaction.
+
+    Returns (rows read, rows inserted), or None when the file was skipped
+    because its content hash matches the last successful load.
+    ``before_commit(conn)`` runs last inside the file's transaction.
+    """
+    if not force:
+        row = conn.execute("SELECT sha256 FROM seed_files WHERE filename = ?", (path.name,)).fetchone()
+        if row and row[0] == file_digest(path):
+            return None
+
+    read = inserted = 0
+    # The hash recorded is that of the bytes actually loaded
+    digest = hashlib.sha256()
+    with conn, open(path, "rb") as f:
+        cursor = conn.cursor()
+        group_id = get_or_create_group(cursor, group_name_for(path))
+        words = iter_json_array(read_text_chunks(f, digest))
+        for row in _word_rows(words, group_id):
+            read += 1
+            cursor.execute(INSERT_WORD_SQL, row)
+            if cursor.rowcount:
+                inserted += 1
+            else:
+                cursor.execute(ADD_TO_GROUP_SQL, row[:3] + row[4:5])
+        cursor.execute(
+            """
+            INSERT INTO seed_files (filename, sha256, rows_read, rows_inserted)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(filename) DO UPDATE SET
+                sha256 = excluded.sha256,
+                rows_read = excluded.rows_read,
+                rows_inserted = excluded.rows_inserted,
+                seeded_at = CURRENT_TIMESTAMP
+            """,
+            (path.name, digest.hexdigest(), read, inserted),
+        )
+        if before_commit:
+            before_commit(conn)
+    return read, inserted
+
+
+def seed_words(database=DATABASE, directory=None, force=False, progress=None):
+    """Inserts every db/seeds/data_*.json word list into the words table.
+
+    Each file is streamed and loaded a word at a time in its own transaction. Files
+    whose content has not changed since the last run are skipped unless
+    ``force`` is set, and a word that is already stored (same Arabic text,
+    romanization and meaning) is only added to the file's group instead of
+    being inserted again, so reseeding is safe to repeat.
+
+    ``progress(conn, files_done, files_total, filename)`` is called inside each
+    file's transaction, just before it commits, so anything it writes through
+    ``conn`` is committed with the file.
+    """
+    directory = directory or seed_directory()
+    migrate_db(database)
+
+    conn = sqlite3.connect(database)
+    for name, value in BULK_LOAD_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+    print(f"Looking for files in: {directory}")
+    total_read = total_inserted = 0
+    started = time.perf_counter()
+
+    paths = discover_word_files(directory)
+    for done, path in enumerate(paths, start=1):
+        file_started = time.perf_counter()
+
+        def file_done(seed_conn, done=done, name=path.name):
+            progress(seed_conn, done, len(paths), name)
+
+        try:
+            result = seed_word_file(conn, path, force, file_done if progress else None)
+        except (ValueError, KeyError, UnicodeDecodeError) as e:
+            print(f"Skipping {path.name}: not a word list ({e!r})")
+            continue
+        if result is None:
+            print(f"Skipping {path.name}: unchanged since last seed")
+            continue
+
+        read, inserted = result
+        elapsed = time.perf_counter() - file_started
+        total_read += read
+        total_inserted += inserted
+        print(
+            f"Seeded {inserted} of {read} words from {path.name} into group "
+            f"'{group_name_for(path)}' ({read / elapsed:,.0f} rows/sec)"
+        )
+        if read > inserted:
+            print(f"  {read - inserted} words from {path.name} were already stored and were only added to the group")
 
-def seed_words():
-    """Inserts data from multiple JSON files into the words table."""
-    # Enable JSON serialization for SQLite
-    sqlite3.register_adapter(dict, json.dumps)
-
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-
-    # Get the base directory (where config.py is) and construct seed path
-    base_dir = Path(__file__).parent.parent
-    seed_directory = os.path.join(base_dir, SEED_DIR)
-
-    json_files = {
-        "Basic Greetings": "data_basic_greetings.json",
-        "Common Phrases": "data_common_phrases.json",
-        "Beginner Verbs": "data_verbs_beginner.json",
-    }
-
-    print(f"Looking for files in: {seed_directory}")
-
-    for group_name, json_file in json_files.items():
-        file_path = os.path.join(seed_directory, json_file)
-
-        if os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                words = json.load(f)
-
-            group_id = get_or_create_group(cursor, group_name)
-
-            for word in words:
-                # The example field is already a dictionary, so it will be automatically converted to JSON
-                cursor.execute(
-                    """
-                    INSERT INTO words 
-                    (arabic, romanized, english, example, group_id, pronunciation_audio) 
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        word["arabic"],
-                        word["romanized"],
-                        word["english"],
-                        word["example"],  # This will be automatically converted to JSON
-                        word.get(
-                            "group_id", group_id
-                        ),  # Use provided group_id or default to created one
-                        word.get("pronunciation_audio", None),  # Optional field
-                    ),
-                )
-
-            print(f"Seeded data from {json_file} into group '{group_name}'")
-        else:
-            print(f"File {json_file} not found at {file_path}")
-
-    conn.commit()
     conn.close()
-    print("Words seeded successfully.")
+    elapsed = time.perf_counter() - started
+    print(
+        f"Words seeded successfully: {total_inserted} inserted, {total_read} read "
+        f"in {elapsed:.2f}s ({total_read / elapsed if elapsed else 0:,.0f} rows/sec)."
+    )
@@ -0,0 +1,6 @@
+-- Client-generated response ids let batch uploads be retried without duplicating answers
+ALTER TABLE session_responses ADD COLUMN client_response_id TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_session_responses_client_id
+    ON session_responses(session_id, client_response_id)
+    WHERE client_response_id IS NOT NULL;
@@ -0,0 +1,81 @@
+-- Per-session score summary kept current by triggers on session_responses, so the
+-- session detail view and stats no longer aggregate every response on each read
+CREATE TABLE IF NOT EXISTS session_scores (
+    session_id INTEGER PRIMARY KEY,
+    total_questions INTEGER NOT NULL DEFAULT 0,
+    correct_answers INTEGER NOT NULL DEFAULT 0,
+    first_response_at TIMESTAMP,
+    last_response_at TIMESTAMP,
+    FOREIGN KEY (session_id) REFERENCES study_sessions(id) ON DELETE CASCADE
+);
+
+-- Lets the triggers find a session's first/last response without scanning it
+CREATE INDEX IF NOT EXISTS idx_session_responses_session_created
+    ON session_responses(session_id, created_at);
+
+INSERT OR REPLACE INTO session_scores
+    (session_id, total_questions, correct_answers, first_response_at, last_response_at)
+SELECT session_id,
+       COUNT(*),
+       SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END),
+       MIN(created_at),
+       MAX(created_at)
+FROM session_responses
+GROUP BY session_id;
+
+CREATE TRIGGER IF NOT EXISTS trg_session_scores_response_insert
+AFTER INSERT ON session_responses
+BEGIN
+    INSERT INTO session_scores
+        (session_id, total_questions, correct_answers, first_response_at, last_response_at)
+    VALUES
+        (NEW.session_id, 1, CASE WHEN NEW.is_correct = 1 THEN 1 ELSE 0 END, NEW.created_at, NEW.created_at)
+    ON CONFLICT(session_id) DO UPDATE SET
+        total_questions = total_questions + 1,
+        correct_answers = correct_answers + excluded.correct_answers,
+        first_response_at = MIN(COALESCE(first_response_at, excluded.first_response_at), excluded.first_response_at),
+        last_response_at = MAX(COALESCE(last_response_at, excluded.last_response_at), excluded.last_response_at);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_session_scores_response_delete
+AFTER DELETE ON session_responses
+BEGIN
+    UPDATE session_scores SET
+        total_questions = total_questions - 1,
+        correct_answers = correct_answers - (CASE WHEN OLD.is_correct = 1 THEN 1 ELSE 0 END),
+        first_response_at = (SELECT MIN(created_at) FROM session_responses WHERE session_id = OLD.session_id),
+        last_response_at = (SELECT MAX(created_at) FROM session_responses WHERE session_id = OLD.session_id)
+    WHERE session_id = OLD.session_id;
+
+    DELETE FROM session_scores WHERE session_id = OLD.session_id AND total_questions <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_session_scores_response_update
+AFTER UPDATE OF session_id, is_correct, created_at ON session_responses
+BEGIN
+    -- Take the old version of the row out of its session's summary...
+    UPDATE session_scores SET
+        total_questions = total_questions - 1,
+        correct_answers = correct_answers - (CASE WHEN OLD.is_correct = 1 THEN 1 ELSE 0 END)
+    WHERE session_id = OLD.session_id;
+
+    -- ...and add the new version back in
+    INSERT INTO session_scores (session_id, total_questions, correct_answers)
+    VALUES (NEW.session_id, 1, CASE WHEN NEW.is_correct = 1 THEN 1 ELSE 0 END)
+    ON CONFLICT(session_id) DO UPDATE SET
+        total_questions = total_questions + 1,
+        correct_answers = correct_answers + excluded.correct_answers;
+
+    UPDATE session_scores SET
+        first_response_at = (SELECT MIN(created_at) FROM session_responses WHERE session_id = session_scores.session_id),
+        last_response_at = (SELECT MAX(created_at) FROM session_responses WHERE session_id = session_scores.session_id)
+    WHERE session_id IN (OLD.session_id, NEW.session_id);
+
+    DELETE FROM session_scores WHERE session_id = OLD.session_id AND total_questions <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_session_scores_session_delete
+AFTER DELETE ON study_sessions
+BEGIN
+    DELETE FROM session_scores WHERE session_id = OLD.id;
+END;
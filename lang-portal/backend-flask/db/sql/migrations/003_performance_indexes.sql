@@ -0,0 +1,23 @@
+-- Indexes for the access paths used by the routes and the vocab importer
+
+-- Session listing, /latest and date-range stats order or filter on start_time
+CREATE INDEX IF NOT EXISTS idx_study_sessions_start_time
+    ON study_sessions(start_time, id);
+
+-- Session listing filtered by group or activity, newest first
+CREATE INDEX IF NOT EXISTS idx_study_sessions_group_start
+    ON study_sessions(group_id, start_time);
+
+CREATE INDEX IF NOT EXISTS idx_study_sessions_activity_start
+    ON study_sessions(study_activity_id, start_time);
+
+-- Group word listing, paginated by id
+CREATE INDEX IF NOT EXISTS idx_words_group_id
+    ON words(group_id, id);
+
+-- Importer duplicate check (arabic = ? AND group_id = ?)
+CREATE INDEX IF NOT EXISTS idx_words_arabic_group
+    ON words(arabic, group_id);
+
+-- Refresh planner statistics so the new indexes are picked up
+ANALYZE;
@@ -0,0 +1,63 @@
+-- Version counter for the read-mostly catalog tables (words, groups, study_activities).
+-- Triggers bump it on every write, including writes from the seed scripts and the vocab
+-- importer, so the in-process response cache knows when its entries are stale.
+CREATE TABLE IF NOT EXISTS data_version (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO data_version (name, version) VALUES ('catalog', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_words_insert
+AFTER INSERT ON words
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_words_update
+AFTER UPDATE ON words
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_words_delete
+AFTER DELETE ON words
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_groups_insert
+AFTER INSERT ON groups
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_groups_update
+AFTER UPDATE ON groups
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_groups_delete
+AFTER DELETE ON groups
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_study_activities_insert
+AFTER INSERT ON study_activities
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_study_activities_update
+AFTER UPDATE ON study_activities
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_data_version_study_activities_delete
+AFTER DELETE ON study_activities
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE name = 'catalog';
+END;
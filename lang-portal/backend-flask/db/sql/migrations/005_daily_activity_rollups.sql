@@ -0,0 +1,154 @@
+-- Daily study activity per activity type, kept current by triggers so
+-- /study-sessions/stats reads at most a few rows per day instead of every session
+CREATE TABLE IF NOT EXISTS daily_activity_rollups (
+    study_date TEXT NOT NULL,
+    activity_type TEXT NOT NULL,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    completed_sessions INTEGER NOT NULL DEFAULT 0,
+    minutes_studied INTEGER NOT NULL DEFAULT 0,
+    score_sum REAL NOT NULL DEFAULT 0,  -- Sum of per-session score percentages
+    PRIMARY KEY (study_date, activity_type)
+) WITHOUT ROWID;
+
+INSERT OR REPLACE INTO daily_activity_rollups
+    (study_date, activity_type, session_count, completed_sessions, minutes_studied, score_sum)
+SELECT date(ss.start_time),
+       COALESCE(sa.type, 'unknown'),
+       COUNT(*),
+       SUM(CASE WHEN ss.end_time IS NOT NULL THEN 1 ELSE 0 END),
+       SUM(CASE WHEN ss.end_time IS NOT NULL
+           THEN CAST((julianday(ss.end_time) - julianday(ss.start_time)) * 24 * 60 AS INTEGER)
+           ELSE 0 END),
+       SUM(CASE WHEN sc.total_questions > 0
+           THEN sc.correct_answers * 100.0 / sc.total_questions
+           ELSE 0 END)
+FROM study_sessions ss
+LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+LEFT JOIN session_scores sc ON sc.session_id = ss.id
+GROUP BY date(ss.start_time), COALESCE(sa.type, 'unknown');
+
+-- A session starting (or being inserted already completed)
+CREATE TRIGGER IF NOT EXISTS trg_rollups_session_insert
+AFTER INSERT ON study_sessions
+BEGIN
+    INSERT INTO daily_activity_rollups
+        (study_date, activity_type, session_count, completed_sessions, minutes_studied)
+    VALUES (
+        date(NEW.start_time),
+        COALESCE((SELECT type FROM study_activities WHERE id = NEW.study_activity_id), 'unknown'),
+        1,
+        CASE WHEN NEW.end_time IS NOT NULL THEN 1 ELSE 0 END,
+        CASE WHEN NEW.end_time IS NOT NULL
+            THEN CAST((julianday(NEW.end_time) - julianday(NEW.start_time)) * 24 * 60 AS INTEGER)
+            ELSE 0 END
+    )
+    ON CONFLICT(study_date, activity_type) DO UPDATE SET
+        session_count = session_count + 1,
+        completed_sessions = completed_sessions + excluded.completed_sessions,
+        minutes_studied = minutes_studied + excluded.minutes_studied;
+END;
+
+-- A session completing (or being moved): take out the old contribution, add the new one
+CREATE TRIGGER IF NOT EXISTS trg_rollups_session_update
+AFTER UPDATE OF start_time, end_time, study_activity_id ON study_sessions
+BEGIN
+    UPDATE daily_activity_rollups SET
+        session_count = session_count - 1,
+        completed_sessions = completed_sessions - (CASE WHEN OLD.end_time IS NOT NULL THEN 1 ELSE 0 END),
+        minutes_studied = minutes_studied - (CASE WHEN OLD.end_time IS NOT NULL
+            THEN CAST((julianday(OLD.end_time) - julianday(OLD.start_time)) * 24 * 60 AS INTEGER)
+            ELSE 0 END),
+        score_sum = score_sum - COALESCE((
+            SELECT CASE WHEN total_questions > 0 THEN correct_answers * 100.0 / total_questions ELSE 0 END
+            FROM session_scores WHERE session_id = OLD.id), 0)
+    WHERE study_date = date(OLD.start_time)
+      AND activity_type = COALESCE((SELECT type FROM study_activities WHERE id = OLD.study_activity_id), 'unknown');
+
+    INSERT INTO daily_activity_rollups
+        (study_date, activity_type, session_count, completed_sessions, minutes_studied, score_sum)
+    VALUES (
+        date(NEW.start_time),
+        COALESCE((SELECT type FROM study_activities WHERE id = NEW.study_activity_id), 'unknown'),
+        1,
+        CASE WHEN NEW.end_time IS NOT NULL THEN 1 ELSE 0 END,
+        CASE WHEN NEW.end_time IS NOT NULL
+            THEN CAST((julianday(NEW.end_time) - julianday(NEW.start_time)) * 24 * 60 AS INTEGER)
+            ELSE 0 END,
+        COALESCE((
+            SELECT CASE WHEN total_questions > 0 THEN correct_answers * 100.0 / total_questions ELSE 0 END
+            FROM session_scores WHERE session_id = NEW.id), 0)
+    )
+    ON CONFLICT(study_date, activity_type) DO UPDATE SET
+        session_count = session_count + 1,
+        completed_sessions = completed_sessions + excluded.completed_sessions,
+        minutes_studied = minutes_studied + excluded.minutes_studied,
+        score_sum = score_sum + excluded.score_sum;
+END;
+
+-- Deleting a session removes its contribution, including its score. This replaces the
+-- session_scores cleanup trigger from migration 002 so the score is read before it is
+-- deleted; SQLite does not guarantee the order of two triggers on the same event.
+DROP TRIGGER IF EXISTS trg_session_scores_session_delete;
+
+CREATE TRIGGER IF NOT EXISTS trg_study_sessions_delete
+AFTER DELETE ON study_sessions
+BEGIN
+    UPDATE daily_activity_rollups SET
+        session_count = session_count - 1,
+        completed_sessions = completed_sessions - (CASE WHEN OLD.end_time IS NOT NULL THEN 1 ELSE 0 END),
+        minutes_studied = minutes_studied - (CASE WHEN OLD.end_time IS NOT NULL
+            THEN CAST((julianday(OLD.end_time) - julianday(OLD.start_time)) * 24 * 60 AS INTEGER)
+            ELSE 0 END),
+        score_sum = score_sum - COALESCE((
+            SELECT CASE WHEN total_questions > 0 THEN correct_answers * 100.0 / total_questions ELSE 0 END
+            FROM session_scores WHERE session_id = OLD.id), 0)
+    WHERE study_date = date(OLD.start_time)
+      AND activity_type = COALESCE((SELECT type FROM study_activities WHERE id = OLD.study_activity_id), 'unknown');
+
+    DELETE FROM session_scores WHERE session_id = OLD.id;
+END;
+
+-- Score changes (responses recorded or removed) adjust the score sum of the session's day.
+-- The session lookup finds nothing once the session itself is gone, making these no-ops.
+CREATE TRIGGER IF NOT EXISTS trg_rollups_score_insert
+AFTER INSERT ON session_scores
+BEGIN
+    UPDATE daily_activity_rollups SET
+        score_sum = score_sum
+            + CASE WHEN NEW.total_questions > 0 THEN NEW.correct_answers * 100.0 / NEW.total_questions ELSE 0 END
+    WHERE (study_date, activity_type) = (
+        SELECT date(ss.start_time), COALESCE(sa.type, 'unknown')
+        FROM study_sessions ss
+        LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+        WHERE ss.id = NEW.session_id
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollups_score_update
+AFTER UPDATE OF total_questions, correct_answers ON session_scores
+BEGIN
+    UPDATE daily_activity_rollups SET
+        score_sum = score_sum
+            + CASE WHEN NEW.total_questions > 0 THEN NEW.correct_answers * 100.0 / NEW.total_questions ELSE 0 END
+            - CASE WHEN OLD.total_questions > 0 THEN OLD.correct_answers * 100.0 / OLD.total_questions ELSE 0 END
+    WHERE (study_date, activity_type) = (
+        SELECT date(ss.start_time), COALESCE(sa.type, 'unknown')
+        FROM study_sessions ss
+        LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+        WHERE ss.id = NEW.session_id
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollups_score_delete
+AFTER DELETE ON session_scores
+BEGIN
+    UPDATE daily_activity_rollups SET
+        score_sum = score_sum
+            - CASE WHEN OLD.total_questions > 0 THEN OLD.correct_answers * 100.0 / OLD.total_questions ELSE 0 END
+    WHERE (study_date, activity_type) = (
+        SELECT date(ss.start_time), COALESCE(sa.type, 'unknown')
+        FROM study_sessions ss
+        LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+        WHERE ss.id = OLD.session_id
+    );
+END;
@@ -0,0 +1,80 @@
+-- Full-text index over words for /words/search.
+--
+-- FTS5 has no Arabic tokenizer, so the Arabic text is normalized before it is indexed:
+-- tashkeel (U+064B-U+0652), superscript alef and tatweel are removed, alef variants
+-- (hamza above/below, madda, wasla) become a bare alef, alef maqsura becomes ya and
+-- ta marbuta becomes ha. /words/search applies the same normalization to queries
+-- (db.lib.search.normalize_arabic); keep the two in sync. Example JSON is indexed as
+-- the text of its values.
+CREATE VIEW IF NOT EXISTS words_search_source AS
+SELECT id,
+       REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(arabic
+           , char(0x064B), '')
+           , char(0x064C), '')
+           , char(0x064D), '')
+           , char(0x064E), '')
+           , char(0x064F), '')
+           , char(0x0650), '')
+           , char(0x0651), '')
+           , char(0x0652), '')
+           , char(0x0670), '')
+           , char(0x0640), '')
+           , char(0x0623), char(0x0627))
+           , char(0x0625), char(0x0627))
+           , char(0x0622), char(0x0627))
+           , char(0x0671), char(0x0627))
+           , char(0x0649), char(0x064A))
+           , char(0x0629), char(0x0647)) AS arabic,
+       romanized,
+       english,
+       REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(CASE WHEN json_valid(example)
+             THEN (SELECT group_concat(value, ' ') FROM json_each(example))
+             ELSE example END
+           , char(0x064B), '')
+           , char(0x064C), '')
+           , char(0x064D), '')
+           , char(0x064E), '')
+           , char(0x064F), '')
+           , char(0x0650), '')
+           , char(0x0651), '')
+           , char(0x0652), '')
+           , char(0x0670), '')
+           , char(0x0640), '')
+           , char(0x0623), char(0x0627))
+           , char(0x0625), char(0x0627))
+           , char(0x0622), char(0x0627))
+           , char(0x0671), char(0x0627))
+           , char(0x0649), char(0x064A))
+           , char(0x0629), char(0x0647)) AS example
+FROM words;
+
+-- prefix indexes make the short prefixes typed in a search box cheap to match
+CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+    arabic, romanized, english, example,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+INSERT INTO words_fts (rowid, arabic, romanized, english, example)
+SELECT id, arabic, romanized, english, example FROM words_search_source;
+
+CREATE TRIGGER IF NOT EXISTS trg_words_fts_insert
+AFTER INSERT ON words
+BEGIN
+    INSERT INTO words_fts (rowid, arabic, romanized, english, example)
+    SELECT id, arabic, romanized, english, example FROM words_search_source WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_words_fts_update
+AFTER UPDATE OF id, arabic, romanized, english, example ON words
+BEGIN
+    DELETE FROM words_fts WHERE rowid = OLD.id;
+    INSERT INTO words_fts (rowid, arabic, romanized, english, example)
+    SELECT id, arabic, romanized, english, example FROM words_search_source WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_words_fts_delete
+AFTER DELETE ON words
+BEGIN
+    DELETE FROM words_fts WHERE rowid = OLD.id;
+END;
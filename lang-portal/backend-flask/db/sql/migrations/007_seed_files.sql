@@ -0,0 +1,9 @@
+-- Content hash of every word file loaded by db/seeds/words.py, so reseeding skips
+-- files that have not changed since they were last loaded
+CREATE TABLE IF NOT EXISTS seed_files (
+    filename TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    rows_read INTEGER NOT NULL,
+    rows_inserted INTEGER NOT NULL,
+    seeded_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,58 @@
+"""Add the columns the code relies on but older databases may lack, then backfill active time.
+
+Databases created from earlier versions of setup.sql have no
+words.pronunciation_audio, and study_sessions.notes / active_time_seconds were
+added to some databases by hand. SQLite has no ADD COLUMN IF NOT EXISTS, so the
+columns are checked first. Active time is then computed, in batches, for
+sessions recorded before it was maintained on every PATCH.
+"""
+from db.schema import backfill_in_batches
+
+TRANSACTIONAL = False
+
+COLUMNS = [
+    ("words", "pronunciation_audio", "TEXT"),
+    ("study_sessions", "notes", "TEXT"),
+    ("study_sessions", "active_time_seconds", "INTEGER DEFAULT 0"),
+]
+
+# Same definition as db.lib.sessions.ACTIVE_TIME_QUERY, correlated on the session row
+UPDATE_ACTIVE_TIME = """
+    UPDATE study_sessions SET active_time_seconds = (
+        SELECT COALESCE(SUM(gap), 0)
+        FROM (
+            SELECT CAST(
+                (julianday(sr.created_at)
+                 - julianday(COALESCE(LAG(sr.created_at) OVER (ORDER BY sr.created_at), study_sessions.start_time))
+                ) * 86400 AS INTEGER
+            ) AS gap
+            FROM session_responses sr
+            WHERE sr.session_id = study_sessions.id
+        )
+    )
+    WHERE id IN ({placeholders})
+"""
+
+NEEDS_ACTIVE_TIME = """
+    (active_time_seconds IS NULL OR active_time_seconds = 0)
+    AND EXISTS (SELECT 1 FROM session_responses WHERE session_id = study_sessions.id)
+"""
+
+
+def _update_active_time(conn, ids):
+    conn.execute(UPDATE_ACTIVE_TIME.format(placeholders=", ".join("?" * len(ids))), ids)
+
+
+def upgrade(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for table, column, definition in COLUMNS:
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    backfill_in_batches(conn, "study_sessions", _update_active_time, where=NEEDS_ACTIVE_TIME, batch_size=500)
@@ -0,0 +1,61 @@
+"""Spaced-repetition state per word, kept current by a trigger on session_responses.
+
+Scheduling follows SM-2 with binary grades: a correct answer on a due word
+counts as quality 5 (ease +0.1) and a wrong one as quality 1 (ease -0.54, never
+below 1.3), which resets the repetition streak and makes the word due tomorrow.
+The interval is 1 day, then 6 days, then the previous interval times the ease,
+capped at a year. due_date is indexed so /api/review-queue reads the words due
+today straight from the index.
+
+The trigger and the backfill run the same UPSERT, kept in db.lib.reviews with
+named parameters and turned into NEW.* references for the trigger, so existing
+responses are replayed in order with exactly the logic new ones get.
+"""
+from db.lib.reviews import UPSERT_REVIEW
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS word_reviews (
+    word_id INTEGER PRIMARY KEY,
+    ease REAL NOT NULL DEFAULT 2.5,
+    interval_days INTEGER NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0,  -- Correct answers in a row
+    lapses INTEGER NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    last_reviewed_at DATETIME,
+    due_date TEXT NOT NULL,  -- YYYY-MM-DD
+    FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE
+)
+"""
+
+CREATE_INDEX = "CREATE INDEX IF NOT EXISTS idx_word_reviews_due ON word_reviews(due_date, word_id)"
+
+CREATE_TRIGGER = f"""
+CREATE TRIGGER IF NOT EXISTS trg_word_reviews_response_insert
+AFTER INSERT ON session_responses
+WHEN EXISTS (SELECT 1 FROM words WHERE id = NEW.question_id)
+BEGIN
+    {UPSERT_REVIEW.replace(":question_id", "NEW.question_id")
+                  .replace(":is_correct", "NEW.is_correct")
+                  .replace(":created_at", "NEW.created_at")};
+END
+"""
+
+
+def upgrade(conn):
+    conn.execute(CREATE_TABLE)
+    conn.execute(CREATE_INDEX)
+
+    responses = conn.execute(
+        """
+        SELECT sr.question_id, sr.is_correct, sr.created_at
+        FROM session_responses sr
+        JOIN words w ON w.id = sr.question_id
+        ORDER BY sr.created_at, sr.id
+        """
+    )
+    conn.executemany(
+        UPSERT_REVIEW,
+        ({"question_id": q, "is_correct": c, "created_at": t} for q, c, t in responses),
+    )
+
+    conn.execute(CREATE_TRIGGER)
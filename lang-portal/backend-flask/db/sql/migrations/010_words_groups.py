@@ -0,0 +1,170 @@
+"""Move group membership onto words_groups and merge duplicated words.
+
+Until now a word belonged to exactly the group in words.group_id, so a word in
+two groups was stored twice. After this migration every membership is a
+words_groups row, unique per (group_id, word_id), and words with the same
+Arabic text, romanization and English meaning are merged into the oldest row:
+its memberships, responses and review schedule take over those of the
+duplicates, which are then deleted. Unvowelled Arabic has many homographs
+(علم is ʿilm "knowledge", ʿalam "flag" and ʿallama "taught"), so words that
+only share their Arabic text are different words and are left alone.
+
+words.group_id stays as the group a word was first added to. Inserting a word
+adds that membership through a trigger, so older writers keep working, and
+groups.word_count is kept current by triggers on words_groups.
+"""
+
+CREATE_INDEXES = [
+    # Group word listing, paginated by word id, and the membership uniqueness check
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_words_groups_group_word ON words_groups(group_id, word_id)",
+    # Removing a word from all of its groups
+    "CREATE INDEX IF NOT EXISTS idx_words_groups_word ON words_groups(word_id)",
+    # Replaced by idx_words_groups_group_word for listing a group's words
+    "DROP INDEX IF EXISTS idx_words_group_id",
+]
+
+# Every duplicated word and the oldest row with the same text, romanization and meaning
+CREATE_MERGES = """
+    CREATE TEMP TABLE word_merges AS
+    SELECT w.id AS duplicate_id, c.canonical_id
+    FROM words w
+    JOIN (
+        SELECT arabic, romanized, english, MIN(id) AS canonical_id
+        FROM words
+        GROUP BY arabic, romanized, english
+        HAVING COUNT(*) > 1
+    ) c ON c.arabic = w.arabic AND c.romanized = w.romanized AND c.english = w.english
+    WHERE w.id <> c.canonical_id
+"""
+
+MERGE_DUPLICATES = [
+    """
+    INSERT OR IGNORE INTO words_groups (word_id, group_id)
+    SELECT m.canonical_id, wg.group_id
+    FROM words_groups wg JOIN word_merges m ON m.duplicate_id = wg.word_id
+    ORDER BY wg.id
+    """,
+    """
+    UPDATE session_responses
+    SET question_id = (SELECT canonical_id FROM word_merges WHERE duplicate_id = question_id)
+    WHERE question_id IN (SELECT duplicate_id FROM word_merges)
+    """,
+    # Keep the canonical word's schedule when both have one
+    """
+    UPDATE OR IGNORE word_reviews
+    SET word_id = (SELECT canonical_id FROM word_merges WHERE duplicate_id = word_id)
+    WHERE word_id IN (SELECT duplicate_id FROM word_merges)
+    """,
+    "DELETE FROM word_reviews WHERE word_id IN (SELECT duplicate_id FROM word_merges)",
+    "DELETE FROM words_groups WHERE word_id IN (SELECT duplicate_id FROM word_merges)",
+    "DELETE FROM words WHERE id IN (SELECT duplicate_id FROM word_merges)",
+    "DROP TABLE word_merges",
+]
+
+CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_words_groups_word_insert
+    AFTER INSERT ON words
+    BEGIN
+        INSERT OR IGNORE INTO words_groups (word_id, group_id) VALUES (NEW.id, NEW.group_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_words_groups_word_update
+    AFTER UPDATE OF group_id ON words
+    WHEN OLD.group_id <> NEW.group_id
+    BEGIN
+        DELETE FROM words_groups WHERE group_id = OLD.group_id AND word_id = OLD.id;
+        INSERT OR IGNORE INTO words_groups (word_id, group_id) VALUES (NEW.id, NEW.group_id);
+    END
+    """,
+    # Foreign keys are not enforced on our connections, so ON DELETE CASCADE never fires
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_words_groups_word_delete
+    AFTER DELETE ON words
+    BEGIN
+        DELETE FROM words_groups WHERE word_id = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_words_groups_group_delete
+    AFTER DELETE ON groups
+    BEGIN
+        DELETE FROM words_groups WHERE group_id = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_groups_word_count_insert
+    AFTER INSERT ON words_groups
+    BEGIN
+        UPDATE groups SET word_count = word_count + 1 WHERE id = NEW.group_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_groups_word_count_update
+    AFTER UPDATE OF group_id ON words_groups
+    WHEN OLD.group_id <> NEW.group_id
+    BEGIN
+        UPDATE groups SET word_count = word_count - 1 WHERE id = OLD.group_id;
+        UPDATE groups SET word_count = word_count + 1 WHERE id = NEW.group_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_groups_word_count_delete
+    AFTER DELETE ON words_groups
+    BEGIN
+        UPDATE groups SET word_count = word_count - 1 WHERE id = OLD.group_id;
+    END
+    """,
+]
+
+
+def upgrade(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(groups)")}
+    if "word_count" not in columns:
+        conn.execute("ALTER TABLE groups ADD COLUMN word_count INTEGER NOT NULL DEFAULT 0")
+
+    # words_groups existed in setup.sql without a unique key, so drop repeated rows first
+    conn.execute(
+        """
+        DELETE FROM words_groups
+        WHERE id NOT IN (SELECT MIN(id) FROM words_groups GROUP BY group_id, word_id)
+        """
+    )
+    for statement in CREATE_INDEXES:
+        conn.execute(statement)
+
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO words_groups (word_id, group_id)
+        SELECT id, group_id FROM words ORDER BY id
+        """
+    )
+
+    conn.execute(CREATE_MERGES)
+    merges = conn.execute(
+        """
+        SELECT m.duplicate_id, m.canonical_id, w.arabic, w.english
+        FROM word_merges m JOIN words w ON w.id = m.duplicate_id
+        ORDER BY m.duplicate_id
+        """
+    ).fetchall()
+    for duplicate_id, canonical_id, arabic, english in merges:
+        print(f"Merging word {duplicate_id} into {canonical_id}: {arabic} ({english})")
+    for statement in MERGE_DUPLICATES:
+        conn.execute(statement)
+    if merges:
+        print(f"Merged {len(merges)} duplicated words")
+
+    homographs = conn.execute(
+        "SELECT COUNT(*) FROM (SELECT arabic FROM words GROUP BY arabic HAVING COUNT(*) > 1)"
+    ).fetchone()[0]
+    if homographs:
+        print(f"Kept {homographs} Arabic spellings shared by words with different meanings")
+
+    conn.execute(
+        "UPDATE groups SET word_count = (SELECT COUNT(*) FROM words_groups WHERE group_id = groups.id)"
+    )
+
+    for statement in CREATE_TRIGGERS:
+        conn.execute(statement)
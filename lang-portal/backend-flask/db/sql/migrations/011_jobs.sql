@@ -0,0 +1,21 @@
+-- Background maintenance jobs (resets, reseeds, reindexing, rollup rebuilds) run by
+-- the in-process runner in db/lib/jobs.py. State lives here so progress can be
+-- polled from any worker and survives a restart.
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    params JSON,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    progress INTEGER NOT NULL DEFAULT 0,  -- Rows or steps done so far
+    total INTEGER,  -- Rows or steps expected, when known
+    message TEXT,  -- Current step
+    result JSON,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME,
+    finished_at DATETIME,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP  -- Heartbeat while running
+);
+
+-- The runner claims the oldest queued job
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
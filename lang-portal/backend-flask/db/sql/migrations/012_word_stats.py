@@ -0,0 +1,100 @@
+"""Answer statistics per word across all sessions, kept current by triggers on session_responses.
+
+``attempts`` and ``correct`` count every stored answer to the word and go down
+again when answers are deleted. ``accuracy`` is a rolling accuracy: each new
+answer moves it ROLLING_WEIGHT of the way towards 1 (correct) or 0 (wrong), so
+it reflects how the learner does on the word now rather than since the first
+attempt. accuracy is indexed so /api/words/hardest reads the weakest words
+straight from the index.
+
+As in 009_word_reviews, the trigger and the backfill run the same UPSERT, so
+existing responses are replayed in order with the logic new ones get.
+"""
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS word_stats (
+    word_id INTEGER PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    accuracy REAL NOT NULL,  -- Rolling, between 0 and 1
+    last_seen DATETIME,
+    FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE
+)
+"""
+
+CREATE_INDEX = "CREATE INDEX IF NOT EXISTS idx_word_stats_accuracy ON word_stats(accuracy, word_id)"
+
+# Share of the rolling accuracy that the latest answer decides
+ROLLING_WEIGHT = 0.3
+
+UPSERT_STATS = f"""
+    INSERT INTO word_stats (word_id, attempts, correct, accuracy, last_seen)
+    VALUES (
+        :question_id,
+        1,
+        CASE WHEN :is_correct THEN 1 ELSE 0 END,
+        CASE WHEN :is_correct THEN 1.0 ELSE 0.0 END,
+        :created_at
+    )
+    ON CONFLICT(word_id) DO UPDATE SET
+        attempts = attempts + 1,
+        correct = correct + excluded.correct,
+        accuracy = accuracy + {ROLLING_WEIGHT} * (excluded.accuracy - accuracy),
+        last_seen = MAX(COALESCE(last_seen, excluded.last_seen), excluded.last_seen)
+"""
+
+CREATE_INSERT_TRIGGER = f"""
+CREATE TRIGGER IF NOT EXISTS trg_word_stats_response_insert
+AFTER INSERT ON session_responses
+WHEN EXISTS (SELECT 1 FROM words WHERE id = NEW.question_id)
+BEGIN
+    {UPSERT_STATS.replace(":question_id", "NEW.question_id")
+                 .replace(":is_correct", "NEW.is_correct")
+                 .replace(":created_at", "NEW.created_at")};
+END
+"""
+
+# Counts follow deleted answers; the rolling accuracy keeps what it has seen
+CREATE_DELETE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_word_stats_response_delete
+AFTER DELETE ON session_responses
+BEGIN
+    UPDATE word_stats SET
+        attempts = attempts - 1,
+        correct = correct - (CASE WHEN OLD.is_correct = 1 THEN 1 ELSE 0 END)
+    WHERE word_id = OLD.question_id;
+
+    DELETE FROM word_stats WHERE word_id = OLD.question_id AND attempts <= 0;
+END
+"""
+
+CREATE_WORD_DELETE_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_word_stats_word_delete
+AFTER DELETE ON words
+BEGIN
+    DELETE FROM word_stats WHERE word_id = OLD.id;
+END
+"""
+
+
+def upgrade(conn):
+    conn.execute(CREATE_TABLE)
+
+    responses = conn.execute(
+        """
+        SELECT sr.question_id, sr.is_correct, sr.created_at
+        FROM session_responses sr
+        JOIN words w ON w.id = sr.question_id
+        ORDER BY sr.created_at, sr.id
+        """
+    )
+    conn.executemany(
+        UPSERT_STATS,
+        ({"question_id": q, "is_correct": c, "created_at": t} for q, c, t in responses),
+    )
+
+    # Built after the backfill, in one pass over the finished table
+    conn.execute(CREATE_INDEX)
+    conn.execute(CREATE_INSERT_TRIGGER)
+    conn.execute(CREATE_DELETE_TRIGGER)
+    conn.execute(CREATE_WORD_DELETE_TRIGGER)
@@ -0,0 +1,5 @@
+-- A word's answers in the order they were given, read when word_stats replays a
+-- word after one of its answers is corrected (014_word_stats_corrections.py).
+-- Its own migration, so the write lock is held only while this index is built.
+CREATE INDEX IF NOT EXISTS idx_session_responses_question_created
+    ON session_responses(question_id, created_at, id);
@@ -0,0 +1,69 @@
+"""Keep word_stats current when a stored answer is corrected.
+
+012_word_stats covers answers being recorded and deleted. Changing an answer's
+is_correct or question_id moves it between the counts like a delete followed by
+an insert. The rolling accuracy depends on the order of every answer to the
+word, so it is replayed from the word's answers, oldest first, with the weight
+012 uses; last_seen is recomputed alongside. Only the words the changed answer
+belonged to before and after are replayed.
+"""
+
+# The share of the rolling accuracy a new answer decides in 012_word_stats
+ROLLING_WEIGHT = 0.3
+
+
+def _replay_accuracy(word_id):
+    """Rolling accuracy over the answers to ``word_id``, as the insert trigger would have left it."""
+    return f"""(
+        WITH RECURSIVE answers AS (
+            SELECT CASE WHEN is_correct = 1 THEN 1.0 ELSE 0.0 END AS score,
+                   ROW_NUMBER() OVER (ORDER BY created_at, id) AS n
+            FROM session_responses WHERE question_id = {word_id}
+        ),
+        rolling (n, accuracy) AS (
+            SELECT n, score FROM answers WHERE n = 1
+            UNION ALL
+            SELECT a.n, r.accuracy + {ROLLING_WEIGHT} * (a.score - r.accuracy)
+            FROM rolling r JOIN answers a ON a.n = r.n + 1
+        )
+        SELECT accuracy FROM rolling ORDER BY n DESC LIMIT 1
+    )"""
+
+
+def _replay(word_id):
+    return f"""
+    UPDATE word_stats SET
+        accuracy = {_replay_accuracy(word_id)},
+        last_seen = (SELECT MAX(created_at) FROM session_responses WHERE question_id = {word_id})
+    WHERE word_id = {word_id}
+    """
+
+
+CREATE_UPDATE_TRIGGER = f"""
+CREATE TRIGGER IF NOT EXISTS trg_word_stats_response_update
+AFTER UPDATE OF question_id, is_correct ON session_responses
+BEGIN
+    -- Take the old version of the answer out of its word's counts...
+    UPDATE word_stats SET
+        attempts = attempts - 1,
+        correct = correct - (CASE WHEN OLD.is_correct = 1 THEN 1 ELSE 0 END)
+    WHERE word_id = OLD.question_id;
+
+    -- ...and add the new version back in, if it is for a stored word
+    INSERT INTO word_stats (word_id, attempts, correct, accuracy, last_seen)
+    SELECT NEW.question_id, 1, CASE WHEN NEW.is_correct = 1 THEN 1 ELSE 0 END, 0.0, NEW.created_at
+    WHERE EXISTS (SELECT 1 FROM words WHERE id = NEW.question_id)
+    ON CONFLICT(word_id) DO UPDATE SET
+        attempts = attempts + 1,
+        correct = correct + excluded.correct;
+
+    DELETE FROM word_stats WHERE word_id = OLD.question_id AND attempts <= 0;
+
+    {_replay("OLD.question_id")};
+    {_replay("NEW.question_id")};
+END
+"""
+
+
+def upgrade(conn):
+    conn.execute(CREATE_UPDATE_TRIGGER)
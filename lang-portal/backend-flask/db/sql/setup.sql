@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS words (
   english TEXT NOT NULL,
   example JSON, -- Explanation of the word in English 
   group_id INTEGER NOT NULL,
+  pronunciation_audio TEXT,  -- Optional: link to an audio file
   FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE
 );
 
@@ -38,6 +39,7 @@ CREATE TABLE IF NOT EXISTS study_sessions (
     start_time DATETIME DEFAULT CURRENT_TIMESTAMP,
     end_time DATETIME,
     notes TEXT,  -- Added from migration script
+    active_time_seconds INTEGER DEFAULT 0,  -- Maintained as responses are recorded
     FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE,
     FOREIGN KEY (study_activity_id) REFERENCES study_activities(id) ON DELETE CASCADE
 );
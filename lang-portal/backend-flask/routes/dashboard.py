@@ -0,0 +1,39 @@
+from flask import Blueprint, jsonify, request
+from db.lib import queries
+from db.lib.db import get_db
+
+dashboard_bp = Blueprint("dashboard", __name__)
+
+# Sections of the dashboard response and the query behind each one
+SECTIONS = {
+    "latest_session": queries.latest_session,
+    "stats": lambda db: queries.session_stats(db, request.args.get("date_from"), request.args.get("date_to")),
+    "groups": queries.all_groups,
+    "study_activities": queries.all_study_activities,
+    "word_count": queries.word_count,
+}
+
+
+# GET /api/dashboard?include=&date_from=&date_to= → Everything the dashboard page shows
+@dashboard_bp.route("/dashboard", methods=["GET"])
+def get_dashboard():
+    """Latest session, session stats, groups, study activities and the word count in one response.
+
+    The sections are the same data as /study-sessions/latest, /study-sessions/stats,
+    /groups and /study-activities, read over one connection inside one read
+    transaction so they all describe the same state of the database.
+    ``include`` is a comma-separated subset of the sections (default: all).
+    """
+    names = [n.strip() for n in request.args.get("include", "").split(",") if n.strip()] or list(SECTIONS)
+    unknown = [n for n in names if n not in SECTIONS]
+    if unknown:
+        return jsonify({"error": f"Unknown sections: {', '.join(unknown)}. Choose from {', '.join(SECTIONS)}"}), 400
+
+    db = get_db()
+    db.execute("BEGIN")
+    try:
+        dashboard = {name: SECTIONS[name](db) for name in names}
+    finally:
+        db.rollback()
+
+    return jsonify(dashboard), 200
@@ -0,0 +1,32 @@
+from flask import Blueprint, current_app, jsonify, request
+from db.lib.cache import response_cache, search_cache
+from db.lib.db import pool_stats
+from db.lib.journal import journal_stats
+from db.lib.metrics import sql_metrics
+
+debug_bp = Blueprint("debug", __name__)
+
+
+@debug_bp.route("/_debug/metrics", methods=["GET"])
+def get_metrics():
+    """SQL, connection pool, response cache and response journal statistics for this process.
+
+    Only served in debug/testing mode or when ``DEBUG_METRICS`` is set, since
+    it exposes the text of the statements the app runs.
+    """
+    if not (current_app.debug or current_app.testing or current_app.config.get("DEBUG_METRICS")):
+        return jsonify({"error": "Metrics are disabled"}), 404
+
+    try:
+        top = int(request.args.get("top", 20))
+    except ValueError:
+        return jsonify({"error": "top must be an integer"}), 400
+
+    return jsonify({
+        "sql": sql_metrics.snapshot(top=top),
+        "slow_query_ms": current_app.config["SLOW_QUERY_MS"],
+        "pools": pool_stats(),
+        "response_cache": response_cache.stats(),
+        "search_cache": search_cache.stats(),
+        "journals": journal_stats(),
+    })
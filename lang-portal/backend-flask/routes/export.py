@@ -0,0 +1,72 @@
+import json
+import zlib
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from db.lib.snapshot import get_analytics_db
+
+export_bp = Blueprint("export", __name__)
+
+# Rows pulled from the cursor per round trip while streaming
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_QUERIES = {
+    "words": "SELECT * FROM words ORDER BY id",
+    "study-sessions": "SELECT * FROM study_sessions ORDER BY id",
+    "session-responses": "SELECT * FROM session_responses ORDER BY id",
+}
+
+
+def _ndjson_lines(db, query):
+    """Yield one JSON document per row, reading the cursor in fixed-size batches."""
+    # Hold a read transaction so the export is a consistent snapshot
+    db.execute("BEGIN")
+    try:
+        cursor = db.execute(query)
+        columns = [col[0] for col in cursor.description]
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows
+            ).encode("utf-8")
+    finally:
+        db.rollback()
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# GET /api/export/<table> → Stream every row of a table as newline-delimited JSON
+# Read from the analytics snapshot when ANALYTICS_SNAPSHOT is on
+# ?gzip=1 downloads a .ndjson.gz file; otherwise gzip is used if the client accepts it
+@export_bp.route("/export/<name>", methods=["GET"])
+def export_table(name):
+    query = EXPORT_QUERIES.get(name)
+    if query is None:
+        return jsonify({"error": f"Unknown export '{name}'", "available": list(EXPORT_QUERIES)}), 404
+
+    as_file = request.args.get("gzip") in ("1", "true")
+    negotiated = not as_file and request.accept_encodings["gzip"] > 0
+
+    body = _ndjson_lines(get_analytics_db(), query)
+    headers = {"Vary": "Accept-Encoding"}
+    filename = f"{name}.ndjson"
+    mimetype = "application/x-ndjson"
+
+    if as_file:
+        body = _gzip(body)
+        filename += ".gz"
+        mimetype = "application/gzip"
+    elif negotiated:
+        body = _gzip(body)
+        headers["Content-Encoding"] = "gzip"
+
+    headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
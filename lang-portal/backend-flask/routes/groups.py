@@ -1,31 +1,45 @@
 from flask import Blueprint, jsonify, request
 from db.lib.db import get_db
+from db.lib.cache import cached_response
+from db.lib import queries
+from db.lib.pagination import fetch_page, page_headers, parse_page_args
+from routes.words import WORD_FIELDS
 
 groups_bp = Blueprint("groups", __name__)
 
 # GET /api/groups → List of all word groups
 @groups_bp.route("/groups", methods=["GET"])
+@cached_response
 def get_all_groups():
-    db = get_db()
-    groups = db.execute("SELECT * FROM groups").fetchall()
-    db.close()
-    return jsonify([dict(group) for group in groups])
+    return jsonify(queries.all_groups(get_db()))
 
 # GET /api/groups/<int:id> → Get a specific group by ID
 @groups_bp.route("/groups/<int:id>", methods=["GET"])
+@cached_response
 def get_group(id):
     db = get_db()
     group = db.execute("SELECT * FROM groups WHERE id = ?", (id,)).fetchone()
-    db.close()
     return jsonify(dict(group)) if group else ("Not Found", 404)
 
 # GET /api/groups/<int:id>/words → Get all words belonging to a specific group
+# Supports the same limit/after/fields parameters as /api/words
 @groups_bp.route("/groups/<int:id>/words", methods=["GET"])
+@cached_response
 def get_group_words(id):
+    try:
+        limit, after, select_list = parse_page_args(WORD_FIELDS, alias="w")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     db = get_db()
-    words = db.execute("SELECT * FROM words WHERE group_id = ?", (id,)).fetchall()
-    db.close()
-    return jsonify([dict(word) for word in words])
+    # Membership lives in words_groups; its (group_id, word_id) index yields the page in order
+    words, next_cursor = fetch_page(
+        db, select_list, "words_groups wg JOIN words w ON w.id = wg.word_id",
+        "wg.group_id = ?", (id,), after, limit, key="wg.word_id",
+    )
+    group = db.execute("SELECT word_count FROM groups WHERE id = ?", (id,)).fetchone()
+    total = group["word_count"] if group else 0
+    return jsonify(words), 200, page_headers(total, next_cursor, limit)
 
 
 @groups_bp.route("/groups/<int:id>/study_sessions", methods=["GET"])
@@ -0,0 +1,52 @@
+from flask import Blueprint, jsonify, request, url_for
+from db.lib.db import get_db
+from db.lib.jobs import JOB_COLUMNS, enqueue, get_job, job_to_dict
+
+jobs_bp = Blueprint("jobs", __name__)
+
+DEFAULT_JOB_LIST_SIZE = 20
+MAX_JOB_LIST_SIZE = 100
+
+
+def accepted(job_id, message):
+    """202 response pointing at the job's status URL."""
+    status_url = url_for("jobs.get_job_status", job_id=job_id)
+    return jsonify({"message": message, "job_id": job_id, "status_url": status_url}), 202, {"Location": status_url}
+
+
+# POST /api/jobs → Queue a maintenance job: {"type": "reindex", "params": {...}}
+@jobs_bp.route("/jobs", methods=["POST"])
+def create_job():
+    data = request.get_json(silent=True) or {}
+    job_type = data.get("type")
+    params = data.get("params") or {}
+    if not isinstance(params, dict):
+        return jsonify({"error": "params must be an object"}), 400
+
+    try:
+        job_id = enqueue(get_db(), job_type, params)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return accepted(job_id, f"Job '{job_type}' queued")
+
+
+# GET /api/jobs → Most recent jobs first
+@jobs_bp.route("/jobs", methods=["GET"])
+def list_jobs():
+    try:
+        limit = int(request.args.get("limit", DEFAULT_JOB_LIST_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_JOB_LIST_SIZE))
+
+    jobs = get_db().execute(f"SELECT {JOB_COLUMNS} FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    return jsonify([job_to_dict(job) for job in jobs])
+
+
+# GET /api/jobs/<id> → Status and progress of one job
+@jobs_bp.route("/jobs/<int:job_id>", methods=["GET"])
+def get_job_status(job_id):
+    job = get_job(get_db(), job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job_to_dict(job))
@@ -0,0 +1,42 @@
+from datetime import date
+
+from flask import Blueprint, jsonify, request
+from db.lib.db import get_db
+
+reviews_bp = Blueprint("reviews", __name__)
+
+DEFAULT_QUEUE_SIZE = 20
+MAX_QUEUE_SIZE = 200
+
+
+# GET /api/review-queue?limit=&date= → Words due for review, most overdue first
+@reviews_bp.route("/review-queue", methods=["GET"])
+def get_review_queue():
+    """Words whose spaced-repetition due date is on or before ``date`` (default: today, UTC).
+
+    word_reviews is updated by a trigger whenever a response is recorded, and
+    the queue is a range read of its due-date index.
+    """
+    try:
+        limit = int(request.args.get("limit", DEFAULT_QUEUE_SIZE))
+        due_by = date.fromisoformat(request.args["date"]).isoformat() if "date" in request.args else None
+    except ValueError:
+        return jsonify({"error": "limit must be an integer and date must be YYYY-MM-DD"}), 400
+    limit = max(1, min(limit, MAX_QUEUE_SIZE))
+
+    db = get_db()
+    words = db.execute(
+        """
+        SELECT w.id, w.arabic, w.romanized, w.english, w.group_id,
+               r.due_date, r.interval_days, r.ease, r.repetitions, r.lapses,
+               r.review_count, r.last_reviewed_at
+        FROM word_reviews r
+        CROSS JOIN words w  -- Keeps word_reviews as the outer loop, read in due-date order
+        WHERE w.id = r.word_id
+          AND r.due_date <= COALESCE(?, date('now'))
+        ORDER BY r.due_date, r.word_id
+        LIMIT ?
+        """,
+        (due_by, limit),
+    ).fetchall()
+    return jsonify(words)
@@ -1,23 +1,23 @@
 from flask import Blueprint, jsonify, request
+from db.lib import queries
 from db.lib.db import get_db
+from db.lib.cache import cached_response
 
 study_activities_bp = Blueprint("study_activities", __name__)
 
 @study_activities_bp.route("/study-activities", methods=["GET"])
+@cached_response
 def get_all_study_activities():
-    db = get_db()
-    activities = db.execute("SELECT * FROM study_activities").fetchall()
-    db.close()
-    return jsonify([dict(activity) for activity in activities])
+    return jsonify(queries.all_study_activities(get_db()))
 
 
 @study_activities_bp.route("/study-activities/<int:id>", methods=["GET"])
+@cached_response
 def get_study_activity(id):
     db = get_db()
     activity = db.execute(
         "SELECT * FROM study_activities WHERE id = ?", (id,)
     ).fetchone()
-    db.close()
     return jsonify(dict(activity)) if activity else ("Not Found", 404)
 
 
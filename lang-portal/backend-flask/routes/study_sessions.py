@@ -1,68 +1,94 @@
 from flask import Blueprint, jsonify, request
+from db.lib import queries
 from db.lib.db import get_db
+from db.lib.jobs import enqueue
+from db.lib.journal import flush_journal, get_journal
+from db.lib.pagination import page_headers
+from db.lib.snapshot import get_analytics_db
+from db.lib.sessions import (
+    existing_client_ids,
+    insert_responses,
+    refresh_active_time,
+    validate_response,
+)
+from routes.jobs import accepted
 
 study_sessions_bp = Blueprint("study_sessions", __name__)
 
+DEFAULT_SESSION_PAGE_SIZE = 50
+MAX_SESSION_PAGE_SIZE = 500
 
+
+# GET /api/study-sessions?limit=&after=&include=counts → Most recent sessions first, one page at a time
 @study_sessions_bp.route("/study-sessions", methods=["GET"])
 def get_all_study_sessions():
-    """Retrieve all study sessions with optional filters."""
-    db = get_db()
-    cursor = db.cursor()
+    """Retrieve study sessions with optional filters, newest first.
+
+    Sessions are paged by ``(start_time, id)``: ``after`` is the id of the last
+    session of the previous page and ``limit`` the page size. Each page is read
+    straight off an index, so it costs the same however many sessions there
+    are. ``include=counts`` wraps the page as ``{"sessions", "counts"}`` with
+    the number of sessions matching all filters and each filter on its own.
+    """
+    limit = request.args.get("limit", str(DEFAULT_SESSION_PAGE_SIZE))
+    if not (limit.isascii() and limit.isdecimal()) or int(limit) < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    limit = min(int(limit), MAX_SESSION_PAGE_SIZE)
 
-    # Get optional query parameters
-    group_id = request.args.get("group_id")
-    study_activity_id = request.args.get("study_activity_id")
-    activity_type = request.args.get("activity_type")
-    date_from = request.args.get("date_from")
-    date_to = request.args.get("date_to")
+    after = request.args.get("after")
+    if after is not None and not (after.isascii() and after.isdecimal()):
+        return jsonify({"error": "after must be a session id"}), 400
 
-    # Build the query dynamically based on provided filters
-    query = """
+    include = {n.strip() for n in request.args.get("include", "").split(",") if n.strip()}
+    if include - {"counts"}:
+        return jsonify({"error": "include only accepts 'counts'"}), 400
+
+    db = get_db()
+    filters = queries.session_filters(request.args)
+    conditions = [condition for condition, _ in filters.values()]
+    params = [param for _, filter_params in filters.values() for param in filter_params]
+
+    if after is not None:
+        cursor_row = db.execute("SELECT start_time, id FROM study_sessions WHERE id = ?", (after,)).fetchone()
+        if cursor_row is None:
+            return jsonify({"error": f"Session {after} not found; restart from the first page"}), 400
+        conditions.append("(ss.start_time, ss.id) < (?, ?)")
+        params.extend(cursor_row)
+
+    where = " AND ".join(conditions) or "1=1"
+    # CROSS JOIN keeps study_sessions as the outer loop, so the page is read in
+    # index order and the scan stops after limit + 1 rows
+    sessions = db.execute(
+        f"""
         SELECT ss.id,
                ss.group_id,
                ss.study_activity_id,
                ss.start_time,
                ss.end_time,
                ss.active_time_seconds,
-               g.name as group_name, 
-               sa.name as activity_name, 
+               g.name as group_name,
+               sa.name as activity_name,
                sa.type as activity_type
         FROM study_sessions ss
-        JOIN groups g ON ss.group_id = g.id
-        JOIN study_activities sa ON ss.study_activity_id = sa.id
-        WHERE 1=1
-    """
-    params = []
-
-    if group_id:
-        query += " AND ss.group_id = ?"
-        params.append(group_id)
-
-    if study_activity_id:
-        query += " AND ss.study_activity_id = ?"
-        params.append(study_activity_id)
-
-    if activity_type:
-        query += " AND sa.type = ?"
-        params.append(activity_type)
-
-    if date_from:
-        query += " AND ss.start_time >= ?"
-        params.append(date_from)
-
-    if date_to:
-        query += " AND ss.start_time <= ?"
-        params.append(date_to)
+        CROSS JOIN groups g ON ss.group_id = g.id
+        CROSS JOIN study_activities sa ON ss.study_activity_id = sa.id
+        WHERE {where}
+        ORDER BY ss.start_time DESC, ss.id DESC
+        LIMIT ?
+        """,
+        params + [limit + 1],
+    ).fetchall()
 
-    # Add ordering to get most recent first
-    query += " ORDER BY ss.start_time DESC"
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        next_cursor = sessions[-1]["id"]
 
-    cursor.execute(query, params)
-    sessions = cursor.fetchall()
+    if "counts" not in include:
+        return jsonify(sessions), 200, page_headers(None, next_cursor, limit)
 
-    db.close()
-    return jsonify([dict(session) for session in sessions])
+    counts = queries.session_counts(db, filters)
+    return jsonify({"sessions": sessions, "counts": counts}), 200, page_headers(counts["total"], next_cursor, limit)
 
 
 @study_sessions_bp.route("/study-sessions/<int:session_id>", methods=["GET", "OPTIONS"])
@@ -87,19 +113,16 @@ def get_study_session(session_id):
     session = cursor.execute(query, (session_id,)).fetchone()
 
     if not session:
-        db.close()
         return jsonify({"error": "Study session not found"}), 404
 
     # For quiz and game type activities, get the performance data if available
     session_dict = dict(session)
 
     if session["activity_type"] in ["quiz", "game"]:
-        # Get performance data
+        # Get performance data from the summary maintained by session_responses triggers
         performance_query = """
-            SELECT 
-                COUNT(*) as total_questions,
-                SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct_answers
-            FROM session_responses
+            SELECT total_questions, correct_answers
+            FROM session_scores
             WHERE session_id = ?
         """
         performance = cursor.execute(performance_query, (session_id,)).fetchone()
@@ -112,7 +135,6 @@ def get_study_session(session_id):
             session_dict["total_questions"] = total
             session_dict["correct_answers"] = correct
 
-    db.close()
     return jsonify(session_dict), 200
 
 
@@ -128,7 +150,6 @@ def get_session_responses(session_id):
     ).fetchone()
 
     if not session:
-        db.close()
         return jsonify({"error": "Session not found"}), 404
 
     # Get all responses with question details
@@ -151,149 +172,24 @@ def get_session_responses(session_id):
         (session_id,),
     ).fetchall()
 
-    db.close()
-    return jsonify([dict(r) for r in responses]), 200
+    return jsonify(responses), 200
 
 
 @study_sessions_bp.route("/study-sessions/latest", methods=["GET"])
 def get_latest_study_session():
     """Fetch details of the latest study session."""
-    db = get_db()
-    cursor = db.cursor()
-
-    latest_session = cursor.execute(
-        """
-        SELECT ss.id, g.name AS group_name, sa.name AS activity_name,
-               sa.type AS activity_type, ss.start_time, ss.end_time 
-        FROM study_sessions ss
-        JOIN groups g ON ss.group_id = g.id
-        JOIN study_activities sa ON ss.study_activity_id = sa.id
-        ORDER BY ss.start_time DESC 
-        LIMIT 1
-        """
-    ).fetchone()
-
-    db.close()
+    latest_session = queries.latest_session(get_db())
 
     if latest_session:
-        return jsonify(dict(latest_session)), 200
+        return jsonify(latest_session), 200
     else:
         return jsonify({"error": "No study sessions found"}), 404
 
 
 @study_sessions_bp.route("/study-sessions/stats", methods=["GET"])
 def get_session_stats():
-    """Get aggregated statistics about study sessions."""
-    db = get_db()
-    cursor = db.cursor()
-
-    # Get time range filter if provided
-    date_from = request.args.get("date_from")
-    date_to = request.args.get("date_to")
-
-    params = []
-    date_condition = "1=1"
-
-    if date_from:
-        date_condition += " AND ss.start_time >= ?"
-        params.append(date_from)
-
-    if date_to:
-        date_condition += " AND ss.start_time <= ?"
-        params.append(date_to)
-
-    # Total sessions and completion stats
-    completion_stats = cursor.execute(
-        f"""
-        SELECT
-            COUNT(*) as total_sessions,
-            SUM(CASE WHEN end_time IS NOT NULL THEN 1 ELSE 0 END) as completed_sessions,
-            SUM(
-                CASE WHEN end_time IS NOT NULL 
-                THEN CAST((julianday(end_time) - julianday(start_time)) * 24 * 60 AS INTEGER)
-                ELSE 0 END
-            ) as total_minutes
-        FROM study_sessions ss
-        WHERE {date_condition}
-        """,
-        params,
-    ).fetchone()
-
-    # Sessions by activity type
-    type_params = params.copy()
-    activity_types = cursor.execute(
-        f"""
-        SELECT
-            sa.type as activity_type,
-            COUNT(*) as session_count
-        FROM study_sessions ss
-        JOIN study_activities sa ON ss.study_activity_id = sa.id
-        WHERE {date_condition}
-        GROUP BY sa.type
-        ORDER BY session_count DESC
-        """,
-        type_params,
-    ).fetchall()
-
-    # Get average scores for quiz/game activities
-    score_params = params.copy()
-    scores = cursor.execute(
-        f"""
-        SELECT
-            sa.type as activity_type,
-            AVG(
-                CASE WHEN sr.total_questions > 0 
-                THEN (sr.correct_answers * 100.0 / sr.total_questions)
-                ELSE 0 END
-            ) as average_score
-        FROM study_sessions ss
-        JOIN study_activities sa ON ss.study_activity_id = sa.id
-        LEFT JOIN (
-            SELECT 
-                session_id,
-                COUNT(*) as total_questions,
-                SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct_answers
-            FROM session_responses
-            GROUP BY session_id
-        ) sr ON ss.id = sr.session_id
-        WHERE {date_condition} AND sa.type IN ('quiz', 'game')
-        GROUP BY sa.type
-        """,
-        score_params,
-    ).fetchall()
-
-    # Track daily activity
-    daily_params = params.copy()
-    daily_activity = cursor.execute(
-        f"""
-        SELECT
-            date(ss.start_time) as study_date,
-            COUNT(*) as session_count,
-            SUM(
-                CASE WHEN end_time IS NOT NULL 
-                THEN CAST((julianday(end_time) - julianday(start_time)) * 24 * 60 AS INTEGER)
-                ELSE 0 END
-            ) as minutes_studied
-        FROM study_sessions ss
-        WHERE {date_condition}
-        GROUP BY date(ss.start_time)
-        ORDER BY study_date DESC
-        LIMIT 30
-        """,
-        daily_params,
-    ).fetchall()
-
-    db.close()
-
-    stats = {
-        "total_sessions": completion_stats["total_sessions"],
-        "completed_sessions": completion_stats["completed_sessions"],
-        "total_minutes": completion_stats["total_minutes"],
-        "activity_types": [dict(t) for t in activity_types],
-        "average_scores": [dict(s) for s in scores],
-        "daily_activity": [dict(d) for d in daily_activity],
-    }
-
+    """Get aggregated statistics about study sessions (from the analytics snapshot when enabled)."""
+    stats = queries.session_stats(get_analytics_db(), request.args.get("date_from"), request.args.get("date_to"))
     return jsonify(stats), 200
 
 
@@ -305,7 +201,6 @@ def start_study_session():
         cursor = db.cursor()
 
         data = request.get_json()
-        print(f"Received data: {data}")
 
         group_id = data.get("group_id")
         study_activity_id = data.get("study_activity_id")
@@ -350,16 +245,17 @@ def start_study_session():
         if not session:
             return jsonify({"error": "Failed to create session"}), 500
 
-        db.close()
         return jsonify(dict(session)), 201  # 201 Created
 
     except Exception as e:
         print(f"Error in start_study_session: {str(e)}")
-        if 'db' in locals():
-            db.close()
         return jsonify({"error": str(e)}), 500
 
 
+# Largest number of responses accepted in one batch request
+MAX_BATCH_RESPONSES = 5000
+
+
 @study_sessions_bp.route("/study-sessions/<int:session_id>", methods=["PATCH"])
 def complete_study_session(session_id):
     """Mark a study session as completed by updating the end_time."""
@@ -371,89 +267,37 @@ def complete_study_session(session_id):
         "SELECT * FROM study_sessions WHERE id = ?", (session_id,)
     ).fetchone()
     if not session:
-        db.close()
         return jsonify({"error": "Study session not found"}), 404
 
     # Get optional performance data if provided
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
+    responses = data.get("responses") or []
+    if not isinstance(responses, list):
+        return jsonify({"error": "responses must be a list"}), 400
+    if len(responses) > MAX_BATCH_RESPONSES:
+        return jsonify({"error": f"At most {MAX_BATCH_RESPONSES} responses per batch"}), 413
+    for index, response in enumerate(responses):
+        error = validate_response(response)
+        if error:
+            return jsonify({"error": f"responses[{index}]: {error}"}), 400
+
+    # Answers sent through responses:append may still be waiting in a journal,
+    # this worker's or another's
+    flush_journal(session_id=session_id)
 
     # If this was a quiz or game, save the performance data first
-    if data.get("responses"):
-        for response in data["responses"]:
-            cursor.execute(
-                """
-                INSERT INTO session_responses 
-                (session_id, question_id, user_response, is_correct, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    response["question_id"],
-                    response["user_response"],
-                    1 if response["is_correct"] else 0,
-                    response["timestamp"],
-                ),
-            )
-
-    # Now get all responses including the ones we just inserted
-    responses = cursor.execute(
-        """
-        SELECT created_at
-        FROM session_responses
-        WHERE session_id = ?
-        ORDER BY created_at
-        """,
-        (session_id,)
-    ).fetchall()
-
-    # Calculate total active time
-    active_time = 0
     if responses:
-        # Get session start time
-        session_start = cursor.execute(
-            "SELECT start_time FROM study_sessions WHERE id = ?",
-            (session_id,)
-        ).fetchone()[0]
-
-        print(f"Session {session_id} start time: {session_start}")
-        print(f"Found {len(responses)} responses")
-
-        # Add time from session start to first response
-        first_response_time = responses[0]['created_at']
-        start_to_first = int((cursor.execute(
-            "SELECT CAST((julianday(?) - julianday(?)) * 86400 AS INTEGER)",
-            (first_response_time, session_start)
-        ).fetchone() or (0,))[0])
-        active_time += start_to_first
-        print(f"Time from start to first response: {start_to_first} seconds")
-
-        # Add time between responses
-        for i in range(1, len(responses)):
-            prev_time = responses[i-1]['created_at']
-            curr_time = responses[i]['created_at']
-            time_diff = int((cursor.execute(
-                "SELECT CAST((julianday(?) - julianday(?)) * 86400 AS INTEGER)",
-                (curr_time, prev_time)
-            ).fetchone() or (0,))[0])
-            active_time += time_diff
-            print(f"Time between responses {i-1} and {i}: {time_diff} seconds")
-
-    print(f"Total active time for session {session_id}: {active_time} seconds")
-
-    # Update session with end time and active time
+        insert_responses(cursor, session_id, responses)
+
+    # Recompute active time in one pass over the responses, then close the session
+    refresh_active_time(cursor, session_id)
+
     cursor.execute(
-        """
-        UPDATE study_sessions 
-        SET end_time = CURRENT_TIMESTAMP,
-            active_time_seconds = ?
-        WHERE id = ?
-        """,
-        (active_time, session_id)
+        "UPDATE study_sessions SET end_time = CURRENT_TIMESTAMP WHERE id = ?",
+        (session_id,),
     )
-    
-    # Make sure to commit the changes
-    db.commit()
 
+    # Make sure to commit the changes
     db.commit()
 
     # Fetch updated session with additional data
@@ -474,10 +318,8 @@ def complete_study_session(session_id):
     if updated_session["activity_type"] in ["quiz", "game"]:
         performance = cursor.execute(
             """
-            SELECT 
-                COUNT(*) as total_questions,
-                SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct_answers
-            FROM session_responses
+            SELECT total_questions, correct_answers
+            FROM session_scores
             WHERE session_id = ?
             """,
             (session_id,),
@@ -491,11 +333,100 @@ def complete_study_session(session_id):
             session_dict["total_questions"] = total
             session_dict["correct_answers"] = correct
 
-    db.close()
-
     return jsonify(session_dict), 200
 
 
+@study_sessions_bp.route("/study-sessions/<int:session_id>/responses:batch", methods=["POST"])
+def add_session_responses_batch(session_id):
+    """Record many responses for a session in one transaction.
+
+    Each response may carry a client-generated ``client_response_id``; responses
+    already stored under that id are reported as duplicates instead of being
+    inserted again, so clients can safely retry a failed upload.
+    """
+    data = request.get_json(silent=True) or {}
+    responses = data.get("responses")
+
+    if not isinstance(responses, list) or not responses:
+        return jsonify({"error": "responses must be a non-empty list"}), 400
+    if len(responses) > MAX_BATCH_RESPONSES:
+        return jsonify({"error": f"At most {MAX_BATCH_RESPONSES} responses per batch"}), 413
+
+    db = get_db()
+    cursor = db.cursor()
+
+    session = cursor.execute(
+        "SELECT id FROM study_sessions WHERE id = ?", (session_id,)
+    ).fetchone()
+    if not session:
+        return jsonify({"error": "Study session not found"}), 404
+
+    results = [None] * len(responses)
+    valid = []
+    for index, response in enumerate(responses):
+        error = validate_response(response)
+        if error:
+            results[index] = {"index": index, "status": "invalid", "error": error}
+        else:
+            valid.append((index, response))
+
+    client_ids = {r["client_response_id"] for _, r in valid if r.get("client_response_id")}
+
+    with db:  # Commit once for the whole batch, or roll everything back on error
+        seen = existing_client_ids(cursor, session_id, client_ids)
+        to_insert = []
+        for index, response in valid:
+            client_id = response.get("client_response_id")
+            if client_id and client_id in seen:
+                status = "duplicate"
+            else:
+                status = "created"
+                to_insert.append(response)
+                if client_id:
+                    seen.add(client_id)  # Also dedupes repeats within this payload
+            results[index] = {"index": index, "client_response_id": client_id, "status": status}
+
+        if to_insert:
+            insert_responses(cursor, session_id, to_insert)
+            refresh_active_time(cursor, session_id)
+
+    summary = {status: 0 for status in ("created", "duplicate", "invalid")}
+    for result in results:
+        summary[result["status"]] += 1
+
+    return jsonify({"session_id": session_id, **summary, "results": results}), 200
+
+
+@study_sessions_bp.route("/study-sessions/<int:session_id>/responses:append", methods=["POST"])
+def append_session_responses(session_id):
+    """Record answers as they happen, without waiting for a database commit.
+
+    The answers go to the response journal (see db.lib.journal). They are
+    committed together with other waiting answers within ``JOURNAL_FLUSH_MS``,
+    and completing the session commits them straight away. Responses without
+    a ``client_response_id`` get one, which is returned so the client can
+    retry through responses:batch.
+    """
+    data = request.get_json(silent=True) or {}
+    responses = data.get("responses")
+
+    if not isinstance(responses, list) or not responses:
+        return jsonify({"error": "responses must be a non-empty list"}), 400
+    if len(responses) > MAX_BATCH_RESPONSES:
+        return jsonify({"error": f"At most {MAX_BATCH_RESPONSES} responses per batch"}), 413
+    for index, response in enumerate(responses):
+        error = validate_response(response)
+        if error:
+            return jsonify({"error": f"responses[{index}]: {error}"}), 400
+
+    session = get_db().execute("SELECT id FROM study_sessions WHERE id = ?", (session_id,)).fetchone()
+    if not session:
+        return jsonify({"error": "Study session not found"}), 404
+
+    client_ids = get_journal().append(session_id, responses)
+    return jsonify({"session_id": session_id, "accepted": len(client_ids), "client_response_ids": client_ids}), 202
+
+
 @study_sessions_bp.route("/study-sessions/<int:session_id>", methods=["DELETE"])
 def delete_study_session(session_id):
     """Delete a study session by ID."""
@@ -506,7 +437,6 @@ def delete_study_session(session_id):
         "SELECT * FROM study_sessions WHERE id = ?", (session_id,)
     ).fetchone()
     if not session:
-        db.close()
         return jsonify({"error": "Study session not found"}), 404
 
     # Delete related session responses first (foreign key constraint)
@@ -515,38 +445,31 @@ def delete_study_session(session_id):
     # Now delete the session
     cursor.execute("DELETE FROM study_sessions WHERE id = ?", (session_id,))
     db.commit()
-    db.close()
 
     return jsonify({"message": f"Study session {session_id} deleted successfully"}), 200
 
 
 @study_sessions_bp.route("/study-sessions/reset", methods=["POST"])
 def reset_study_sessions():
-    """Reset all study sessions and related data."""
-    try:
-        db = get_db()
-        cursor = db.cursor()
+    """Reset all study sessions and related data.
 
-        # Delete all session responses first (due to foreign key constraints)
-        cursor.execute("DELETE FROM session_responses")
-
-        # Delete all study sessions
-        cursor.execute("DELETE FROM study_sessions")
-
-        db.commit()
-        db.close()
-
-        return jsonify({"message": "Successfully reset all study sessions"}), 200
-
-    except Exception as e:
-        print(f"Error in reset_study_sessions: {str(e)}")
-        if 'db' in locals():
-            db.close()
-        return jsonify({"error": str(e)}), 500
+    The deletes run in batches as a background job (see db.lib.maintenance.reset_sessions),
+    so this returns 202 with the job's status URL straight away.
+    """
+    job_id = enqueue(get_db(), "reset-sessions")
+    return accepted(job_id, "Reset of all study sessions started")
 
 @study_sessions_bp.route("/study-sessions/<int:session_id>/resume", methods=["POST"])
 def resume_study_session(session_id):
-    """Resume an existing study session"""
+    """Resume an existing study session.
+
+    Answers sent through responses:append may still be waiting in a response
+    journal, possibly that of another worker process. They are committed, or
+    waited for up to JOURNAL_WAIT_SECONDS, before the previous responses are read.
+    """
+    # Include answers that are still waiting in the response journal
+    flush_journal(session_id=session_id)
+
     db = get_db()
     cursor = db.cursor()
 
@@ -562,66 +485,17 @@ def resume_study_session(session_id):
     ).fetchone()
 
     if not session:
-        db.close()
         return jsonify({"error": "Session not found or already completed"}), 404
 
-    # Calculate active time for resuming session
-    responses = cursor.execute(
-        """
-        SELECT created_at, is_correct
-        FROM session_responses
-        WHERE session_id = ?
-        ORDER BY created_at
-        """,
-        (session_id,)
-    ).fetchall()
-
-    active_time = 0
-    if responses:
-        # Get session start time
-        session_start = cursor.execute(
-            "SELECT start_time FROM study_sessions WHERE id = ?",
-            (session_id,)
-        ).fetchone()[0]
-
-        # Add time from session start to first response
-        first_response_time = responses[0]['created_at']
-        active_time += int((cursor.execute(
-            "SELECT CAST((julianday(?) - julianday(?)) * 86400 AS INTEGER)",
-            (first_response_time, session_start)
-        ).fetchone() or (0,))[0])
-
-        # Add time between responses
-        for i in range(1, len(responses)):
-            prev_time = responses[i-1]['created_at']
-            curr_time = responses[i]['created_at']
-            time_diff = int((cursor.execute(
-                "SELECT CAST((julianday(?) - julianday(?)) * 86400 AS INTEGER)",
-                (curr_time, prev_time)
-            ).fetchone() or (0,))[0])
-            active_time += time_diff
-
-    print(f"Calculated active time for resumed session {session_id}: {active_time} seconds")
-
-    # Update session with active time
-    cursor.execute(
-        """
-        UPDATE study_sessions 
-        SET active_time_seconds = ?
-        WHERE id = ?
-        """,
-        (active_time, session_id)
-    )
-    db.commit()
-
-    # Return session details along with activity type
+    # Return session details along with activity type. active_time_seconds is kept
+    # current whenever responses are recorded, so it is returned as stored.
     session_dict = dict(session)
 
     # For quiz/game activities, get previous responses if any
     if session["activity_type"] in ["quiz", "game"]:
         responses = cursor.execute(
             """
-            SELECT question_id, user_response, is_correct, created_at
+            SELECT question_id, user_response, is_correct, created_at, client_response_id
             FROM session_responses
             WHERE session_id = ?
             ORDER BY created_at
@@ -630,5 +504,4 @@ def resume_study_session(session_id):
         ).fetchall()
         session_dict["previous_responses"] = [dict(r) for r in responses]
 
-    db.close()
     return jsonify(session_dict), 200
@@ -1,19 +1,109 @@
 from flask import Blueprint, jsonify, request
 from db.lib.db import get_db
+from db.lib.cache import cached_response, search_cache
+from db.lib.counters import cached_count
+from db.lib.pagination import fetch_page, page_headers, parse_page_args
+from db.lib.search import build_match_query
 
 words_bp = Blueprint("words", __name__)
 
+WORD_FIELDS = ("id", "arabic", "romanized", "english", "example", "group_id", "pronunciation_audio")
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+DEFAULT_HARDEST_LIMIT = 20
+MAX_HARDEST_LIMIT = 200
+
+# Column weights for bm25 in words_fts column order: arabic, romanized, english, example
+SEARCH_WEIGHTS = (10.0, 5.0, 5.0, 1.0)
+
+
+# GET /api/words?limit=&after=&fields= → Words ordered by id, optionally one page at a time
 @words_bp.route("/words", methods=["GET"])
+@cached_response
 def get_all_words():
+    try:
+        limit, after, select_list = parse_page_args(WORD_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     db = get_db()
-    words = db.execute("SELECT * FROM words").fetchall()
-    db.close()
-    return jsonify([dict(word) for word in words])
+    words, next_cursor = fetch_page(db, select_list, "words", "1=1", (), after, limit)
+    total = cached_count(db, "words", "SELECT COUNT(*) FROM words")
+    return jsonify(words), 200, page_headers(total, next_cursor, limit)
 
 
 @words_bp.route("/words/<int:word_id>", methods=["GET"])
+@cached_response
 def get_word(word_id):
     db = get_db()
     word = db.execute("SELECT * FROM words WHERE id = ?", (word_id,)).fetchone()
-    db.close()
     return jsonify(dict(word)) if word else ("Not Found", 404)
+
+
+# GET /api/words/search?q=&limit= → Best matching words first; every term matches as a prefix
+@words_bp.route("/words/search", methods=["GET"])
+@cached_response(cache=search_cache)
+def search_words():
+    match = build_match_query(request.args.get("q", ""))
+    if match is None:
+        return jsonify({"error": "q must contain at least one letter or digit"}), 400
+    try:
+        limit = int(request.args.get("limit", DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+
+    db = get_db()
+    words = db.execute(
+        f"""
+        SELECT w.id, w.arabic, w.romanized, w.english, w.example, w.group_id,
+               bm25(words_fts, {", ".join(map(str, SEARCH_WEIGHTS))}) AS rank
+        FROM words_fts
+        JOIN words w ON w.id = words_fts.rowid
+        WHERE words_fts MATCH ?
+        ORDER BY rank
+        LIMIT ?
+        """,
+        (match, limit),
+    ).fetchall()
+    return jsonify(words)
+
+
+# GET /api/words/hardest?group_id=&limit=&min_attempts= → Words with the lowest rolling accuracy first
+@words_bp.route("/words/hardest", methods=["GET"])
+def get_hardest_words():
+    """Words the learner gets wrong most, from word_stats.
+
+    word_stats is updated by triggers whenever a response is recorded or
+    deleted, and the list is read in order from its accuracy index; with
+    ``group_id``, membership is checked for each word as the index is walked.
+    ``min_attempts`` (default 1) skips words answered fewer times than that.
+    """
+    try:
+        limit = int(request.args.get("limit", DEFAULT_HARDEST_LIMIT))
+        min_attempts = int(request.args.get("min_attempts", 1))
+        group_id = int(request.args["group_id"]) if "group_id" in request.args else None
+    except ValueError:
+        return jsonify({"error": "limit, min_attempts and group_id must be integers"}), 400
+    limit = max(1, min(limit, MAX_HARDEST_LIMIT))
+
+    db = get_db()
+    words = db.execute(
+        """
+        SELECT w.id, w.arabic, w.romanized, w.english, w.group_id,
+               s.attempts, s.correct, s.accuracy, s.last_seen
+        FROM word_stats s
+        CROSS JOIN words w  -- Keeps word_stats as the outer loop, read in accuracy order
+        WHERE w.id = s.word_id
+          AND s.attempts >= :min_attempts
+          AND (:group_id IS NULL OR EXISTS (
+              SELECT 1 FROM words_groups wg WHERE wg.group_id = :group_id AND wg.word_id = s.word_id
+          ))
+        ORDER BY s.accuracy, s.word_id
+        LIMIT :limit
+        """,
+        {"min_attempts": min_attempts, "group_id": group_id, "limit": limit},
+    ).fetchall()
+    return jsonify(words)
@@ -1,10 +1,51 @@
-from db.schema import init_db
+import argparse
+
+from db.config import DATABASE
+from db.schema import init_db, write_schema_snapshot
 from db.seeds.study_activities import seed_study_activities
 from db.seeds.words import seed_words
 from db.seeds.groups import seed_groups
 
+SEEDERS = {
+    "groups": seed_groups,
+    "study-activities": seed_study_activities,
+    "words": seed_words,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database setup and seeding for lang-portal.")
+    parser.add_argument("--db", default=DATABASE, help="database file (default: db/words.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("init", help="create the tables and apply migrations")
+    commands.add_parser("dump-schema", help="regenerate db/schema.sql from setup.sql and the migrations")
+
+    seed = commands.add_parser("seed", help="load seed data from db/seeds")
+    seed.add_argument("what", nargs="*", metavar="{groups,study-activities,words}",
+                      help="what to seed (default: everything, in dependency order)")
+    seed.add_argument("--force", action="store_true", help="reload word files even if they have not changed")
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        unknown = set(args.what) - set(SEEDERS)
+        if unknown:
+            parser.error(f"unknown seed target(s): {', '.join(sorted(unknown))}")
+        args.what = args.what or list(SEEDERS)
+
+    if args.command == "init":
+        init_db(args.db)
+    elif args.command == "dump-schema":
+        write_schema_snapshot()
+    elif args.command == "seed":
+        for name in SEEDERS:
+            if name not in args.what:
+                continue
+            if name == "words":
+                seed_words(args.db, force=args.force)
+            else:
+                SEEDERS[name](args.db)
+
+
 if __name__ == "__main__":
-    # init_db()
-    seed_study_activities()
-    # seed_words()
-    # seed_groups()
+    main()
@@ -0,0 +1,19 @@
+import pytest
+
+from app import app as flask_app
+from db.lib.db import get_pool
+from db.seeds.synthetic import build_synthetic_db
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("db") / "test.db")
+    build_synthetic_db(path)
+    flask_app.config.update(TESTING=True, DATABASE=path)
+    yield flask_app
+    get_pool(path).close_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
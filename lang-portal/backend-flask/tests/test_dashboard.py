@@ -0,0 +1,40 @@
+import sqlite3
+
+from db.lib import queries
+from routes import dashboard as dashboard_routes
+
+
+def test_dashboard_matches_separate_endpoints(client):
+    dashboard = client.get("/api/dashboard?date_from=2024-03-01&date_to=2024-03-31").get_json()
+
+    assert dashboard["latest_session"] == client.get("/api/study-sessions/latest").get_json()
+    assert dashboard["stats"] == client.get("/api/study-sessions/stats?date_from=2024-03-01&date_to=2024-03-31").get_json()
+    assert dashboard["groups"] == client.get("/api/groups").get_json()
+    assert dashboard["study_activities"] == client.get("/api/study-activities").get_json()
+    assert dashboard["word_count"] > 0
+
+
+def test_dashboard_include(client):
+    assert set(client.get("/api/dashboard?include=groups,word_count").get_json()) == {"groups", "word_count"}
+    assert client.get("/api/dashboard?include=groups,nope").status_code == 400
+
+
+def test_sections_share_one_read_transaction(app, client, monkeypatch):
+    before = client.get("/api/dashboard?include=word_count").get_json()["word_count"]
+    writer = sqlite3.connect(app.config["DATABASE"])
+
+    def groups_then_write(db):
+        groups = queries.all_groups(db)
+        writer.execute("INSERT INTO words (arabic, romanized, english, group_id) VALUES ('قلم', 'qalam', 'pen', 1)")
+        writer.commit()
+        return groups
+
+    monkeypatch.setitem(dashboard_routes.SECTIONS, "groups", groups_then_write)
+    try:
+        # The word added while the dashboard is being read is not counted yet
+        assert client.get("/api/dashboard?include=groups,word_count").get_json()["word_count"] == before
+        assert client.get("/api/dashboard?include=word_count").get_json()["word_count"] == before + 1
+    finally:
+        writer.execute("DELETE FROM words WHERE arabic = 'قلم' AND english = 'pen'")
+        writer.commit()
+        writer.close()
@@ -0,0 +1,132 @@
+import json
+import sqlite3
+import time
+
+import pytest
+
+from app import create_app
+from db.lib.db import get_pool
+from db.lib.maintenance import reset_sessions
+from db.schema import init_db
+from db.seeds.synthetic import build_synthetic_db
+from db.seeds.words import seed_words
+
+
+@pytest.fixture
+def jobs_client(tmp_path):
+    # Jobs rewrite whole tables, so they get a database of their own
+    path = str(tmp_path / "jobs.db")
+    build_synthetic_db(path, words=500, groups=5, sessions=300, responses_per_session=5)
+    app = create_app({"DATABASE": path, "TESTING": True})
+    yield app.test_client()
+    get_pool(path).close_all()
+
+
+def wait_for(client, response, timeout=30):
+    assert response.status_code == 202, response.data
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(response.headers["Location"]).get_json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job did not finish: {job}")
+
+
+def test_reset_runs_as_a_job(jobs_client):
+    stats = jobs_client.get("/api/study-sessions/stats").get_json()
+    assert stats["total_sessions"] == 300
+
+    job = wait_for(jobs_client, jobs_client.post("/api/study-sessions/reset"))
+    assert job["status"] == "succeeded", job["error"]
+    assert job["result"]["sessions_deleted"] == 300
+    assert job["result"]["responses_deleted"] == 1500
+    assert job["progress"] == job["total"]
+
+    assert jobs_client.get("/api/study-sessions/stats").get_json()["total_sessions"] == 0
+    assert jobs_client.get("/api/study-sessions/latest").status_code == 404
+
+
+def test_rebuild_rollups_and_reindex(jobs_client):
+    before = jobs_client.get("/api/study-sessions/stats").get_json()
+    conn = get_pool(jobs_client.application.config["DATABASE"]).acquire()
+    with conn:
+        conn.execute("DELETE FROM daily_activity_rollups")
+        conn.execute("DELETE FROM words_fts")
+
+    job = wait_for(jobs_client, jobs_client.post("/api/jobs", json={"type": "rebuild-rollups"}))
+    assert job["status"] == "succeeded", job["error"]
+    assert jobs_client.get("/api/study-sessions/stats").get_json() == before
+
+    job = wait_for(jobs_client, jobs_client.post("/api/jobs", json={"type": "reindex"}))
+    assert job["result"] == {"words_indexed": 500}
+    assert [w["id"] for w in jobs_client.get("/api/words/search?q=kalima17").get_json()][:1] == [17]
+
+
+def test_unknown_job_type(jobs_client):
+    assert jobs_client.post("/api/jobs", json={"type": "nope"}).status_code == 400
+    assert jobs_client.get("/api/jobs/999").status_code == 404
+
+
+class HookedJob:
+    """Stands in for the runner's Job and runs ``on_start`` at the first progress report."""
+
+    def __init__(self, database, on_start=None):
+        self.database = database
+        self.params = {}
+        self.on_start = on_start
+        self.reports = []
+
+    def report(self, progress, total=None, message=None, conn=None):
+        if not self.reports and self.on_start:
+            self.on_start()
+        self.reports.append((progress, message, conn))
+
+
+def test_reset_keeps_the_reviews_of_newer_sessions(jobs_client):
+    database = jobs_client.application.config["DATABASE"]
+    conn = get_pool(database).acquire()
+    word_id = conn.execute("SELECT question_id FROM session_responses ORDER BY id LIMIT 1").fetchone()[0]
+    other = conn.execute(
+        "SELECT question_id FROM session_responses WHERE question_id <> ? ORDER BY id LIMIT 1", (word_id,)
+    ).fetchone()[0]
+
+    def start_session():
+        # A session started after the reset has taken its snapshot of the session ids
+        session_id = jobs_client.post("/api/study-sessions", json={"group_id": 1, "study_activity_id": 1}).get_json()["id"]
+        answer = {"question_id": word_id, "user_response": "x", "is_correct": True, "timestamp": "2030-01-01 10:00:00"}
+        jobs_client.post(f"/api/study-sessions/{session_id}/responses:batch", json={"responses": [answer]})
+
+    runner_conn = sqlite3.connect(database, isolation_level=None)
+    runner_conn.row_factory = sqlite3.Row
+    result = reset_sessions(runner_conn, HookedJob(database, on_start=start_session))
+    runner_conn.close()
+
+    assert result["sessions_deleted"] == 300
+    # The word's schedule now comes from the one answer left, the other word has none
+    review = conn.execute(
+        "SELECT repetitions, review_count, last_reviewed_at, due_date FROM word_reviews WHERE word_id = ?", (word_id,)
+    ).fetchone()
+    assert tuple(review) == (1, 1, "2030-01-01 10:00:00", "2030-01-02")
+    assert conn.execute("SELECT COUNT(*) FROM word_reviews WHERE word_id = ?", (other,)).fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM word_reviews").fetchone()[0] == 1
+
+
+def test_seeding_words_commits_a_heartbeat_with_every_file(tmp_path):
+    directory = tmp_path / "seeds"
+    directory.mkdir()
+    for name in ("data_a.json", "data_b.json"):
+        (directory / name).write_text(
+            json.dumps([{"arabic": f"كلمة {name}", "romanized": name, "english": name}]), encoding="utf-8"
+        )
+    database = str(tmp_path / "seed.db")
+    init_db(database)
+
+    calls = []
+
+    def progress(conn, done, total, filename):
+        assert conn.in_transaction
+        calls.append((done, total, filename))
+
+    seed_words(database, str(directory), progress=progress)
+    assert calls == [(1, 2, "data_a.json"), (2, 2, "data_b.json")]
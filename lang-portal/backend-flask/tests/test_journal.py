@@ -0,0 +1,176 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from app import create_app
+from db.lib.db import get_pool
+from db.lib.journal import (
+    ResponseJournal,
+    apply_entries,
+    flush_journal,
+    get_journal,
+    journal_dir,
+    wait_for_session,
+)
+from db.seeds.synthetic import build_synthetic_db
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def journal_db(tmp_path):
+    path = str(tmp_path / "journal.db")
+    build_synthetic_db(path, words=100, groups=2, sessions=10, responses_per_session=0)
+    yield path
+    get_pool(path).close_all()
+
+
+def response_count(path, session_id):
+    conn = get_pool(path).acquire()
+    return conn.execute("SELECT COUNT(*) FROM session_responses WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+
+def answer(n):
+    return {"question_id": n, "user_response": f"answer {n}", "is_correct": n % 2 == 0}
+
+
+def test_append_commits_on_flush(journal_db):
+    journal = ResponseJournal(journal_db, flush_ms=60_000)
+    client_ids = journal.append(3, [answer(1), answer(2)])
+    journal.append(4, [answer(3)])
+
+    assert len(set(client_ids)) == 2
+    assert response_count(journal_db, 3) == 0
+    assert journal.flush() == 3
+    assert response_count(journal_db, 3) == 2
+    assert response_count(journal_db, 4) == 1
+    # Committed segments are removed, only the lock of the live journal remains
+    assert [name for name in os.listdir(journal_dir(journal_db)) if name.endswith(".jsonl")] == []
+    journal.close()
+    assert os.listdir(journal_dir(journal_db)) == []
+
+
+def test_answers_for_deleted_sessions_are_dropped(journal_db):
+    journal = ResponseJournal(journal_db, flush_ms=60_000)
+    journal.append(5, [answer(1)])
+    conn = get_pool(journal_db).acquire()
+    conn.execute("DELETE FROM study_sessions WHERE id = 5")
+    conn.commit()
+
+    assert journal.flush() == 0
+    assert response_count(journal_db, 5) == 0
+    journal.close()
+
+
+def test_flush_leaves_the_callers_transaction_alone(journal_db):
+    journal = ResponseJournal(journal_db, flush_ms=60_000)
+    journal.append(5, [answer(1)])
+    # A request on this thread is reading through its pooled connection
+    conn = get_pool(journal_db).acquire()
+    conn.execute("BEGIN")
+    assert conn.execute("SELECT COUNT(*) FROM session_responses WHERE session_id = 5").fetchone()[0] == 0
+
+    with pytest.raises(RuntimeError):
+        apply_entries(conn, [dict(answer(1), session_id=5, timestamp="2024-03-01 10:00:00")])
+    assert journal.flush() == 1
+    # Still the request's transaction, reading from the snapshot it started with
+    assert conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM session_responses WHERE session_id = 5").fetchone()[0] == 0
+    conn.rollback()
+
+    assert response_count(journal_db, 5) == 1
+    journal.close()
+
+
+def test_segments_list_their_sessions(journal_db):
+    journal = ResponseJournal(journal_db, flush_ms=60_000)
+    journal.append(3, [answer(1)])
+    journal.append(4, [answer(2)])
+    journal.append(3, [answer(3)])
+
+    (index,) = [name for name in os.listdir(journal_dir(journal_db)) if name.endswith(".sessions")]
+    with open(os.path.join(journal_dir(journal_db), index)) as f:
+        assert f.read().split() == ["3", "4"]
+    assert wait_for_session(journal_db, 5, timeout=0)
+    assert not wait_for_session(journal_db, 4, timeout=0)
+    journal.flush()
+    assert wait_for_session(journal_db, 4, timeout=0)
+    journal.close()
+
+
+CRASH_SCRIPT = """
+import os, sys
+from db.lib.journal import ResponseJournal
+journal = ResponseJournal(sys.argv[1], flush_ms=60_000)
+journal.append(6, [{"question_id": i, "user_response": "x", "is_correct": True} for i in range(7)])
+os._exit(1)  # Die without flushing or running atexit handlers
+"""
+
+
+def test_crashed_process_is_replayed(journal_db):
+    subprocess.run([sys.executable, "-c", CRASH_SCRIPT, journal_db], cwd=BACKEND_DIR, check=False)
+    assert response_count(journal_db, 6) == 0
+    # Its lock file and one segment with its session list
+    assert sorted(name.rsplit(".", 1)[1] for name in os.listdir(journal_dir(journal_db))) == ["jsonl", "lock", "sessions"]
+
+    create_app({"DATABASE": journal_db, "TESTING": True})
+
+    assert response_count(journal_db, 6) == 7
+    assert os.listdir(journal_dir(journal_db)) == []
+
+
+def test_append_endpoint(journal_db):
+    client = create_app({"DATABASE": journal_db, "TESTING": True}).test_client()
+
+    response = client.post("/api/study-sessions/7/responses:append", json={"responses": [answer(1), answer(2)]})
+    assert response.status_code == 202, response.data
+    assert response.get_json()["accepted"] == 2
+
+    # Completing the session commits what is still waiting in the journal
+    assert client.patch("/api/study-sessions/7", json={}).status_code == 200
+    assert response_count(journal_db, 7) == 2
+
+    # Retrying through responses:batch with the returned ids inserts nothing twice
+    retry = [dict(answer(n), client_response_id=cid) for n, cid in zip((1, 2), response.get_json()["client_response_ids"])]
+    batch = client.post("/api/study-sessions/7/responses:batch", json={"responses": retry}).get_json()
+    assert batch["duplicate"] == 2
+
+    assert client.post("/api/study-sessions/7/responses:append", json={"responses": [{}]}).status_code == 400
+    assert client.post("/api/study-sessions/9999/responses:append", json={"responses": [answer(1)]}).status_code == 404
+    get_journal(journal_db).close()
+
+
+def test_waits_for_answers_in_another_journal(journal_db):
+    # Two journals on one database stand in for two worker processes
+    other = ResponseJournal(journal_db, flush_ms=60_000)
+    other.append(8, [answer(1), answer(2)])
+    mine = get_journal(journal_db)
+    mine.append(9, [answer(3)])
+
+    # Nothing of session 8 is ours to flush, and the other worker does not flush in time
+    assert not wait_for_session(journal_db, 8, timeout=0.1)
+    assert response_count(journal_db, 8) == 0
+
+    # Once the other worker flushes, the wait ends and the answers are there
+    timer = threading.Timer(0.2, other.flush)
+    timer.start()
+    flush_journal(journal_db, session_id=8)
+    assert response_count(journal_db, 8) == 2
+    assert response_count(journal_db, 9) == 1
+    timer.join()
+    other.close()
+    mine.close()
+
+
+def test_complete_sees_answers_from_another_worker(journal_db):
+    client = create_app({"DATABASE": journal_db, "TESTING": True}).test_client()
+    other = ResponseJournal(journal_db, flush_ms=100)
+    other.append(10, [answer(1), answer(2), answer(3)])
+
+    assert client.patch("/api/study-sessions/10", json={}).status_code == 200
+    assert response_count(journal_db, 10) == 3
+    other.close()
+    get_journal(journal_db).close()
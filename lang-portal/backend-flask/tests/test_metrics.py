@@ -0,0 +1,27 @@
+import json
+import re
+
+
+def test_server_timing_counts_queries(client):
+    response = client.get("/api/groups/3/words?limit=5")
+    match = re.match(r'db;dur=[\d.]+;desc="(\d+) queries", app;dur=[\d.]+$', response.headers["Server-Timing"])
+    assert match and int(match.group(1)) >= 2  # Data version check plus the page itself
+
+    metrics = client.get("/api/_debug/metrics").get_json()
+    assert metrics["sql"]["endpoints"]["groups.get_group_words"]["queries"] >= 2
+    assert metrics["pools"]
+
+
+def test_slow_queries_are_logged_with_their_plan(app, client, tmp_path):
+    log = tmp_path / "slow.log"
+    saved = {key: app.config[key] for key in ("SLOW_QUERY_MS", "SLOW_QUERY_LOG")}
+    app.config.update(SLOW_QUERY_MS=0, SLOW_QUERY_LOG=str(log))
+    try:
+        client.get("/api/study-sessions/5")
+    finally:
+        app.config.update(saved)
+
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    lookup = next(e for e in entries if "FROM study_sessions" in e["sql"])
+    assert lookup["endpoint"] == "study_sessions.get_study_session"
+    assert any("USING" in step for step in lookup["plan"])
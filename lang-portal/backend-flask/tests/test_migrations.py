@@ -0,0 +1,133 @@
+import shutil
+import sqlite3
+
+from db.config import BASE_DIR
+from db.schema import (
+    MIGRATIONS_DIR,
+    SCHEMA_SNAPSHOT,
+    backfill_in_batches,
+    discover_migrations,
+    dump_schema,
+    init_db,
+    migrate_db,
+)
+
+
+def test_schema_snapshot_is_current(tmp_path):
+    database = str(tmp_path / "fresh.db")
+    init_db(database)
+    with open(SCHEMA_SNAPSHOT, "r") as f:
+        assert f.read() == dump_schema(database), "Run `python3 tasks.py dump-schema` and commit db/schema.sql"
+
+
+def test_versions_before_schema_version_are_bootstrapped_from_user_version(tmp_path):
+    database = str(tmp_path / "legacy.db")
+    init_db(database)
+    conn = sqlite3.connect(database)
+    conn.execute("DROP TABLE schema_version")
+    conn.execute("PRAGMA user_version = 3")
+    conn.commit()
+
+    migrate_db(database)
+
+    rows = conn.execute("SELECT version, duration_ms IS NULL FROM schema_version ORDER BY version").fetchall()
+    versions = [version for version, _ in discover_migrations()]
+    assert [version for version, _ in rows] == versions
+    # Only 1-3 were taken from user_version; the rest ran again and were timed
+    assert [bootstrapped for _, bootstrapped in rows] == [version <= 3 for version in versions]
+    conn.close()
+
+
+def test_python_migrations_and_batched_backfill(tmp_path):
+    directory = tmp_path / "migrations"
+    directory.mkdir()
+    (directory / "001_items.sql").write_text(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY, n INTEGER, doubled INTEGER);\n"
+        "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < 250)\n"
+        "INSERT INTO items (n) SELECT n FROM seq;\n"
+    )
+    (directory / "002_double.py").write_text(
+        "from db.schema import backfill_in_batches\n"
+        "TRANSACTIONAL = False\n"
+        "batches = []\n"
+        "def apply(conn, ids):\n"
+        "    batches.append(len(ids))\n"
+        "    conn.execute(f\"UPDATE items SET doubled = n * 2 WHERE id IN ({','.join('?' * len(ids))})\", ids)\n"
+        "def upgrade(conn):\n"
+        "    backfill_in_batches(conn, 'items', apply, where='doubled IS NULL', batch_size=100)\n"
+    )
+    database = str(tmp_path / "test.db")
+
+    migrate_db(database, directory=str(directory))
+    migrate_db(database, directory=str(directory))  # Nothing left to apply
+
+    conn = sqlite3.connect(database)
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE doubled = n * 2").fetchone()[0] == 250
+    assert conn.execute("SELECT version FROM schema_version ORDER BY version").fetchall() == [(1,), (2,)]
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+    conn.close()
+
+
+def test_backfill_in_batches_commits_each_batch(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "batches.db"), isolation_level=None)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, flag INTEGER DEFAULT 0)")
+    conn.executemany("INSERT INTO t (id) VALUES (?)", [(i,) for i in range(1, 26)])
+
+    seen = []
+
+    def apply(conn, ids):
+        assert conn.in_transaction
+        seen.append(ids)
+        conn.execute(f"UPDATE t SET flag = 1 WHERE id IN ({','.join('?' * len(ids))})", ids)
+
+    assert backfill_in_batches(conn, "t", apply, where="flag = 0", batch_size=10) == 25
+    assert [len(ids) for ids in seen] == [10, 10, 5]
+    assert not conn.in_transaction
+    conn.close()
+
+
+def test_words_groups_migration_merges_duplicated_words(tmp_path):
+    # Build the schema as it was before group membership moved to words_groups
+    before = tmp_path / "before"
+    before.mkdir()
+    for version, filename in discover_migrations():
+        if version < 10:
+            shutil.copy(f"{MIGRATIONS_DIR}/{filename}", before)
+    database = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(database)
+    with open(f"{BASE_DIR}/sql/setup.sql", "r") as f:
+        conn.executescript(f.read())
+    migrate_db(database, directory=str(before))
+
+    conn.executemany("INSERT INTO groups (id, name) VALUES (?, ?)", [(1, "Greetings"), (2, "Phrases")])
+    conn.executemany(
+        "INSERT INTO words (id, arabic, romanized, english, group_id) VALUES (?, ?, ?, ?, ?)",
+        [
+            (1, "مرحبا", "marhaba", "hello", 1),
+            (2, "شكرا", "shukran", "thanks", 1),
+            (3, "مرحبا", "marhaba", "hello", 2),
+            # Homographs: same unvowelled spelling, different words
+            (5, "علم", "ilm", "knowledge", 1),
+            (6, "علم", "alam", "flag", 2),
+        ],
+    )
+    conn.execute("INSERT INTO study_sessions (id, group_id, study_activity_id) VALUES (1, 2, 1)")
+    conn.execute("INSERT INTO session_responses (session_id, question_id, user_response, is_correct) VALUES (1, 3, 'x', 1)")
+    conn.commit()
+
+    migrate_db(database)
+
+    assert conn.execute("SELECT id FROM words ORDER BY id").fetchall() == [(1,), (2,), (5,), (6,)]
+    assert conn.execute("SELECT group_id, word_id FROM words_groups ORDER BY group_id, word_id").fetchall() == [
+        (1, 1), (1, 2), (1, 5), (2, 1), (2, 6)
+    ]
+    assert conn.execute("SELECT question_id FROM session_responses").fetchall() == [(1,)]
+    assert conn.execute("SELECT word_id FROM word_reviews").fetchall() == [(1,)]
+    assert conn.execute("SELECT id, word_count FROM groups ORDER BY id").fetchall() == [(1, 3), (2, 2)]
+
+    # New words join their group, and deleting one keeps the counts right
+    conn.execute("INSERT INTO words (id, arabic, romanized, english, group_id) VALUES (4, 'نعم', 'naam', 'yes', 2)")
+    conn.execute("DELETE FROM words WHERE id = 1")
+    conn.commit()
+    assert conn.execute("SELECT id, word_count FROM groups ORDER BY id").fetchall() == [(1, 2), (2, 2)]
+    conn.close()
@@ -0,0 +1,47 @@
+import threading
+
+from db.lib.db import ConnectionPool
+
+
+def test_connections_of_finished_threads_are_closed(app):
+    pool = ConnectionPool(app.config["DATABASE"])
+
+    def request():
+        conn = pool.acquire()
+        conn.execute("SELECT COUNT(*) FROM words").fetchone()
+        pool.release(conn)
+
+    # Like the dev server: every request on a thread of its own
+    for _ in range(50):
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+    stats = pool.stats()
+    assert stats["opened"] == 50
+    assert stats["closed"] == 50
+    assert stats["connections"] == 0
+
+
+def test_live_threads_keep_their_connection(app):
+    pool = ConnectionPool(app.config["DATABASE"])
+    ready, done = threading.Barrier(9), threading.Event()
+
+    def worker():
+        pool.acquire()
+        ready.wait()
+        done.wait()
+        pool.acquire()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    assert pool.stats()["connections"] == 8
+
+    done.set()
+    for thread in threads:
+        thread.join()
+    stats = pool.stats()
+    assert (stats["opened"], stats["reused"], stats["connections"]) == (8, 8, 0)
+    pool.close_all()
@@ -0,0 +1,162 @@
+"""Runs EXPLAIN QUERY PLAN on every statement the blueprints issue.
+
+Each request below is replayed through the test client while a trace callback
+records the SQL sent to SQLite. The test fails when any statement falls back to
+a full table scan of one of the large tables, so a dropped index or a rewritten
+query shows up here instead of in production.
+"""
+import re
+
+import pytest
+
+from db.lib.db import get_pool
+
+LARGE_TABLES = {"words", "study_sessions", "session_responses"}
+
+# (method, path, json body) for every route under /api
+REQUESTS = [
+    ("GET", "/api/words", None),
+    ("GET", "/api/words?limit=50&after=100&fields=arabic,english", None),
+    ("GET", "/api/words/10", None),
+    ("GET", "/api/words/search?q=kalima1", None),
+    ("GET", "/api/words/hardest", None),
+    ("GET", "/api/words/hardest?group_id=3&limit=10&min_attempts=2", None),
+    ("GET", "/api/groups", None),
+    ("GET", "/api/groups/3", None),
+    ("GET", "/api/groups/3/words", None),
+    ("GET", "/api/groups/3/words?limit=20&after=40", None),
+    ("GET", "/api/groups/3/study_sessions", None),
+    ("GET", "/api/study-activities", None),
+    ("GET", "/api/study-activities/2", None),
+    ("GET", "/api/study-activities/2/sessions", None),
+    ("GET", "/api/study-sessions", None),
+    ("GET", "/api/study-sessions?group_id=3", None),
+    ("GET", "/api/study-sessions?study_activity_id=2", None),
+    ("GET", "/api/study-sessions?date_from=2024-03-01&date_to=2024-03-31", None),
+    ("GET", "/api/study-sessions?activity_type=quiz", None),
+    ("GET", "/api/study-sessions?limit=20&after=30", None),
+    ("GET", "/api/study-sessions?group_id=3&limit=20&after=30", None),
+    ("GET", "/api/study-sessions?include=counts", None),
+    ("GET", "/api/study-sessions?include=counts&group_id=3&activity_type=quiz&date_from=2024-03-01", None),
+    ("GET", "/api/study-sessions/latest", None),
+    ("GET", "/api/study-sessions/stats", None),
+    ("GET", "/api/study-sessions/stats?date_from=2024-03-01&date_to=2024-03-31", None),
+    ("GET", "/api/study-sessions/5", None),
+    ("GET", "/api/study-sessions/5/responses", None),
+    ("POST", "/api/study-sessions", {"group_id": 2, "study_activity_id": 3}),
+    (
+        "POST",
+        "/api/study-sessions/4/responses:batch",
+        {"responses": [{"client_response_id": "t1", "question_id": 7, "user_response": "x", "is_correct": True}]},
+    ),
+    (
+        "PATCH",
+        "/api/study-sessions/3",
+        {"responses": [{"question_id": 8, "user_response": "y", "is_correct": False, "timestamp": "2025-01-01 10:01:00"}]},
+    ),
+    (
+        "POST",
+        "/api/study-sessions/5/responses:append",
+        {"responses": [{"question_id": 9, "user_response": "z", "is_correct": True}]},
+    ),
+    ("POST", "/api/study-sessions/6/resume", None),
+    ("DELETE", "/api/study-sessions/9", None),
+    ("GET", "/api/export/words", None),
+    ("GET", "/api/review-queue?limit=10&date=2024-06-01", None),
+    ("GET", "/api/dashboard", None),
+    ("GET", "/api/jobs", None),
+    ("GET", "/api/jobs/1", None),
+    ("GET", "/api/_debug/metrics", None),
+]
+
+# Requests that read a whole table on purpose, with the reason why
+FULL_SCAN_ALLOWED = {
+    "/api/words": "without a limit the whole word list is returned, as the frontend's word list and quiz expect",
+    "/api/export/words": "exports stream every row of a table",
+}
+
+# Statements that walk a whole index on purpose
+FULL_SCAN_STATEMENTS = {
+    "SELECT COUNT(*) FROM words": "the total is cached by db.lib.counters",
+}
+
+# Endpoints deliberately left out of REQUESTS
+NOT_REPLAYED = {
+    "study_sessions.reset_study_sessions": "deletes every session",
+    "jobs.create_job": "starts background maintenance on the shared test database",
+}
+
+FROM_RE = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+SCAN_RE = re.compile(r"^SCAN (\w+)")
+
+
+def table_aliases(sql):
+    """Map every table name and alias in a statement to the table it refers to."""
+    aliases = {}
+    for table, alias in FROM_RE.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in {"WHERE", "ON", "ORDER", "GROUP", "LEFT", "JOIN", "SET", "VALUES", "LIMIT"}:
+            aliases[alias] = table
+    return aliases
+
+
+def full_scans(conn, sql):
+    """Return the plan steps that walk every row of a large table.
+
+    A plain ``SCAN table`` always counts. ``SCAN table USING INDEX`` only counts
+    when the statement has no LIMIT, since a limited index walk stops early.
+    """
+    if sql.strip() in FULL_SCAN_STATEMENTS:
+        return []
+    aliases = table_aliases(sql)
+    bounded = re.search(r"\bLIMIT\b", sql, re.IGNORECASE) is not None
+    scans = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall():
+        match = SCAN_RE.match(row[3])
+        if not match or aliases.get(match.group(1), match.group(1)) not in LARGE_TABLES:
+            continue
+        if " USING " in row[3] and bounded:
+            continue
+        scans.append(row[3])
+    return scans
+
+
+def replay(app, client, method, path, body):
+    """Issue one request and return the statements it ran."""
+    statements = []
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    conn.set_trace_callback(statements.append)
+    try:
+        response = client.open(path, method=method, json=body)
+    finally:
+        conn.set_trace_callback(None)
+    assert response.status_code < 500, response.data
+
+    return [
+        s for s in statements
+        if s.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"))
+    ]
+
+
+@pytest.mark.parametrize("method,path,body", REQUESTS, ids=[f"{m} {p}" for m, p, _ in REQUESTS])
+def test_no_full_table_scans(app, client, method, path, body):
+    if path in FULL_SCAN_ALLOWED:
+        pytest.skip(FULL_SCAN_ALLOWED[path])
+
+    queries = replay(app, client, method, path, body)
+
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    offenders = {sql: scans for sql in queries if (scans := full_scans(conn, sql))}
+    assert not offenders, f"{method} {path} scans large tables: {offenders}"
+
+
+def test_every_route_is_replayed(app):
+    adapter = app.url_map.bind("localhost")
+    replayed = {
+        adapter.match(path.split("?")[0], method=method)[0] for method, path, _ in REQUESTS
+    }
+    routes = {
+        rule.endpoint for rule in app.url_map.iter_rules() if rule.rule.startswith("/api/")
+    }
+    missing = routes - replayed - set(NOT_REPLAYED)
+    assert not missing, f"Add these routes to REQUESTS in {__name__}: {sorted(missing)}"
@@ -0,0 +1,107 @@
+import gzip
+import json
+import sqlite3
+
+from app import create_app
+from db.lib import responses
+from db.lib.cache import SEARCH_CACHE_MAX_ENTRIES, response_cache, search_cache
+from db.lib.db import get_pool
+from db.seeds.synthetic import build_synthetic_db
+
+
+def test_large_responses_are_gzipped_with_their_own_etag(client):
+    plain = client.get("/api/words?limit=200")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    compressed = client.get("/api/words?limit=200", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+
+    revalidated = client.get(
+        "/api/words?limit=200",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get("/api/words/1", headers={"Accept-Encoding": "gzip, br"})
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" not in response.headers.get("Vary", "")
+
+
+def test_rows_serialize_the_same_with_and_without_orjson(client, monkeypatch):
+    fast = client.get("/api/words?limit=20").get_data(as_text=True)
+    assert "كلمة" in fast  # UTF-8, not \u escapes
+
+    monkeypatch.setattr(responses, "orjson", None)
+    response_cache.clear()
+    stdlib = client.get("/api/words?limit=20").get_data(as_text=True)
+    assert json.loads(fast) == json.loads(stdlib)
+
+
+def test_searches_do_not_evict_catalog_responses(client, monkeypatch):
+    monkeypatch.setattr(response_cache, "max_entries", 1)
+    client.get("/api/words/1")
+    hits = response_cache.stats()["hits"]
+
+    # A live search sends one query per keystroke
+    for n in range(1, SEARCH_CACHE_MAX_ENTRIES + 5):
+        assert client.get(f"/api/words/search?q={'abcdefgh'[:n % 8 + 1]}&limit={n}").status_code == 200
+    assert search_cache.stats()["entries"] <= SEARCH_CACHE_MAX_ENTRIES
+
+    client.get("/api/words/1")
+    assert response_cache.stats()["hits"] == hits + 1
+
+
+def test_cache_entries_belong_to_their_database(tmp_path):
+    apps = []
+    for name in ("a", "b"):
+        path = str(tmp_path / f"{name}.db")
+        build_synthetic_db(path, words=50, groups=2, sessions=0)
+        conn = sqlite3.connect(path)
+        # Same number of writes, so both databases are at the same data version
+        conn.execute("UPDATE words SET english = ? WHERE id = 1", (f"from {name}.db",))
+        conn.commit()
+        conn.close()
+        apps.append(create_app({"DATABASE": path, "TESTING": True}))
+
+    try:
+        for app, name in zip(apps, ("a", "b")):
+            assert app.test_client().get("/api/words/1").get_json()["english"] == f"from {name}.db"
+    finally:
+        for app in apps:
+            get_pool(app.config["DATABASE"]).close_all()
+
+
+def test_word_counts_follow_their_database(tmp_path):
+    apps = []
+    for name, words in (("small", 50), ("large", 80)):
+        path = str(tmp_path / f"{name}.db")
+        build_synthetic_db(path, words=words, groups=2, sessions=0)
+        apps.append(create_app({"DATABASE": path, "TESTING": True}))
+    small, large = (app.test_client() for app in apps)
+
+    try:
+        assert small.get("/api/words?limit=5").headers["X-Total-Count"] == "50"
+        assert large.get("/api/words?limit=5").headers["X-Total-Count"] == "80"
+
+        # A new word is counted straight away, not after the count's TTL
+        conn = sqlite3.connect(apps[0].config["DATABASE"])
+        conn.execute("INSERT INTO words (arabic, romanized, english, group_id) VALUES ('قلم', 'qalam', 'pen', 1)")
+        conn.commit()
+        conn.close()
+        assert small.get("/api/words?limit=5").headers["X-Total-Count"] == "51"
+    finally:
+        for app in apps:
+            get_pool(app.config["DATABASE"]).close_all()
+
+
+def test_page_args_must_be_ascii_digits(client):
+    # "²".isdigit() is true but int("²") fails
+    assert client.get("/api/words?limit=²").status_code == 400
+    assert client.get("/api/words?after=²").status_code == 400
+    assert client.get("/api/groups/1/words?limit=٣").status_code == 400
+    assert client.get("/api/words?limit=3&after=0").status_code == 200
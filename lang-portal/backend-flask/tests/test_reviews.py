@@ -0,0 +1,53 @@
+from db.lib.db import get_pool
+
+
+def _answer(client, session_id, word_id, correct, timestamp):
+    response = client.post(
+        f"/api/study-sessions/{session_id}/responses:batch",
+        json={"responses": [
+            {"question_id": word_id, "user_response": "x", "is_correct": correct, "timestamp": timestamp}
+        ]},
+    )
+    assert response.status_code == 200, response.data
+
+
+def test_responses_schedule_reviews_sm2(app, client):
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    with conn:
+        word_id = conn.execute(
+            "INSERT INTO words (arabic, romanized, english, group_id) VALUES ('بيت', 'bayt', 'house', 1)"
+        ).lastrowid
+    session_id = client.post("/api/study-sessions", json={"group_id": 1, "study_activity_id": 1}).get_json()["id"]
+
+    def review():
+        return conn.execute(
+            "SELECT interval_days, repetitions, lapses, review_count, due_date FROM word_reviews WHERE word_id = ?",
+            (word_id,),
+        ).fetchone()
+
+    try:
+        _answer(client, session_id, word_id, True, "1990-01-01 10:00:00")
+        assert tuple(review()) == (1, 1, 0, 1, "1990-01-02")
+
+        _answer(client, session_id, word_id, True, "1990-01-02 10:00:00")
+        assert tuple(review()) == (6, 2, 0, 2, "1990-01-08")
+
+        # Answering again before it is due does not stretch the interval
+        _answer(client, session_id, word_id, True, "1990-01-02 10:05:00")
+        assert tuple(review()) == (6, 2, 0, 3, "1990-01-08")
+
+        # Synthetic history starts in 2024, so this word is the only one due this early
+        assert [w["id"] for w in client.get("/api/review-queue?date=1990-01-08").get_json()] == [word_id]
+        assert client.get("/api/review-queue?date=1990-01-07").get_json() == []
+
+        _answer(client, session_id, word_id, False, "1990-01-08 09:00:00")
+        assert tuple(review()) == (1, 0, 1, 4, "1990-01-09")
+    finally:
+        with conn:
+            conn.execute("DELETE FROM session_responses WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM study_sessions WHERE id = ?", (session_id,))
+            conn.execute("DELETE FROM words WHERE id = ?", (word_id,))
+
+
+def test_review_queue_rejects_bad_dates(client):
+    assert client.get("/api/review-queue?date=tomorrow").status_code == 400
@@ -0,0 +1,39 @@
+from db.lib.db import get_pool
+from db.lib.search import build_match_query, normalize_arabic
+
+
+def test_normalize_arabic_strips_tashkeel_and_folds_variants():
+    assert normalize_arabic("أَكَلَ") == "اكل"
+    assert normalize_arabic("مَدْرَسَةٌ") == "مدرسه"
+    assert normalize_arabic("عَلَى") == "علي"
+
+
+def test_build_match_query_quotes_terms():
+    assert build_match_query('to e" OR') == '"to"* "e"* "OR"*'
+    assert build_match_query(" -* ") is None
+
+
+def test_search_matches_normalized_prefixes_and_follows_edits(app, client):
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    with conn:
+        word_id = conn.execute(
+            "INSERT INTO words (arabic, romanized, english, group_id) VALUES (?, ?, ?, ?)",
+            ("إِسْتِقْلَالٌ", "istiqlāl", "independence", 1),
+        ).lastrowid
+    try:
+        results = client.get("/api/words/search?q=استق").get_json()
+        assert results[0]["id"] == word_id
+        assert client.get("/api/words/search?q=istiqlal").get_json()[0]["id"] == word_id
+
+        with conn:
+            conn.execute("UPDATE words SET english = 'freedom' WHERE id = ?", (word_id,))
+        assert client.get("/api/words/search?q=independ").get_json() == []
+        assert client.get("/api/words/search?q=freedom").get_json()[0]["id"] == word_id
+    finally:
+        with conn:
+            conn.execute("DELETE FROM words WHERE id = ?", (word_id,))
+    assert client.get("/api/words/search?q=freedom").get_json() == []
+
+
+def test_search_requires_a_term(client):
+    assert client.get("/api/words/search?q=%20").status_code == 400
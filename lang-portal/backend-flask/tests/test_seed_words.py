@@ -0,0 +1,68 @@
+import io
+import json
+import sqlite3
+
+import pytest
+
+from db.schema import init_db
+from db.seeds.words import iter_json_array, read_text_chunks, seed_word_file
+
+WORDS = [
+    {"arabic": "مرحبا", "romanized": "marhaba", "english": "hello", "example": {"arabic": "مرحبا يا صديقي"}},
+    {"arabic": "شكرا", "romanized": "shukran", "english": "thanks"},
+    {"arabic": "علم", "romanized": "alam", "english": "flag"},
+]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1 << 16])
+def test_array_is_read_a_chunk_at_a_time(size):
+    data = json.dumps(WORDS + [12345, [1.5, None]], ensure_ascii=False, indent=2).encode("utf-8")
+    # Small chunks split Arabic characters and numbers across reads
+    assert list(iter_json_array(read_text_chunks(io.BytesIO(data), size=size))) == WORDS + [12345, [1.5, None]]
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array(['{"arabic": "x"}']))
+    with pytest.raises(ValueError):
+        list(iter_json_array(['[{"arabic": "x"}']))
+
+
+def test_unchanged_file_is_skipped(tmp_path):
+    database = str(tmp_path / "seed.db")
+    init_db(database)
+    path = tmp_path / "data_basic.json"
+    path.write_text(json.dumps(WORDS, ensure_ascii=False), encoding="utf-8")
+    conn = sqlite3.connect(database)
+
+    assert seed_word_file(conn, path) == (3, 3)
+    assert seed_word_file(conn, path) is None
+    # Forced, the file is read again but nothing is stored twice
+    assert seed_word_file(conn, path, force=True) == (3, 0)
+
+    path.write_text(json.dumps(WORDS + [{"arabic": "نعم", "romanized": "naam", "english": "yes"}]), encoding="utf-8")
+    assert seed_word_file(conn, path) == (4, 1)
+    assert conn.execute("SELECT COUNT(*) FROM words").fetchone()[0] == 4
+    assert conn.execute("SELECT rows_read, rows_inserted FROM seed_files WHERE filename = ?", (path.name,)).fetchone() == (4, 1)
+    conn.close()
+
+
+def test_stored_words_join_the_new_files_group(tmp_path):
+    database = str(tmp_path / "seed.db")
+    init_db(database)
+    first, second = tmp_path / "data_first.json", tmp_path / "data_second.json"
+    first.write_text(json.dumps(WORDS[:2], ensure_ascii=False), encoding="utf-8")
+    second.write_text(json.dumps(WORDS[1:], ensure_ascii=False), encoding="utf-8")
+    conn = sqlite3.connect(database)
+
+    assert seed_word_file(conn, first) == (2, 2)
+    assert seed_word_file(conn, second) == (2, 1)
+    groups = conn.execute(
+        """
+        SELECT w.english, g.name FROM words_groups wg
+        JOIN words w ON w.id = wg.word_id JOIN groups g ON g.id = wg.group_id
+        ORDER BY w.id, g.id
+        """
+    ).fetchall()
+    assert groups == [("hello", "First"), ("thanks", "First"), ("thanks", "Second"), ("flag", "Second")]
+    conn.close()
@@ -0,0 +1,67 @@
+import os
+import time
+
+import pytest
+
+from app import create_app
+from db.lib.db import get_pool
+from db.lib.snapshot import get_snapshot
+from db.seeds.synthetic import build_synthetic_db
+
+
+@pytest.fixture
+def snapshot_app(tmp_path):
+    path = str(tmp_path / "analytics.db")
+    build_synthetic_db(path, words=200, groups=3, sessions=50, responses_per_session=2)
+    app = create_app({"DATABASE": path, "TESTING": True, "ANALYTICS_SNAPSHOT": True, "SNAPSHOT_MAX_AGE_SECONDS": 3600})
+    yield app
+    get_pool(path).close_all()
+
+
+def wait_for_snapshot(snapshot, timeout=10):
+    deadline = time.monotonic() + timeout
+    while snapshot.taken_at() is None:
+        assert time.monotonic() < deadline, "snapshot was not built"
+        time.sleep(0.02)
+
+
+def test_stats_read_the_snapshot(snapshot_app):
+    client = snapshot_app.test_client()
+    snapshot = get_snapshot(snapshot_app.config["DATABASE"])
+
+    # Before the first snapshot exists the live database answers, and building one starts
+    first = client.get("/api/study-sessions/stats")
+    assert first.get_json()["total_sessions"] == 50
+    assert "X-Snapshot-Age" not in first.headers
+    wait_for_snapshot(snapshot)
+
+    # New sessions only show up once the snapshot is refreshed
+    client.post("/api/study-sessions", json={"group_id": 1, "study_activity_id": 1})
+    stale = client.get("/api/study-sessions/stats")
+    assert stale.get_json()["total_sessions"] == 50
+    assert "X-Snapshot-Age" in stale.headers
+
+    assert snapshot.refresh()
+    assert client.get("/api/study-sessions/stats").get_json()["total_sessions"] == 51
+
+    lines = client.get("/api/export/study-sessions", headers={"Accept-Encoding": "identity"}).data.splitlines()
+    assert len(lines) == 51
+
+
+def test_stale_snapshot_refreshes_in_background(snapshot_app):
+    client = snapshot_app.test_client()
+    snapshot = get_snapshot(snapshot_app.config["DATABASE"])
+    snapshot.refresh()
+    os.utime(snapshot.path, (0, 0))
+
+    client.get("/api/study-sessions/stats")
+    deadline = time.monotonic() + 10
+    while snapshot.taken_at() == 0:
+        assert time.monotonic() < deadline, "stale snapshot was not refreshed"
+        time.sleep(0.02)
+    assert time.time() - snapshot.taken_at() < 60
+
+
+def test_live_database_without_analytics_mode(app, client):
+    assert "X-Snapshot-Age" not in client.get("/api/study-sessions/stats").headers
+    assert not os.path.exists(f"{app.config['DATABASE']}.snapshot")
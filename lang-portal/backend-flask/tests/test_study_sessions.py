@@ -0,0 +1,102 @@
+from db.lib.db import get_pool
+
+
+def all_session_ids(app, where="1=1", params=()):
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    rows = conn.execute(
+        f"SELECT id FROM study_sessions WHERE {where} ORDER BY start_time DESC, id DESC", params
+    ).fetchall()
+    return [row["id"] for row in rows]
+
+
+def walk(client, path):
+    ids, pages = [], 0
+    while path:
+        response = client.get(path)
+        assert response.status_code == 200, response.data
+        ids += [session["id"] for session in response.get_json()]
+        pages += 1
+        link = response.headers.get("Link")
+        path = link[link.index("/api/"):link.index(">")] if link else None
+    return ids, pages
+
+
+def test_pages_cover_every_session_once(app, client):
+    ids, pages = walk(client, "/api/study-sessions?limit=70")
+
+    assert ids == all_session_ids(app)
+    assert pages == -(-len(ids) // 70)
+
+
+def test_pages_keep_filters(app, client):
+    ids, _ = walk(client, "/api/study-sessions?group_id=3&date_from=2024-01-01&limit=5")
+
+    assert ids == all_session_ids(app, "group_id = 3 AND start_time >= '2024-01-01'")
+
+
+def test_default_page_size(client):
+    response = client.get("/api/study-sessions")
+
+    assert len(response.get_json()) == 50
+    assert "X-Total-Count" not in response.headers
+    assert response.headers["X-Next-Cursor"] == str(response.get_json()[-1]["id"])
+
+
+def test_counts(app, client):
+    response = client.get("/api/study-sessions?include=counts&group_id=3&activity_type=quiz&date_from=2024-03-01&limit=1")
+    body = response.get_json()
+
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    quiz = "study_activity_id IN (SELECT id FROM study_activities WHERE type = 'quiz')"
+    assert body["counts"] == {
+        "total": len(all_session_ids(app, f"group_id = 3 AND {quiz} AND start_time >= '2024-03-01'")),
+        "group_id": len(all_session_ids(app, "group_id = 3")),
+        "activity_type": len(all_session_ids(app, quiz)),
+        "date": len(all_session_ids(app, "start_time >= '2024-03-01'")),
+    }
+    assert response.headers["X-Total-Count"] == str(body["counts"]["total"])
+    assert len(body["sessions"]) == 1
+
+    unfiltered = client.get("/api/study-sessions?include=counts&limit=1").get_json()["counts"]
+    assert unfiltered == {"total": conn.execute("SELECT COUNT(*) FROM study_sessions").fetchone()[0]}
+
+
+def test_bad_page_args(client):
+    assert client.get("/api/study-sessions?limit=0").status_code == 400
+    assert client.get("/api/study-sessions?after=abc").status_code == 400
+    assert client.get("/api/study-sessions?limit=²").status_code == 400
+    assert client.get("/api/study-sessions?after=²").status_code == 400
+    assert client.get("/api/study-sessions?after=99999999").status_code == 400
+    assert client.get("/api/study-sessions?include=everything").status_code == 400
+
+
+def test_response_payloads_are_validated_on_complete(app, client):
+    session_id = client.post("/api/study-sessions", json={"group_id": 1, "study_activity_id": 1}).get_json()["id"]
+    conn = get_pool(app.config["DATABASE"]).acquire()
+
+    def stored():
+        return conn.execute(
+            "SELECT user_response, created_at FROM session_responses WHERE session_id = ? ORDER BY id", (session_id,)
+        ).fetchall()
+
+    try:
+        for bad in (
+            {"question_id": 1, "user_response": None, "is_correct": True},
+            {"question_id": 1, "is_correct": True},
+            {"question_id": 1, "user_response": "x", "is_correct": True, "timestamp": "garbage"},
+        ):
+            response = client.patch(f"/api/study-sessions/{session_id}", json={"responses": [bad]})
+            assert response.status_code == 400, bad
+        assert stored() == []
+
+        answer = {"question_id": 1, "user_response": "x", "is_correct": True, "client_response_id": "c1"}
+        complete = client.patch(
+            f"/api/study-sessions/{session_id}",
+            json={"responses": [dict(answer, timestamp="2025-02-13T06:00:01+02:00")]},
+        )
+        assert complete.status_code == 200
+        # A retry with the same client id is skipped, not stored twice
+        client.post(f"/api/study-sessions/{session_id}/responses:batch", json={"responses": [answer]})
+        assert [tuple(row) for row in stored()] == [("x", "2025-02-13 04:00:01")]
+    finally:
+        assert client.delete(f"/api/study-sessions/{session_id}").status_code == 200
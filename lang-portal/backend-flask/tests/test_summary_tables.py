@@ -0,0 +1,140 @@
+import sqlite3
+
+import pytest
+
+from db.seeds.synthetic import build_synthetic_db
+
+# What the summary tables should hold, aggregated afresh from the raw rows
+SESSION_SCORES = """
+    SELECT session_id, COUNT(*), SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END), MIN(created_at), MAX(created_at)
+    FROM session_responses
+    WHERE session_id IN (SELECT id FROM study_sessions)
+    GROUP BY session_id
+    ORDER BY session_id
+"""
+
+
+@pytest.fixture
+def conn(tmp_path):
+    # The steps below rewrite sessions, so they get a database of their own
+    path = str(tmp_path / "summaries.db")
+    build_synthetic_db(path, words=100, groups=3, sessions=40, responses_per_session=4)
+    conn = sqlite3.connect(path, isolation_level=None)
+    yield conn
+    conn.close()
+
+
+def assert_session_scores_match(conn):
+    stored = conn.execute(
+        """
+        SELECT session_id, total_questions, correct_answers, first_response_at, last_response_at
+        FROM session_scores ORDER BY session_id
+        """
+    ).fetchall()
+    assert stored == conn.execute(SESSION_SCORES).fetchall()
+
+
+def test_session_scores_follow_responses(conn):
+    assert_session_scores_match(conn)
+
+    session_id = conn.execute(
+        "INSERT INTO study_sessions (group_id, study_activity_id, start_time) VALUES (1, 1, '2024-05-01 09:00:00')"
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO session_responses (session_id, question_id, user_response, is_correct, created_at) VALUES (?, ?, 'x', ?, ?)",
+        [(session_id, 1, 1, "2024-05-01 09:01:00"), (session_id, 2, 0, "2024-05-01 09:02:00")],
+    )
+    assert_session_scores_match(conn)
+
+    # Changing an answer's correctness, time or session moves it between summaries
+    response_id = conn.execute("SELECT MAX(id) FROM session_responses WHERE session_id = ?", (session_id,)).fetchone()[0]
+    conn.execute("UPDATE session_responses SET is_correct = 1, created_at = '2024-05-01 08:59:00' WHERE id = ?", (response_id,))
+    assert_session_scores_match(conn)
+    conn.execute("UPDATE session_responses SET session_id = 1 WHERE id = ?", (response_id,))
+    assert_session_scores_match(conn)
+
+    # Deleting the last answer of a session removes its summary row
+    conn.execute("DELETE FROM session_responses WHERE session_id = ?", (session_id,))
+    assert_session_scores_match(conn)
+    assert conn.execute("SELECT COUNT(*) FROM session_scores WHERE session_id = ?", (session_id,)).fetchone()[0] == 0
+
+    conn.execute("DELETE FROM session_responses WHERE session_id = 2")
+    conn.execute("DELETE FROM study_sessions WHERE id = 2")
+    conn.execute("DELETE FROM study_sessions WHERE id = 3")
+    assert_session_scores_match(conn)
+    assert conn.execute("SELECT COUNT(*) FROM session_scores WHERE session_id = 3").fetchone()[0] == 0
+
+
+DAILY_ROLLUPS = """
+    SELECT date(ss.start_time),
+           COALESCE(sa.type, 'unknown'),
+           COUNT(*),
+           SUM(CASE WHEN ss.end_time IS NOT NULL THEN 1 ELSE 0 END),
+           SUM(CASE WHEN ss.end_time IS NOT NULL
+               THEN CAST((julianday(ss.end_time) - julianday(ss.start_time)) * 24 * 60 AS INTEGER)
+               ELSE 0 END),
+           SUM(CASE WHEN sc.total_questions > 0 THEN sc.correct_answers * 100.0 / sc.total_questions ELSE 0 END)
+    FROM study_sessions ss
+    LEFT JOIN study_activities sa ON sa.id = ss.study_activity_id
+    LEFT JOIN session_scores sc ON sc.session_id = ss.id
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+
+
+def assert_rollups_match(conn):
+    assert_session_scores_match(conn)
+    rows = conn.execute(
+        """
+        SELECT study_date, activity_type, session_count, completed_sessions, minutes_studied, score_sum
+        FROM daily_activity_rollups ORDER BY study_date, activity_type
+        """
+    ).fetchall()
+    # A day whose sessions all moved away keeps an emptied row
+    for row in rows:
+        if row[2] == 0:
+            assert row[3:5] == (0, 0) and row[5] == pytest.approx(0, abs=1e-6)
+    stored = [row for row in rows if row[2] > 0]
+    expected = conn.execute(DAILY_ROLLUPS).fetchall()
+    assert [row[:5] for row in stored] == [row[:5] for row in expected]
+    assert [row[5] for row in stored] == pytest.approx([row[5] for row in expected])
+
+
+def test_daily_rollups_follow_sessions(conn):
+    assert_rollups_match(conn)
+
+    # A session starts, gets answers and is completed
+    session_id = conn.execute(
+        "INSERT INTO study_sessions (group_id, study_activity_id, start_time) VALUES (1, 1, '2024-05-01 09:00:00')"
+    ).lastrowid
+    assert_rollups_match(conn)
+    conn.executemany(
+        "INSERT INTO session_responses (session_id, question_id, user_response, is_correct, created_at) VALUES (?, ?, 'x', ?, ?)",
+        [(session_id, 1, 1, "2024-05-01 09:01:00"), (session_id, 2, 0, "2024-05-01 09:02:00")],
+    )
+    assert_rollups_match(conn)
+    conn.execute("UPDATE study_sessions SET end_time = '2024-05-01 09:20:00' WHERE id = ?", (session_id,))
+    assert_rollups_match(conn)
+
+    # Moved to another day and another activity, its minutes and score go along
+    conn.execute(
+        "UPDATE study_sessions SET start_time = '2024-06-02 10:00:00', end_time = '2024-06-02 10:45:00' WHERE id = ?",
+        (session_id,),
+    )
+    assert_rollups_match(conn)
+    conn.execute("UPDATE study_sessions SET study_activity_id = 2 WHERE id = ?", (session_id,))
+    assert_rollups_match(conn)
+
+    # A later answer changes the score of the day it is on now
+    conn.execute(
+        "INSERT INTO session_responses (session_id, question_id, user_response, is_correct, created_at) VALUES (?, 3, 'x', 1, '2024-06-02 10:30:00')",
+        (session_id,),
+    )
+    assert_rollups_match(conn)
+
+    # Deleting sessions, with and without their answers, takes them out again
+    conn.execute("DELETE FROM study_sessions WHERE id = ?", (session_id,))
+    assert_rollups_match(conn)
+    conn.execute("DELETE FROM session_responses WHERE session_id = 5")
+    conn.execute("DELETE FROM study_sessions WHERE id = 5")
+    assert_rollups_match(conn)
@@ -0,0 +1,134 @@
+import pytest
+
+from db.lib.db import get_pool
+
+
+def _answer(client, session_id, word_id, correct, timestamp):
+    response = client.post(
+        f"/api/study-sessions/{session_id}/responses:batch",
+        json={"responses": [
+            {"question_id": word_id, "user_response": "x", "is_correct": correct, "timestamp": timestamp}
+        ]},
+    )
+    assert response.status_code == 200, response.data
+
+
+def test_counts_match_responses(app):
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    counted = conn.execute(
+        """
+        SELECT sr.question_id, COUNT(*), SUM(sr.is_correct = 1)
+        FROM session_responses sr
+        JOIN words w ON w.id = sr.question_id
+        GROUP BY sr.question_id
+        """
+    ).fetchall()
+    stored = conn.execute("SELECT word_id, attempts, correct FROM word_stats").fetchall()
+    assert sorted(map(tuple, stored)) == sorted(map(tuple, counted))
+
+
+def test_responses_update_word_stats(app, client):
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    with conn:
+        group_id = conn.execute("INSERT INTO groups (name) VALUES ('Word stats test')").lastrowid
+        word_ids = [
+            conn.execute(
+                "INSERT INTO words (arabic, romanized, english, group_id) VALUES (?, ?, ?, ?)",
+                (arabic, romanized, english, group_id),
+            ).lastrowid
+            for arabic, romanized, english in [("قلم", "qalam", "pen"), ("باب", "bab", "door")]
+        ]
+    session_id = client.post("/api/study-sessions", json={"group_id": group_id, "study_activity_id": 1}).get_json()["id"]
+
+    def stats(word_id):
+        return conn.execute(
+            "SELECT attempts, correct, accuracy, last_seen FROM word_stats WHERE word_id = ?", (word_id,)
+        ).fetchone()
+
+    try:
+        hard, easy = word_ids
+        _answer(client, session_id, hard, False, "1990-01-01 10:00:00")
+        _answer(client, session_id, hard, True, "1990-01-01 10:01:00")
+        _answer(client, session_id, easy, True, "1990-01-01 10:02:00")
+
+        attempts, correct, accuracy, last_seen = stats(hard)
+        assert (attempts, correct, last_seen) == (2, 1, "1990-01-01 10:01:00")
+        assert accuracy == pytest.approx(0.3)
+        assert stats(easy)["accuracy"] == 1.0
+
+        hardest = client.get(f"/api/words/hardest?group_id={group_id}").get_json()
+        assert [w["id"] for w in hardest] == [hard, easy]
+        assert [w["id"] for w in client.get(f"/api/words/hardest?group_id={group_id}&min_attempts=2").get_json()] == [hard]
+
+        # Deleting the session takes its answers out of the counts
+        assert client.delete(f"/api/study-sessions/{session_id}").status_code == 200
+        assert stats(hard) is None
+        assert client.get(f"/api/words/hardest?group_id={group_id}").get_json() == []
+    finally:
+        with conn:
+            conn.execute("DELETE FROM session_responses WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM study_sessions WHERE id = ?", (session_id,))
+            conn.execute(f"DELETE FROM words WHERE id IN ({', '.join('?' * len(word_ids))})", word_ids)
+            conn.execute("DELETE FROM groups WHERE id = ?", (group_id,))
+
+
+def test_corrected_answers_update_word_stats(app, client):
+    conn = get_pool(app.config["DATABASE"]).acquire()
+    with conn:
+        group_id = conn.execute("INSERT INTO groups (name) VALUES ('Word stats corrections')").lastrowid
+        word_ids = [
+            conn.execute(
+                "INSERT INTO words (arabic, romanized, english, group_id) VALUES (?, ?, ?, ?)",
+                (arabic, romanized, english, group_id),
+            ).lastrowid
+            for arabic, romanized, english in [("شمس", "shams", "sun"), ("قمر", "qamar", "moon")]
+        ]
+    session_id = client.post("/api/study-sessions", json={"group_id": group_id, "study_activity_id": 1}).get_json()["id"]
+
+    def stats(word_id):
+        return conn.execute(
+            "SELECT attempts, correct, accuracy, last_seen FROM word_stats WHERE word_id = ?", (word_id,)
+        ).fetchone()
+
+    def correct(timestamp, **changes):
+        with conn:
+            conn.execute(
+                f"UPDATE session_responses SET {', '.join(f'{c} = ?' for c in changes)} "
+                "WHERE session_id = ? AND created_at = ?",
+                (*changes.values(), session_id, timestamp),
+            )
+
+    try:
+        sun, moon = word_ids
+        _answer(client, session_id, sun, False, "1990-01-02 10:00:00")
+        _answer(client, session_id, sun, True, "1990-01-02 10:01:00")
+        _answer(client, session_id, moon, True, "1990-01-02 10:02:00")
+        assert tuple(stats(sun)[:2]) == (2, 1)
+
+        # The first answer was right after all: replayed as right, then right
+        correct("1990-01-02 10:00:00", is_correct=1)
+        assert tuple(stats(sun)) == (2, 2, 1.0, "1990-01-02 10:01:00")
+        assert [w["id"] for w in client.get(f"/api/words/hardest?group_id={group_id}").get_json()] == [sun, moon]
+
+        # The second answer was to the moon, and wrong
+        correct("1990-01-02 10:01:00", question_id=moon, is_correct=0)
+        assert tuple(stats(sun)) == (1, 1, 1.0, "1990-01-02 10:00:00")
+        attempts, right, accuracy, last_seen = stats(moon)
+        assert (attempts, right, last_seen) == (2, 1, "1990-01-02 10:02:00")
+        assert accuracy == pytest.approx(0.3)  # Wrong, then right
+        assert [w["id"] for w in client.get(f"/api/words/hardest?group_id={group_id}").get_json()] == [moon, sun]
+
+        # Moving a word's only answer away removes its row
+        correct("1990-01-02 10:00:00", question_id=moon)
+        assert stats(sun) is None
+        assert tuple(stats(moon)[:2]) == (3, 2)
+    finally:
+        with conn:
+            conn.execute("DELETE FROM session_responses WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM study_sessions WHERE id = ?", (session_id,))
+            conn.execute(f"DELETE FROM words WHERE id IN ({', '.join('?' * len(word_ids))})", word_ids)
+            conn.execute("DELETE FROM groups WHERE id = ?", (group_id,))
+
+
+def test_hardest_rejects_bad_args(client):
+    assert client.get("/api/words/hardest?group_id=basics").status_code == 400
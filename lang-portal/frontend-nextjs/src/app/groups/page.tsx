@@ -1,7 +1,7 @@
 // app/groups/page.js
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { useQuery } from "@tanstack/react-query";
 import Link from "next/link";
 import Navigation from "@/components/Navigation";
@@ -13,25 +13,12 @@ interface Group {
   wordCount?: number;
 }
 
-type Word = {
-  id: string;
-  english: string;
-  arabic: string;
-  romanized: string;
-};
-
 const fetchGroups = async () => {
   const response = await fetch("http://127.0.0.1:5000/api/groups");
   if (!response.ok) throw new Error("Failed to fetch word groups");
   return response.json();
 };
 
-const fetchGroupWords = async (id: string): Promise<Word[]> => {
-  const response = await fetch(`http://127.0.0.1:5000/api/groups/${id}/words`);
-  if (!response.ok) throw new Error("Failed to fetch group words");
-  return response.json();
-};
-
 export default function GroupsPage() {
   const {
     data: groups,
@@ -42,37 +29,16 @@ export default function GroupsPage() {
     queryFn: fetchGroups,
   });
 
-  const [groupsWithCounts, setGroupsWithCounts] = useState<Group[]>([]);
   const [currentPage, setCurrentPage] = useState(1);
   const itemsPerPage = 10;
 
-  // Fetch word counts for each group once groups are loaded
-  useEffect(() => {
-    if (groups && groups.length > 0) {
-      const fetchAllWordCounts = async () => {
-        const updatedGroups = await Promise.all(
-          groups.map(async (group: Group) => {
-            try {
-              const words = await fetchGroupWords(group.id);
-              return {
-                ...group,
-                wordCount: words.length,
-              };
-            } catch (error) {
-              console.error(
-                `Error fetching words for group ${group.id}:`,
-                error
-              );
-              return group; // Return original group if fetching words fails
-            }
-          })
-        );
-        setGroupsWithCounts(updatedGroups);
-      };
-
-      fetchAllWordCounts();
-    }
-  }, [groups]);
+  // Word counts come with each group (maintained in the groups table)
+  const groupsWithCounts: Group[] = (groups || []).map(
+    (group: Group & { word_count?: number }) => ({
+      ...group,
+      wordCount: group.word_count,
+    })
+  );
 
   // Navigation props
   const navigationProps = {
@@ -1,7 +1,6 @@
 // app/page.js
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
 import LastStudySession from "@/components/LastStudySession";
 import StudyProgress from "@/components/StudyProgress";
 import QuickStats from "@/components/QuickStats";
@@ -9,26 +8,18 @@ import RecentActivity from "@/components/RecentActivity";
 import FlashcardApp from "@/components/FlashcardApp";
 import Link from "next/link";
 import Navigation from "@/components/Navigation";
-
-const fetchWords = async () => {
-  const response = await fetch("http://127.0.0.1:5000/api/words");
-  if (!response.ok) throw new Error("Failed to fetch words");
-  return response.json();
-};
+import { useDashboard } from "@/lib/dashboard";
 
 export default function Home() {
   const {
-    data: words,
+    data: wordCount,
     error,
     isLoading,
-  } = useQuery({
-    queryKey: ["words"],
-    queryFn: fetchWords,
-  });
+  } = useDashboard((dashboard) => dashboard.word_count);
 
   // Example: pass data to the Navigation component (if needed)
   const navigationProps = {
-    wordCount: words ? words.length : 0, // Example: pass word count
+    wordCount: wordCount ?? 0, // Example: pass word count
   };
 
   return (
@@ -44,8 +35,8 @@ export default function Home() {
             </div>
             <div className="hidden md:block">
               <p className="text-xl font-semibold">
-                {!isLoading && !error && words
-                  ? `${words.length} Words Available`
+                {!isLoading && !error && wordCount !== undefined
+                  ? `${wordCount} Words Available`
                   : ""}
               </p>
             </div>
@@ -69,7 +60,7 @@ export default function Home() {
 
         {error && (
           <div className="bg-red-50 border border-red-200 text-red-700 p-4 rounded-lg mb-6">
-            Failed to load words. Please check your connection and try again.
+            Failed to load the dashboard. Please check your connection and try again.
           </div>
         )}
 
@@ -121,7 +112,7 @@ export default function Home() {
             </h2>
             <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
               <LastStudySession />
-              <StudyProgress totalWords={words ? words.length : 0} />
+              <StudyProgress totalWords={wordCount ?? 0} />
               <QuickStats />
             </div>
 
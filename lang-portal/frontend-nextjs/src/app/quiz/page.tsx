@@ -26,6 +26,7 @@ type QuizState = {
     userResponse: string;
     isCorrect: boolean;
     timestamp: string;
+    clientResponseId?: string;
   }[];
   sessionId: number | null;
   groupId?: number;
@@ -79,6 +80,25 @@ const completeSession = async ({ sessionId, responses }: {
   return response.json();
 };
 
+// Record one answer as soon as it is given. The server journals it and commits it
+// shortly after; the PATCH at the end resends it under the same client id.
+const appendResponse = async (sessionId: number, response: {
+  question_id: string;
+  user_response: string;
+  is_correct: number;
+  timestamp: string;
+  client_response_id: string;
+}) => {
+  const result = await fetch(`http://127.0.0.1:5000/api/study-sessions/${sessionId}/responses:append`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ responses: [response] }),
+  });
+  if (!result.ok) throw new Error("Failed to record response");
+};
+
 const fetchSessionDetails = async (sessionId: number) => {
   const response = await fetch(`http://127.0.0.1:5000/api/study-sessions/${sessionId}`);
   if (!response.ok) throw new Error("Failed to fetch session details");
@@ -177,7 +197,9 @@ export default function QuizPage() {
         const previousResponses = (session.previous_responses || []).map((r: any) => ({
           questionId: r.question_id,
           userResponse: r.user_response,
-          isCorrect: r.is_correct
+          isCorrect: r.is_correct,
+          timestamp: r.created_at,
+          clientResponseId: r.client_response_id ?? undefined,
         }));
 
         // Filter out words that have already been answered
@@ -311,8 +333,19 @@ export default function QuizPage() {
       userResponse: answer,
       isCorrect,
       timestamp: new Date().toISOString(),
+      clientResponseId: crypto.randomUUID(),
     };
 
+    if (quizState.sessionId) {
+      appendResponse(quizState.sessionId, {
+        question_id: newResponse.questionId,
+        user_response: newResponse.userResponse,
+        is_correct: newResponse.isCorrect ? 1 : 0,
+        timestamp: newResponse.timestamp,
+        client_response_id: newResponse.clientResponseId,
+      }).catch((error) => console.error("Error recording response:", error));
+    }
+
     // Update state
     setQuizState((prev) => ({
       ...prev,
@@ -332,6 +365,7 @@ export default function QuizPage() {
             user_response: r.userResponse,
             is_correct: r.isCorrect ? 1 : 0,
             timestamp: r.timestamp,
+            client_response_id: r.clientResponseId,
           })),
         });
       }
@@ -3,7 +3,7 @@
 
 import { useState, useEffect } from "react";
 import { useRouter } from "next/navigation";
-import { useQuery } from "@tanstack/react-query";
+import { keepPreviousData, useQuery } from "@tanstack/react-query";
 import Link from "next/link";
 import Navigation from "@/components/Navigation";
 
@@ -40,10 +40,58 @@ interface SessionResponse {
   created_at: string;
 }
 
+interface SessionPage {
+  sessions: StudySession[];
+  counts: { total: number };
+  nextCursor: string | null;
+}
+
+const toDateString = (date: Date) =>
+  `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, "0")}-${String(date.getDate()).padStart(2, "0")}`;
+
+// Map the date range filter onto the API's date_from/date_to (start_time <= date_to)
+const dateBounds = (dateRange: string) => {
+  const today = new Date();
+  const daysAgo = (days: number) => {
+    const date = new Date(today);
+    date.setDate(date.getDate() - days);
+    return toDateString(date);
+  };
+  switch (dateRange) {
+    case "today":
+      return { date_from: toDateString(today) };
+    case "yesterday":
+      return { date_from: daysAgo(1), date_to: toDateString(today) };
+    case "week":
+      return { date_from: daysAgo(7) };
+    case "month":
+      return { date_from: daysAgo(30) };
+    default:
+      return {};
+  }
+};
+
 // Data fetching functions
-const fetchStudySessions = async () => {
-  const response = await fetch("http://127.0.0.1:5000/api/study-sessions");
+const fetchStudySessions = async (
+  filters: FilterOptions,
+  limit: number,
+  after: string | null
+): Promise<SessionPage> => {
+  const params = new URLSearchParams({ limit: String(limit), include: "counts", ...dateBounds(filters.dateRange) });
+  if (filters.activityType !== "all") params.set("activity_type", filters.activityType);
+  if (filters.groupId) params.set("group_id", String(filters.groupId));
+  if (after) params.set("after", after);
+
+  const response = await fetch(`http://127.0.0.1:5000/api/study-sessions?${params}`);
   if (!response.ok) throw new Error("Failed to fetch study sessions");
+  const { sessions, counts } = await response.json();
+  return { sessions, counts, nextCursor: response.headers.get("X-Next-Cursor") };
+};
+
+const fetchSessionStats = async (dateRange: string) => {
+  const params = new URLSearchParams(dateBounds(dateRange));
+  const response = await fetch(`http://127.0.0.1:5000/api/study-sessions/stats?${params}`);
+  if (!response.ok) throw new Error("Failed to fetch session stats");
   return response.json();
 };
 
@@ -53,12 +101,6 @@ const fetchSessionDetails = async (id: number) => {
   return response.json();
 };
 
-const fetchStudyActivities = async () => {
-  const response = await fetch("http://127.0.0.1:5000/api/study-activities");
-  if (!response.ok) throw new Error("Failed to fetch study activities");
-  return response.json();
-};
-
 const fetchGroups = async () => {
   const response = await fetch("http://127.0.0.1:5000/api/groups");
   if (!response.ok) throw new Error("Failed to fetch groups");
@@ -246,25 +288,29 @@ export default function SessionsPage() {
     activityType: "all",
     dateRange: "all",
   });
+  // Cursor for each page visited so far; the first page has none
+  const [pageCursors, setPageCursors] = useState<(string | null)[]>([null]);
   const itemsPerPage = 10;
 
-  // Fetch data
+  // Fetch data: only the current page of sessions, filtered by the API
   const {
-    data: sessions,
+    data: sessionPage,
     error: sessionsError,
     isLoading: sessionsLoading,
   } = useQuery({
-    queryKey: ["study-sessions"],
-    queryFn: fetchStudySessions,
+    queryKey: ["study-sessions", filters, pageCursors[currentPage - 1]],
+    queryFn: () => fetchStudySessions(filters, itemsPerPage, pageCursors[currentPage - 1]),
+    // Keep showing the current page while the next one loads
+    placeholderData: keepPreviousData,
   });
 
   const {
-    data: activities,
-    error: activitiesError,
-    isLoading: activitiesLoading,
+    data: stats,
+    error: statsError,
+    isLoading: statsLoading,
   } = useQuery({
-    queryKey: ["study-activities"],
-    queryFn: fetchStudyActivities,
+    queryKey: ["study-sessions-stats", filters.dateRange],
+    queryFn: () => fetchSessionStats(filters.dateRange),
   });
 
   const {
@@ -286,77 +332,25 @@ export default function SessionsPage() {
   enabled: selectedSession !== null,
 });
 
-  // Enrich sessions with activity and group information
-  const enrichedSessions = sessions && activities && groups
-    ? sessions.map((session: StudySession) => {
-        const activity = activities.find((a: { id: number; name: string; type: string }) => a.id === session.study_activity_id);
-        const group = groups.find((g: { id: number; name: string }) => g.id === session.group_id);
-        return {
-          ...session,
-          activity_name: activity?.name || "Unknown Activity",
-          activity_type: activity?.type || "Unknown Type",
-          group_name: group?.name || "Unknown Group",
-        };
-      })
-    : [];
-
-  // Filter logic
-  const filteredSessions = enrichedSessions
-    ? enrichedSessions.filter((session: StudySession) => {
-        // Filter by activity type (if not "all")
-        const typeMatch =
-          filters.activityType === "all" || 
-          session.activity_type === filters.activityType;
-
-        // Filter by date range
-        let dateMatch = true;
-        const sessionDate = new Date(session.start_time);
-        const today = new Date();
-        const yesterday = new Date(today);
-        yesterday.setDate(yesterday.getDate() - 1);
-        const lastWeek = new Date(today);
-        lastWeek.setDate(lastWeek.getDate() - 7);
-        const lastMonth = new Date(today);
-        lastMonth.setMonth(lastMonth.getMonth() - 1);
-
-        switch (filters.dateRange) {
-          case "today":
-            dateMatch = sessionDate.toDateString() === today.toDateString();
-            break;
-          case "yesterday":
-            dateMatch = sessionDate.toDateString() === yesterday.toDateString();
-            break;
-          case "week":
-            dateMatch = sessionDate >= lastWeek;
-            break;
-          case "month":
-            dateMatch = sessionDate >= lastMonth;
-            break;
-          default:
-            dateMatch = true;
-        }
-
-        // Filter by group if specified
-        const groupMatch = !filters.groupId || session.group_id === filters.groupId;
-
-        return typeMatch && dateMatch && groupMatch;
-      })
-    : [];
-
-  // Sort by most recent first
-  const sortedSessions = [...filteredSessions].sort((a, b) => 
-    new Date(b.start_time).getTime() - new Date(a.start_time).getTime()
-  );
+  const currentItems: StudySession[] = sessionPage?.sessions ?? [];
+  const totalSessions = sessionPage?.counts.total ?? 0;
 
   // Pagination logic
-  const indexOfLastItem = currentPage * itemsPerPage;
-  const indexOfFirstItem = indexOfLastItem - itemsPerPage;
-  const currentItems = sortedSessions.slice(indexOfFirstItem, indexOfLastItem);
-  const totalPages = Math.ceil(sortedSessions.length / itemsPerPage);
+  const indexOfFirstItem = (currentPage - 1) * itemsPerPage;
+  const indexOfLastItem = indexOfFirstItem + currentItems.length;
+  const totalPages = Math.ceil(totalSessions / itemsPerPage);
+
+  const goToNextPage = () => {
+    const nextCursor = sessionPage?.nextCursor;
+    if (!nextCursor) return;
+    setPageCursors((prev) => [...prev.slice(0, currentPage), nextCursor]);
+    setCurrentPage((prev) => prev + 1);
+  };
 
   // Reset to first page when filters change
   useEffect(() => {
     setCurrentPage(1);
+    setPageCursors([null]);
   }, [filters]);
 
   // Function to format duration
@@ -423,23 +417,17 @@ export default function SessionsPage() {
     }
   };
 
-  // Calculate analytics data
+  // Analytics come from the daily rollups for the selected date range
   const analyticsData = {
-    totalSessions: sortedSessions.length,
-    completedSessions: sortedSessions.filter(s => s.end_time).length,
-    totalDuration: sortedSessions.reduce((total, session) => {
-      if (!session.end_time) return total;
-      const duration = new Date(session.end_time).getTime() - new Date(session.start_time).getTime();
-      return total + duration;
-    }, 0),
-    byActivityType: activities 
-      ? activities.reduce((acc: Record<string, number>, activity: { type: string }) => {
-          const type = activity.type;
-          if (!acc[type]) acc[type] = 0;
-          acc[type] += sortedSessions.filter(s => s.activity_type === type).length;
-          return acc;
-        }, {})
-      : {}
+    totalSessions: stats?.total_sessions ?? 0,
+    completedSessions: stats?.completed_sessions ?? 0,
+    totalDuration: (stats?.total_minutes ?? 0) * 60000,
+    byActivityType: Object.fromEntries(
+      (stats?.activity_types ?? []).map((t: { activity_type: string; session_count: number }) => [
+        t.activity_type,
+        t.session_count,
+      ])
+    ),
   };
 
   // Format total duration for display
@@ -450,8 +438,8 @@ export default function SessionsPage() {
   };
 
   // Check if loading
-  const isLoading = sessionsLoading || activitiesLoading || groupsLoading;
-  const hasError = sessionsError || activitiesError || groupsError;
+  const isLoading = sessionsLoading || statsLoading || groupsLoading;
+  const hasError = sessionsError || statsError || groupsError;
 
   return (
     <div className="min-h-screen bg-gray-50">
@@ -467,8 +455,8 @@ export default function SessionsPage() {
             </div>
             <div className="mt-4 md:mt-0">
               <p className="text-xl font-semibold">
-                {!isLoading && !hasError && sessions
-                  ? `${sessions.length} Sessions Recorded`
+                {!isLoading && !hasError && stats
+                  ? `${analyticsData.totalSessions} Sessions Recorded`
                   : ""}
               </p>
             </div>
@@ -744,11 +732,11 @@ export default function SessionsPage() {
                       </span>{" "}
                       to{" "}
                       <span className="font-medium">
-                        {Math.min(indexOfLastItem, sortedSessions.length)}
+                        {indexOfLastItem}
                       </span>{" "}
                       of{" "}
                       <span className="font-medium">
-                        {sortedSessions.length}
+                        {totalSessions}
                       </span>{" "}
                       sessions
                     </div>
@@ -767,12 +755,8 @@ export default function SessionsPage() {
                         {currentPage} / {totalPages}
                       </span>
                       <button
-                        onClick={() =>
-                          setCurrentPage((prev) =>
-                            Math.min(prev + 1, totalPages)
-                          )
-                        }
-                        disabled={currentPage === totalPages}
+                        onClick={goToNextPage}
+                        disabled={!sessionPage?.nextCursor}
                         className="px-4 py-2 border border-gray-300 rounded-md text-sm font-medium text-gray-700 bg-white hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
                       >
                         Next
@@ -22,12 +22,25 @@ export default function SettingsPage() {
           method: "POST",
         });
         
-        if (response.ok) {
-          alert("Session history has been reset successfully!");
-          router.refresh();
-        } else {
+        if (!response.ok) {
           throw new Error("Failed to reset session history");
         }
+
+        // The reset runs as a background job; poll it until it is done
+        const { status_url } = await response.json();
+        let job = { status: "queued" };
+        while (job.status === "queued" || job.status === "running") {
+          await new Promise((resolve) => setTimeout(resolve, 500));
+          const jobResponse = await fetch(`http://127.0.0.1:5000${status_url}`);
+          if (!jobResponse.ok) throw new Error("Failed to check reset progress");
+          job = await jobResponse.json();
+        }
+        if (job.status !== "succeeded") {
+          throw new Error("Failed to reset session history");
+        }
+
+        alert("Session history has been reset successfully!");
+        router.refresh();
       } catch (error) {
         alert("Failed to reset session history. Please try again.");
       } finally {
@@ -2,35 +2,15 @@
 "use client";
 
 import Link from "next/link";
-import { useQuery } from "@tanstack/react-query";
 import { formatDistanceToNow } from "date-fns";
-
-interface StudySession {
-  id: number;
-  group_name: string;
-  activity_name: string;
-  activity_type: string;
-  start_time: string;
-  end_time: string | null;
-}
-
-const fetchLatestSession = async (): Promise<StudySession> => {
-  const response = await fetch("http://127.0.0.1:5000/api/study-sessions/latest");
-  if (!response.ok) {
-    throw new Error("Failed to fetch latest study session");
-  }
-  return response.json();
-};
+import { useDashboard } from "@/lib/dashboard";
 
 export default function LastStudySession() {
   const {
     data: session,
     error,
     isLoading,
-  } = useQuery<StudySession>({
-    queryKey: ["latestStudySession"],
-    queryFn: fetchLatestSession,
-  });
+  } = useDashboard((dashboard) => dashboard.latest_session);
 
   if (isLoading) {
     return (
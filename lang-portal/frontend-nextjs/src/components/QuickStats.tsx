@@ -1,50 +1,7 @@
 "use client";
 
 import Link from 'next/link';
-import { useQuery } from '@tanstack/react-query';
-
-interface StudyStats {
-  total_sessions: number;
-  completed_sessions: number;
-  total_minutes: number;
-  activity_types: Array<{
-    activity_type: string;
-    session_count: number;
-  }>;
-  average_scores: Array<{
-    activity_type: string;
-    average_score: number;
-  }>;
-  daily_activity: Array<{
-    study_date: string;
-    session_count: number;
-    minutes_studied: number;
-  }>;
-}
-
-interface Group {
-  id: number;
-  name: string;
-  description: string;
-  created_at: string;
-  is_active: boolean;
-}
-
-const fetchStudyStats = async (): Promise<StudyStats> => {
-  const response = await fetch('http://127.0.0.1:5000/api/study-sessions/stats');
-  if (!response.ok) {
-    throw new Error('Failed to fetch study statistics');
-  }
-  return response.json();
-};
-
-const fetchGroups = async (): Promise<Group[]> => {
-  const response = await fetch('http://127.0.0.1:5000/api/groups');
-  if (!response.ok) {
-    throw new Error('Failed to fetch groups');
-  }
-  return response.json();
-};
+import { useDashboard, type StudyStats } from '@/lib/dashboard';
 
 const calculateStreak = (dailyActivity: StudyStats['daily_activity'] | undefined): number => {
   if (!dailyActivity || dailyActivity.length === 0) return 0;
@@ -80,24 +37,9 @@ const calculateStreak = (dailyActivity: StudyStats['daily_activity'] | undefined
 export default function QuickStats() {
   const {
     data: stats,
-    isLoading: isStatsLoading,
-    error: statsError,
-  } = useQuery<StudyStats>({
-    queryKey: ['studyStats'],
-    queryFn: fetchStudyStats,
-  });
-
-  const {
-    data: groups,
-    isLoading: isGroupsLoading,
-    error: groupsError,
-  } = useQuery<Group[]>({
-    queryKey: ['groups'],
-    queryFn: fetchGroups,
-  });
-
-  const isLoading = isStatsLoading || isGroupsLoading;
-  const error = statsError || groupsError;
+    isLoading,
+    error,
+  } = useDashboard((dashboard) => dashboard.stats);
 
   if (isLoading) {
     return (
@@ -14,7 +14,7 @@ interface Activity {
 }
 
 const fetchRecentActivity = async (): Promise<Activity[]> => {
-  const response = await fetch('http://127.0.0.1:5000/api/study-sessions');
+  const response = await fetch('http://127.0.0.1:5000/api/study-sessions?limit=5');
   if (!response.ok) {
     throw new Error('Failed to fetch recent activity');
   }
@@ -71,7 +71,7 @@ export default function RecentActivity() {
       </div>
 
       <div className="space-y-4">
-        {activities?.slice(0, 5).map((activity) => (
+        {activities?.map((activity) => (
           <Link
             key={activity.id}
             href={`/sessions/${activity.id}`}
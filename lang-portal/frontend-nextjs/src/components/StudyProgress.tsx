@@ -1,43 +1,13 @@
 "use client";
 
-import { useQuery } from "@tanstack/react-query";
-
-interface StudyStats {
-  total_sessions: number;
-  completed_sessions: number;
-  total_minutes: number;
-  activity_types: Array<{
-    activity_type: string;
-    session_count: number;
-  }>;
-  average_scores: Array<{
-    activity_type: string;
-    average_score: number;
-  }>;
-  daily_activity: Array<{
-    study_date: string;
-    session_count: number;
-    minutes_studied: number;
-  }>;
-}
+import { useDashboard } from "@/lib/dashboard";
 
 type StudyProgressProps = {
   totalWords: number;
 };
 
-const fetchStudyStats = async (): Promise<StudyStats> => {
-  const response = await fetch("http://127.0.0.1:5000/api/study-sessions/stats");
-  if (!response.ok) {
-    throw new Error("Failed to fetch study statistics");
-  }
-  return response.json();
-};
-
 export default function StudyProgress({ totalWords }: StudyProgressProps) {
-  const { data: stats, isLoading, error } = useQuery<StudyStats>({
-    queryKey: ["studyStats"],
-    queryFn: fetchStudyStats,
-  });
+  const { data: stats, isLoading, error } = useDashboard((dashboard) => dashboard.stats);
 
   if (isLoading) {
     return (
@@ -0,0 +1,70 @@
+import { useQuery } from "@tanstack/react-query";
+
+export interface StudySession {
+  id: number;
+  group_name: string;
+  activity_name: string;
+  activity_type: string;
+  start_time: string;
+  end_time: string | null;
+}
+
+export interface StudyStats {
+  total_sessions: number;
+  completed_sessions: number;
+  total_minutes: number;
+  activity_types: Array<{
+    activity_type: string;
+    session_count: number;
+  }>;
+  average_scores: Array<{
+    activity_type: string;
+    average_score: number;
+  }>;
+  daily_activity: Array<{
+    study_date: string;
+    session_count: number;
+    minutes_studied: number;
+  }>;
+}
+
+export interface Group {
+  id: number;
+  name: string;
+  description: string;
+  created_at: string;
+  is_active: boolean;
+}
+
+export interface StudyActivity {
+  id: number;
+  name: string;
+  type: string;
+  [key: string]: unknown;
+}
+
+export interface Dashboard {
+  latest_session: StudySession | null;
+  stats: StudyStats;
+  groups: Group[];
+  study_activities: StudyActivity[];
+  word_count: number;
+}
+
+const fetchDashboard = async (): Promise<Dashboard> => {
+  const response = await fetch("http://127.0.0.1:5000/api/dashboard");
+  if (!response.ok) {
+    throw new Error("Failed to fetch dashboard");
+  }
+  return response.json();
+};
+
+// Every dashboard widget reads its part of one /api/dashboard response, so the
+// page costs a single request no matter how many widgets use it
+export function useDashboard<T>(select: (dashboard: Dashboard) => T) {
+  return useQuery({
+    queryKey: ["dashboard"],
+    queryFn: fetchDashboard,
+    select,
+  });
+}
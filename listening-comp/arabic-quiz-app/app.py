@@ -4,20 +4,29 @@ import json
 import uuid
 import hashlib
 from pathlib import Path
+from dotenv import load_dotenv
 from gtts import gTTS
 from vector_search import QuizVectorSearch
+from quiz_store import QuizConflict, create_quiz_store
+
+load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
+@app.errorhandler(QuizConflict)
+def quiz_conflict(e):
+    # Another request saved this quiz after we read it; the client can fetch it again and retry
+    return jsonify({'error': 'Quiz was updated by another request, please retry'}), 409
+
 # Create necessary directories
 os.makedirs("questions", exist_ok=True)
 os.makedirs("audio_cache", exist_ok=True)
 os.makedirs("static/audio", exist_ok=True)
 
 class QuizManager:
-    def __init__(self):
-        self.active_quizzes = {}  # Store active quiz sessions
+    def __init__(self, store=None):
+        self.store = store or create_quiz_store()  # Quizzes in progress, see quiz_store.py
         
     def _generate_audio(self, arabic_text):
         """Generate audio for Arabic text using gTTS."""
@@ -54,14 +63,15 @@ class QuizManager:
             with open(questions_file, 'r', encoding='utf-8') as f:
                 questions = json.load(f)
                 
-            quiz_id = str(hash(questions_file))
-            self.active_quizzes[quiz_id] = {
+            # A new id per start, so the same file can be taken by several users at once
+            quiz_id = str(uuid.uuid4())
+            self.store.save(quiz_id, {
                 'questions': questions,
                 'current_question': 0,
                 'score': 0,
                 'answers': [],
                 'total_questions': len(questions)
-            }
+            })
             return quiz_id
         except Exception as e:
             print(f"Error loading quiz: {e}")
@@ -69,10 +79,9 @@ class QuizManager:
             
     def get_current_question(self, quiz_id):
         """Get the current question for a quiz."""
-        if quiz_id not in self.active_quizzes:
+        quiz = self.store.get(quiz_id)
+        if quiz is None:
             return None
-            
-        quiz = self.active_quizzes[quiz_id]
         if quiz['current_question'] >= len(quiz['questions']):
             return None
             
@@ -117,10 +126,9 @@ class QuizManager:
         
     def submit_answer(self, quiz_id, answer):
         """Submit an answer and get feedback."""
-        if quiz_id not in self.active_quizzes:
+        quiz = self.store.get(quiz_id)
+        if quiz is None:
             return None
-            
-        quiz = self.active_quizzes[quiz_id]
         if quiz['current_question'] >= len(quiz['questions']):
             return None
             
@@ -216,6 +224,7 @@ class QuizManager:
         }
         
         quiz['current_question'] += 1
+        self.store.save(quiz_id, quiz)
         
         # Check if quiz is complete
         if quiz['current_question'] >= len(quiz['questions']):
@@ -250,10 +259,9 @@ class QuizManager:
         
     def get_quiz_summary(self, quiz_id):
         """Get a summary of the quiz results."""
-        if quiz_id not in self.active_quizzes:
+        quiz = self.store.get(quiz_id)
+        if quiz is None:
             return None
-            
-        quiz = self.active_quizzes[quiz_id]
         
         # Enhance the answers with question details and correct answers
         detailed_answers = []
@@ -338,8 +346,8 @@ def create_custom_quiz(questions, quiz_mode='standard', auto_play=False, repeat_
     # Generate a unique ID for the custom quiz
     quiz_id = str(uuid.uuid4())
     
-    # Save the quiz in memory
-    quiz_manager.active_quizzes[quiz_id] = {
+    # Save the quiz in the quiz store
+    quiz_manager.store.save(quiz_id, {
         'questions': questions,
         'current_question': 0,
         'score': 0,
@@ -350,7 +358,7 @@ def create_custom_quiz(questions, quiz_mode='standard', auto_play=False, repeat_
         'repeat_audio': repeat_audio,
         'slow_audio': slow_audio,
         'question_language': question_language
-    }
+    })
     
     return quiz_id
 
@@ -516,11 +524,13 @@ def start_quiz(quiz_id):
         return jsonify({'error': 'Failed to load quiz'}), 500
     
     # Store quiz mode settings
-    if quiz_id in quiz_manager.active_quizzes:
-        quiz_manager.active_quizzes[quiz_id]['quiz_mode'] = quiz_mode
-        quiz_manager.active_quizzes[quiz_id]['auto_play'] = auto_play
-        quiz_manager.active_quizzes[quiz_id]['repeat_audio'] = repeat_audio
-        quiz_manager.active_quizzes[quiz_id]['slow_audio'] = slow_audio
+    quiz_state = quiz_manager.store.get(quiz_id)
+    if quiz_state is not None:
+        quiz_state['quiz_mode'] = quiz_mode
+        quiz_state['auto_play'] = auto_play
+        quiz_state['repeat_audio'] = repeat_audio
+        quiz_state['slow_audio'] = slow_audio
+        quiz_manager.store.save(quiz_id, quiz_state)
     
     return jsonify({
         'quiz_id': quiz_id,
@@ -538,8 +548,8 @@ def get_question(quiz_id):
             return jsonify({'error': 'Question not found'}), 404
         
         # Add quiz mode information to the response
-        if quiz_id in quiz_manager.active_quizzes:
-            quiz = quiz_manager.active_quizzes[quiz_id]
+        quiz = quiz_manager.store.get(quiz_id)
+        if quiz is not None:
             question['quiz_mode'] = quiz.get('quiz_mode', 'standard')
             question['auto_play'] = quiz.get('auto_play', False)
             question['repeat_audio'] = quiz.get('repeat_audio', False)
@@ -587,10 +597,10 @@ def submit_dictation(quiz_id):
         is_correct = data.get('is_correct', False)
         
         # Get the current question
-        if quiz_id not in quiz_manager.active_quizzes:
+        quiz = quiz_manager.store.get(quiz_id)
+        if quiz is None:
             return jsonify({'error': 'Quiz not found'}), 404
             
-        quiz = quiz_manager.active_quizzes[quiz_id]
         if quiz['current_question'] >= len(quiz['questions']):
             return jsonify({'error': 'No more questions'}), 400
             
@@ -607,6 +617,7 @@ def submit_dictation(quiz_id):
         # Update score
         if is_correct:
             quiz['score'] += 1
+        quiz_manager.store.save(quiz_id, quiz)
         
         return jsonify({
             'success': True,
@@ -616,6 +627,8 @@ def submit_dictation(quiz_id):
             'score': quiz['score'],
             'total': quiz['current_question'] + 1
         })
+    except QuizConflict:
+        raise
     except Exception as e:
         print(f"Error submitting dictation: {e}")
         return jsonify({'error': f'Error submitting dictation: {str(e)}'}), 500
@@ -632,11 +645,11 @@ def quiz_summary(quiz_id):
 def update_settings(quiz_id):
     """Update quiz settings like repeat_audio and slow_audio."""
     try:
-        if quiz_id not in quiz_manager.active_quizzes:
+        quiz = quiz_manager.store.get(quiz_id)
+        if quiz is None:
             return jsonify({'error': 'Quiz not found'}), 404
             
         data = request.json
-        quiz = quiz_manager.active_quizzes[quiz_id]
         
         # Update settings if provided
         if 'quiz_mode' in data:
@@ -650,6 +663,8 @@ def update_settings(quiz_id):
             
         if 'slow_audio' in data:
             quiz['slow_audio'] = data['slow_audio']
+        
+        quiz_manager.store.save(quiz_id, quiz)
             
         return jsonify({
             'success': True,
@@ -658,6 +673,8 @@ def update_settings(quiz_id):
             'repeat_audio': quiz.get('repeat_audio', False),
             'slow_audio': quiz.get('slow_audio', False)
         })
+    except QuizConflict:
+        raise
     except Exception as e:
         print(f"Error updating settings: {e}")
         return jsonify({'error': f'Error updating settings: {str(e)}'}), 500
@@ -676,7 +693,7 @@ def serve_audio(filename):
         arabic_text = None
         
         # Search through all active quizzes for matching Arabic text
-        for quiz_id, quiz in quiz_manager.active_quizzes.items():
+        for quiz_id, quiz in quiz_manager.store.items():
             for question in quiz['questions']:
                 question_hash = hashlib.md5(question['arabic_text'].encode('utf-8')).hexdigest()
                 if question_hash == text_hash:
@@ -0,0 +1,179 @@
+"""Where the quiz app keeps the state of quizzes in progress.
+
+A quiz's state is the dict QuizManager builds in load_quiz (questions, current
+question, score, answers and the listening settings). Callers get it with
+``get``, change it, and hand it back with ``save``.
+
+Two stores are available, chosen with the ``QUIZ_STORE`` environment variable:
+
+* ``memory`` (default) keeps quizzes in this process. It holds at most
+  ``QUIZ_MAX_ACTIVE`` quizzes, dropping the least recently used one first, and
+  forgets quizzes nobody has touched for ``QUIZ_TTL_SECONDS``.
+* ``sqlite`` keeps them as JSON in the SQLite file at ``QUIZ_STORE_PATH``. They
+  survive a restart, and every Gunicorn worker sees the same quizzes. Expired
+  quizzes are deleted as new ones are saved.
+
+With several workers, two requests for the same quiz can both read it before
+either saves. The SQLite store hands out the quiz with its version under
+``VERSION_KEY``, and ``save`` only writes if the row still has that version.
+Otherwise it raises QuizConflict, so the later request fails instead of
+overwriting the earlier one's answer.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Where get() puts the version a quiz was read at; save() takes it out again
+VERSION_KEY = '_version'
+
+
+class QuizConflict(Exception):
+    """The quiz was saved by another request since it was read."""
+
+
+class MemoryQuizStore:
+    """Quizzes in a dict, bounded by count and by idle time."""
+
+    def __init__(self, max_size=500, ttl_seconds=6 * 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._quizzes = OrderedDict()  # quiz_id -> (last_used, quiz), least recently used first
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        # The oldest entries are at the front, so stop at the first live one
+        while self._quizzes:
+            quiz_id, (last_used, _) = next(iter(self._quizzes.items()))
+            if now - last_used <= self.ttl_seconds:
+                break
+            del self._quizzes[quiz_id]
+
+    def get(self, quiz_id):
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            entry = self._quizzes.get(quiz_id)
+            if entry is None:
+                return None
+            self._quizzes[quiz_id] = (now, entry[1])
+            self._quizzes.move_to_end(quiz_id)
+            return entry[1]
+
+    def save(self, quiz_id, quiz):
+        with self._lock:
+            now = time.time()
+            self._quizzes[quiz_id] = (now, quiz)
+            self._quizzes.move_to_end(quiz_id)
+            self._expire(now)
+            while len(self._quizzes) > self.max_size:
+                self._quizzes.popitem(last=False)
+
+    def delete(self, quiz_id):
+        with self._lock:
+            self._quizzes.pop(quiz_id, None)
+
+    def items(self):
+        """(quiz_id, quiz) for every live quiz, most recently used first."""
+        with self._lock:
+            self._expire(time.time())
+            return [(quiz_id, quiz) for quiz_id, (_, quiz) in reversed(self._quizzes.items())]
+
+
+class SQLiteQuizStore:
+    """Quizzes as JSON rows in a SQLite file shared by all workers."""
+
+    def __init__(self, path='quiz_state.db', ttl_seconds=6 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS quizzes (
+                quiz_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_quizzes_updated_at ON quizzes(updated_at)")
+
+    def _connect(self):
+        # One connection per thread; autocommit, so every statement is its own transaction
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA busy_timeout = 5000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, quiz_id):
+        row = self._connect().execute(
+            "SELECT state, updated_at FROM quizzes WHERE quiz_id = ? AND updated_at > ?",
+            (quiz_id, time.time() - self.ttl_seconds)
+        ).fetchone()
+        if row is None:
+            return None
+        quiz = json.loads(row[0])
+        quiz[VERSION_KEY] = row[1]
+        return quiz
+
+    def save(self, quiz_id, quiz):
+        """Store a quiz. A quiz read with get() is only written back if nobody saved it since.
+
+        Raises QuizConflict when the quiz changed (or expired) after it was read.
+        """
+        version = quiz.pop(VERSION_KEY, None)
+        state = json.dumps(quiz, ensure_ascii=False)
+        now = time.time()
+        conn = self._connect()
+        if version is None:
+            # A new quiz
+            conn.execute(
+                """
+                INSERT INTO quizzes (quiz_id, state, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(quiz_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at
+                """,
+                (quiz_id, state, now)
+            )
+        else:
+            # The new version must differ from the one read, even if the clock has not moved
+            now = max(now, version + 1e-6)
+            updated = conn.execute(
+                "UPDATE quizzes SET state = ?, updated_at = ? WHERE quiz_id = ? AND updated_at = ?",
+                (state, now, quiz_id, version)
+            ).rowcount
+            if not updated:
+                quiz[VERSION_KEY] = version
+                raise QuizConflict(quiz_id)
+        quiz[VERSION_KEY] = now
+        conn.execute("DELETE FROM quizzes WHERE updated_at <= ?", (now - self.ttl_seconds,))
+
+    def delete(self, quiz_id):
+        self._connect().execute("DELETE FROM quizzes WHERE quiz_id = ?", (quiz_id,))
+
+    def items(self):
+        """(quiz_id, quiz) for every live quiz, most recently used first."""
+        rows = self._connect().execute(
+            "SELECT quiz_id, state FROM quizzes WHERE updated_at > ? ORDER BY updated_at DESC",
+            (time.time() - self.ttl_seconds,)
+        )
+        for quiz_id, state in rows:
+            yield quiz_id, json.loads(state)
+
+
+def create_quiz_store():
+    """Build the store the environment asks for."""
+    backend = os.getenv('QUIZ_STORE', 'memory').lower()
+    ttl_seconds = int(os.getenv('QUIZ_TTL_SECONDS', 6 * 3600))
+
+    if backend == 'sqlite':
+        path = os.getenv('QUIZ_STORE_PATH', 'quiz_state.db')
+        print(f"Keeping quizzes in SQLite at {path}")
+        return SQLiteQuizStore(path, ttl_seconds=ttl_seconds)
+    if backend != 'memory':
+        raise ValueError(f"Unknown QUIZ_STORE {backend!r}, expected 'memory' or 'sqlite'")
+    return MemoryQuizStore(max_size=int(os.getenv('QUIZ_MAX_ACTIVE', 500)), ttl_seconds=ttl_seconds)
@@ -0,0 +1,92 @@
+import pytest
+
+import quiz_store
+from quiz_store import VERSION_KEY, MemoryQuizStore, QuizConflict, SQLiteQuizStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fake time.time() for the stores, moved on with clock.now += seconds."""
+
+    class Clock:
+        now = 1_000_000.0
+
+    monkeypatch.setattr(quiz_store.time, 'time', lambda: Clock.now)
+    return Clock
+
+
+def quiz(score=0):
+    return {'questions': [{'type': 'true_false', 'is_true': True}], 'current_question': 0, 'score': score, 'answers': []}
+
+
+def test_memory_store_evicts_least_recently_used(clock):
+    store = MemoryQuizStore(max_size=2)
+    store.save('a', quiz())
+    store.save('b', quiz())
+    store.get('a')
+    store.save('c', quiz())
+
+    assert store.get('b') is None
+    assert [quiz_id for quiz_id, _ in store.items()] == ['c', 'a']
+
+
+def test_memory_store_expires_idle_quizzes(clock):
+    store = MemoryQuizStore(ttl_seconds=60)
+    store.save('a', quiz())
+    store.save('b', quiz())
+    clock.now += 50
+    store.get('a')
+    clock.now += 20
+
+    assert store.get('a') is not None
+    assert store.get('b') is None
+
+
+def test_sqlite_store_round_trip(tmp_path, clock):
+    path = str(tmp_path / 'quizzes.db')
+    SQLiteQuizStore(path).save('a', quiz(score=3) | {'question_language': 'arabic', 'note': 'مرحبا'})
+
+    # A second store on the same file stands in for another worker
+    loaded = SQLiteQuizStore(path).get('a')
+    assert loaded.pop(VERSION_KEY) == clock.now
+    assert loaded == quiz(score=3) | {'question_language': 'arabic', 'note': 'مرحبا'}
+    assert SQLiteQuizStore(path).get('missing') is None
+
+
+def test_sqlite_store_expires_and_purges(tmp_path, clock):
+    store = SQLiteQuizStore(str(tmp_path / 'quizzes.db'), ttl_seconds=60)
+    store.save('old', quiz())
+    clock.now += 61
+
+    assert store.get('old') is None
+    store.save('new', quiz())
+    assert store._connect().execute("SELECT quiz_id FROM quizzes").fetchall() == [('new',)]
+
+
+def test_sqlite_store_saves_changes_in_turn(tmp_path, clock):
+    store = SQLiteQuizStore(str(tmp_path / 'quizzes.db'))
+    store.save('a', quiz())
+
+    first = store.get('a')
+    first['score'] += 1
+    store.save('a', first)
+    # The same dict can be saved again without reading it back
+    first['score'] += 1
+    store.save('a', first)
+
+    assert store.get('a')['score'] == 2
+
+
+def test_sqlite_store_rejects_lost_updates(tmp_path, clock):
+    path = str(tmp_path / 'quizzes.db')
+    SQLiteQuizStore(path).save('a', quiz())
+    one, other = SQLiteQuizStore(path), SQLiteQuizStore(path)
+
+    mine, theirs = one.get('a'), other.get('a')
+    mine['score'] += 1
+    one.save('a', mine)
+    theirs['score'] += 10
+    with pytest.raises(QuizConflict):
+        other.save('a', theirs)
+
+    assert one.get('a')['score'] == 1
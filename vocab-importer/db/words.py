@@ -60,6 +60,22 @@ def setup_database():
     """
     )
 
+    # Group membership; a word is stored once and can belong to several groups
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS words_groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER NOT NULL,
+            group_id INTEGER NOT NULL,
+            FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE,
+            FOREIGN KEY (group_id) REFERENCES groups(id) ON DELETE CASCADE
+        )
+    """
+    )
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_words_groups_group_word ON words_groups(group_id, word_id)"
+    )
+
     conn.commit()
     return conn
 
@@ -88,10 +104,15 @@ def seed_words_from_file(conn, group_name, json_file):
 
         for word in words:
             try:
-                # Check if word already exists
+                # Check if word already exists, in any group. Arabic alone is not
+                # enough: unvowelled homographs are different words.
                 cursor.execute(
-                    "SELECT id FROM words WHERE arabic = ? AND group_id = ?",
-                    (word["arabic"], group_id),
+                    """
+                    SELECT id FROM words
+                    WHERE arabic = ? AND romanized = ? AND english = ?
+                    ORDER BY id LIMIT 1
+                    """,
+                    (word["arabic"], word["romanized"], word["english"]),
                 )
                 existing = cursor.fetchone()
 
@@ -114,9 +135,18 @@ def seed_words_from_file(conn, group_name, json_file):
                             word.get("pronunciation_audio", None),  # Optional field
                         ),
                     )
+                    word_id = cursor.lastrowid
                     added_count += 1
                 else:
+                    word_id = existing[0]
                     skipped_count += 1
+                    print(f"Word {word['arabic']} ({word['english']}) is already stored, adding it to group '{group_name}'")
+
+                # Existing words are added to this group instead of being stored again
+                cursor.execute(
+                    "INSERT OR IGNORE INTO words_groups (word_id, group_id) VALUES (?, ?)",
+                    (word_id, group_id),
+                )
             except Exception as e:
                 print(f"Error inserting word {word['arabic']}: {str(e)}")
 